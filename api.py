@@ -0,0 +1,254 @@
+# api.py — headless ASGI service over the same graph (no Streamlit)
+#
+#   uvicorn api:app --workers 4
+#
+#   POST /intake    {"user_query": "...", "session_id"?: "..."}
+#        -> state with detected roles/slots plus the clarifying questions still open
+#   POST /clarify   {"session_id" | "state", "answers": {"budget": "...", ...}}
+#        -> state with the answers applied plus the questions still open
+#   POST /generate  {"session_id" | "state" | "user_query"}
+#        -> NDJSON stream: one {"node": ..., "update": ...} line per finished node,
+#           then {"done": true, "state": {...}}
+#        A stored session is only continued by its session_id. A posted "state" (only its
+#        query and slots are used) starts a new session under a server-generated id, and a
+#        "user_query" may not reuse the id of an existing session (409).
+#   POST /email     {"session_id", "to": ["a@x.com", ...] | "a@x.com, b@x.com"}
+#        -> queues the stored session's kickoff email draft: {"id": ..., "status": "queued", "sending": bool}
+#           (delivered in the background by tools.mailer; "sending" is false without an SMTP host).
+#           Needs "Authorization: Bearer $SKILLSCOUT_API_TOKEN" (disabled while that is unset);
+#           recipients are limited to SKILLSCOUT_MAIL_DOMAINS when set.
+#   GET  /healthz
+#
+# Each worker process shares one compiled graph (graph.get_graph) and runs the blocking
+# graph/node code on a bounded thread pool, so the event loop stays responsive.
+import asyncio
+import hmac
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from graph import get_graph, graph_input
+from memory import STORE
+from nodes.clarifier import clarifier_node, missing_questions
+from nodes.intake import extract_slots, intake_node
+from nodes.market_research import market_research_node
+from state import AgentState
+from tools.mailer import MAILER
+from tools.search_tool import INDEX
+from tools.skill_vocab import VOCAB
+
+API_WORKERS = int(os.getenv("SKILLSCOUT_API_WORKERS", "8"))
+MAX_BODY = 1 << 20
+SLOT_ANSWERS = ("budget", "timeline", "location", "hiring_type", "company_name")
+API_TOKEN = os.getenv("SKILLSCOUT_API_TOKEN", "")
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="api")
+    return _EXECUTOR
+
+class HTTPError(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status, self.detail = status, detail
+
+# ---------------- state helpers ----------------
+def _jsonable(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", exclude_unset=not isinstance(obj, AgentState))
+    if isinstance(obj, dict):
+        return {k: _jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_jsonable(v) for v in obj]
+    return obj
+
+def _state_from(body: Dict) -> AgentState:
+    """
+    The state a request works on. Stored sessions are only ever loaded by id: a posted
+    `state` or `user_query` starts a new session with a server-generated id (a posted state
+    contributes its query and slots, never artifacts), so no request can overwrite a
+    session it did not create or plant a draft for /email to send.
+    """
+    sid = body.get("session_id")
+    try:
+        if body.get("state"):
+            given = AgentState.model_validate(body["state"])
+            return AgentState(session_id=str(uuid.uuid4()), user_query=given.user_query, slots=given.slots)
+        if sid and not body.get("user_query"):
+            state = STORE.load(sid)
+            if state is None:
+                raise HTTPError(404, f"unknown session {sid}")
+            return state
+        if body.get("user_query"):
+            if sid is not None and (not isinstance(sid, str) or STORE.load(sid) is not None):
+                raise HTTPError(409, f"session {sid} exists: omit session_id to start a new one")
+            return AgentState(session_id=sid or str(uuid.uuid4()), user_query=str(body["user_query"]))
+    except ValidationError as e:
+        raise HTTPError(422, str(e))
+    raise HTTPError(400, "expected one of: state, session_id, user_query")
+
+def _intake(body: Dict) -> Dict:
+    state = intake_node(_state_from(body))
+    state.market = market_research_node(state)["market"]
+    state = clarifier_node(state)
+    STORE.save(state)
+    return {"state": _jsonable(state), "questions": missing_questions(state.slots, state.market)}
+
+def _clarify(body: Dict) -> Dict:
+    state = _state_from(body)
+    answers = body.get("answers") or {}
+    if not isinstance(answers, dict):
+        raise HTTPError(400, "answers must be an object")
+    s = state.slots
+    for k in SLOT_ANSWERS:
+        if answers.get(k):
+            setattr(s, k, str(answers[k]).strip())
+    skills = answers.get("skills_hint") or answers.get("skills")
+    if skills:
+        if not isinstance(skills, (str, list)) or not all(isinstance(x, str) for x in skills):
+            raise HTTPError(400, "skills must be a string or a list of strings")
+        parsed = skills.split(",") if isinstance(skills, str) else skills
+        s.skills_hint = VOCAB.canonical(s.skills_hint, parsed)
+    if answers.get("free_text"):
+        extract_slots(str(answers["free_text"]), state)
+    state = clarifier_node(state)
+    STORE.save(state)
+    return {"state": _jsonable(state), "questions": missing_questions(state.slots, state.market)}
+
+def _email(body: Dict) -> Dict:
+    # only a stored session's own draft is sent: callers cannot supply text or a state
+    sid = body.get("session_id")
+    if not isinstance(sid, str) or not sid or body.keys() - {"session_id", "to"}:
+        raise HTTPError(400, "expected only session_id and to")
+    state = STORE.load(sid)
+    if state is None:
+        raise HTTPError(404, f"unknown session {sid}")
+    if not state.artifacts.email_draft:
+        raise HTTPError(409, "no email draft yet: run /generate first")
+    to = body.get("to") or []
+    if not isinstance(to, (str, list)) or not all(isinstance(x, str) for x in to):
+        raise HTTPError(400, "to must be a string or a list of strings")
+    try:
+        mid = MAILER.send_draft(state.session_id, to.split(",") if isinstance(to, str) else to,
+                                state.artifacts.email_draft)
+    except ValueError as e:
+        raise HTTPError(400, str(e))
+    return {"id": mid, **MAILER.outbox.status(mid), "sending": MAILER.enabled}
+
+# ---------------- ASGI plumbing ----------------
+async def _read_json(receive) -> Dict:
+    chunks, size = [], 0
+    while True:
+        msg = await receive()
+        chunk = msg.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY:
+            raise HTTPError(413, "request body too large")
+        chunks.append(chunk)
+        if not msg.get("more_body"):
+            break
+    raw = b"".join(chunks)
+    if not raw:
+        return {}
+    try:
+        body = json.loads(raw)
+    except ValueError:
+        raise HTTPError(400, "invalid JSON")
+    if not isinstance(body, dict):
+        raise HTTPError(400, "expected a JSON object")
+    return body
+
+async def _send_json(send, status: int, payload: Any) -> None:
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(data)).encode())]})
+    await send({"type": "http.response.body", "body": data})
+
+async def _stream_generate(body: Dict, send) -> None:
+    loop = asyncio.get_running_loop()
+    state = await loop.run_in_executor(_executor(), _state_from, body)
+    queue: asyncio.Queue = asyncio.Queue()
+    DONE = object()
+
+    def work() -> None:
+        try:
+            app = get_graph(incremental_mode=True)
+            final = None
+            for mode, chunk in app.stream(graph_input(state), stream_mode=["updates", "values"]):
+                if mode == "updates":
+                    for node, update in chunk.items():
+                        loop.call_soon_threadsafe(queue.put_nowait, {"node": node, "update": _jsonable(update)})
+                else:
+                    final = chunk
+            out = AgentState.model_construct(**final)  # channel values are already validated models
+            STORE.save(out)
+            loop.call_soon_threadsafe(queue.put_nowait, {"done": True, "state": _jsonable(out)})
+        except Exception as e:  # surfaced to the client as the last stream line
+            loop.call_soon_threadsafe(queue.put_nowait, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, DONE)
+
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")]})
+    loop.run_in_executor(_executor(), work)
+    while True:
+        item = await queue.get()
+        if item is DONE:
+            break
+        line = json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n"
+        await send({"type": "http.response.body", "body": line.encode("utf-8"), "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+ROUTES: Dict[tuple, Callable[[Dict], Dict]] = {
+    ("POST", "/intake"): _intake,
+    ("POST", "/clarify"): _clarify,
+    ("POST", "/email"): _email,
+}
+AUTH_ROUTES = {("POST", "/email")}  # act outside the service: bearer token required
+
+def _check_token(scope) -> None:
+    if not API_TOKEN:
+        raise HTTPError(403, "disabled: set SKILLSCOUT_API_TOKEN to enable")
+    auth = dict(scope.get("headers") or []).get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip().encode(), API_TOKEN.encode()):
+        raise HTTPError(401, "missing or invalid bearer token")
+
+async def app(scope, receive, send) -> None:
+    if scope["type"] == "lifespan":
+        while True:
+            msg = await receive()
+            if msg["type"] == "lifespan.startup":
+                await asyncio.get_running_loop().run_in_executor(_executor(), get_graph, None, True)
+                INDEX.refresh()  # postings index: built or caught up off the request path
+                await send({"type": "lifespan.startup.complete"})
+            elif msg["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+    method, path = scope["method"], scope["path"].rstrip("/") or "/"
+    try:
+        if (method, path) == ("GET", "/healthz"):
+            await _send_json(send, 200, {"ok": True})
+            return
+        if (method, path) == ("POST", "/generate"):
+            await _stream_generate(await _read_json(receive), send)
+            return
+        handler = ROUTES.get((method, path))
+        if handler is None:
+            raise HTTPError(404, "not found")
+        if (method, path) in AUTH_ROUTES:
+            _check_token(scope)
+        body = await _read_json(receive)
+        result = await asyncio.get_running_loop().run_in_executor(_executor(), handler, body)
+        await _send_json(send, 200, result)
+    except HTTPError as e:
+        await _send_json(send, e.status, {"error": e.detail})
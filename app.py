@@ -1,9 +1,17 @@
 # app.py — interactive clarifying step + results
-import uuid, json
-from typing import List
+import time
+import uuid
+from typing import List, Optional
 import streamlit as st
 from state import AgentState
-from graph import build_graph
+from graph import get_graph, graph_input, graph_stats, prewarm
+from memory import STORE
+from tools.artifact_cache import ARTIFACT_CACHE
+from tracing import TRACER
+from export import BULK_EXPORT, EXPORT_DIR, EXPORTS
+from session_state import SESSIONS
+from tools.mailer import MAILER
+from tools.skill_vocab import VOCAB
 
 st.set_page_config(page_title="SkillScout – HR Agent", page_icon="🧭", layout="wide")
 
@@ -20,8 +28,11 @@ header {visibility:hidden;} [data-testid="stToolbar"]{visibility:hidden;} footer
 # ---------------- Session ----------------
 if "session_id" not in st.session_state:
     st.session_state.session_id = str(uuid.uuid4())
-if "last" not in st.session_state:
-    st.session_state.last = None  # AgentState after each run
+if "has_result" not in st.session_state:
+    # the AgentState itself lives in SESSIONS (packed, memory-capped); only keys stay here
+    st.session_state.has_result = False
+    st.session_state.version = None  # its SessionStore sequence number (keys cached exports)
+    st.session_state.timing = None  # time to first content / total of the last run
 
 # ---------------- Helpers ----------------
 def missing_slots(state: AgentState):
@@ -35,10 +46,97 @@ def missing_slots(state: AgentState):
         "skills": not bool(s.skills_hint),
     }
 
+def _show_progress(live, mode: str, chunk, shown: set) -> bool:
+    """Render whatever a stream chunk finished (a JD, the plan, the email); True if anything."""
+    drew = False
+    if mode == "custom" and "jd" in chunk:
+        for title, md in chunk["jd"].items():
+            live.markdown(f"**{title} (Draft)**")
+            live.markdown(md)
+            shown.add(title)
+            drew = True
+    elif mode == "updates":
+        for node, update in chunk.items():
+            a = update.get("artifacts") if isinstance(update, dict) else None
+            if a is None or node not in ("jd_generator", "plan_builder", "email_writer"):
+                continue
+            for title, md in a.jds.items():  # JDs the node did not stream
+                if title not in shown:
+                    live.markdown(f"**{title} (Draft)**")
+                    live.markdown(md)
+                    shown.add(title)
+                    drew = True
+            if "plan_markdown" in a.model_fields_set:
+                live.markdown(a.plan_markdown)
+                drew = True
+            if a.email_draft:
+                live.markdown("**Kickoff Email**")
+                live.code(a.email_draft, language=None)
+                drew = True
+    return drew
+
 def run_graph_with(state: AgentState) -> AgentState:
-    app = build_graph()
-    out = app.invoke(state.model_dump())
-    return AgentState.model_validate(out)
+    # compiled once per process, shared across sessions; incremental mode reuses
+    # JD/plan/email artifacts whose input slots did not change since the last run
+    app = get_graph(incremental_mode=True)
+    # Stream the run: each JD, the plan and the email are drawn as soon as they land.
+    # The graph takes the model itself (slots/artifacts copied, see graph_input); its output
+    # channels are already validated models, so rebuild the state without another round trip.
+    t0 = time.perf_counter()
+    first_ms, final, shown = None, None, set()
+    with st.status("Drafting…", expanded=True) as live:
+        for mode, chunk in app.stream(graph_input(state), stream_mode=["custom", "updates", "values"]):
+            if mode == "values":
+                final = chunk
+            elif _show_progress(live, mode, chunk, shown) and first_ms is None:
+                first_ms = (time.perf_counter() - t0) * 1000
+        total_ms = (time.perf_counter() - t0) * 1000
+        live.update(label=f"Done in {total_ms / 1000:.1f} s", state="complete", expanded=False)
+    st.session_state.timing = {"first_content_ms": first_ms, "total_ms": total_ms}
+    out = AgentState.model_construct(**final)
+    # appends only what changed since this session's last save
+    st.session_state.version = STORE.save(out)
+    SESSIONS.put(out)
+    st.session_state.has_result = True
+    return out
+
+def current_state() -> Optional[AgentState]:
+    """
+    This session's latest state (from SESSIONS, or the session store if it was dropped).
+    None, with the result flags reset, once neither has it (e.g. the session was deleted).
+    """
+    sid = st.session_state.session_id
+    state = SESSIONS.get(sid)
+    if state is None:
+        state = STORE.load(sid)
+        if state is None:
+            st.session_state.has_result = False
+            st.session_state.version = None
+            return None
+        SESSIONS.put(state)
+    return state
+
+# ---------------- Past sessions ----------------
+with st.sidebar:
+    st.markdown("#### Past sessions")
+    recent = STORE.list_sessions(limit=20)
+    if not recent:
+        st.caption("Sessions you run are saved here.")
+    else:
+        labels = {r["session_id"]: (r["user_query"] or "(empty)")[:48] for r in recent}
+        picked = st.selectbox("Resume", list(labels), format_func=labels.get, index=None,
+                              placeholder="Pick a session")
+        if picked and st.button("Resume session"):
+            resumed = STORE.load(picked)
+            if resumed is None:
+                st.warning("That session no longer exists.")
+            else:
+                SESSIONS.discard(st.session_state.session_id)  # nothing refers to the old one any more
+                st.session_state.session_id = picked
+                SESSIONS.put(resumed)
+                st.session_state.has_result = True
+                st.session_state.version = STORE.head(picked)
+                st.rerun()
 
 # ---------------- HERO ----------------
 st.markdown("## What roles do you need?")
@@ -54,15 +152,18 @@ prompt = st.text_input(
 if st.button("Ask Agent", type="primary"):
     # First pass: run the graph with just the raw prompt
     first = AgentState(session_id=st.session_state.session_id, user_query=prompt.strip())
-    st.session_state.last = run_graph_with(first)
+    run_graph_with(first)
+    st.rerun()
 
 st.divider()
 
 # ================= FLOW =================
-if not st.session_state.last:
+if not st.session_state.has_result:
     st.info("Enter a request above and click **Ask Agent**.")
 else:
-    state = st.session_state.last
+    state = current_state()
+    if state is None:
+        st.rerun()  # shows the empty prompt again
     miss = missing_slots(state)
 
     # ------ STEP 1: Clarify (only when something is missing) ------
@@ -77,7 +178,11 @@ else:
             budget_val = None
             if miss["budget"]:
                 with c1:
-                    budget_val = st.text_input("Budget (e.g., $150k, $40/hr, 12 LPA)")
+                    budget_val = st.text_input("Budget (e.g., $150k, $40/hr, 12 LPA)",
+                                               placeholder=state.market.get("budget", ""))
+                    if state.market.get("budget"):
+                        st.caption(f"Similar postings: {state.market['budget']} "
+                                   f"(from {state.market['based_on']} matches)")
 
             # timeline
             timeline_val = None
@@ -105,7 +210,8 @@ else:
             skills_val = None
             if miss["skills"]:
                 with c1:
-                    skills_val = st.text_input("Key skills (comma-separated) e.g., python, kubernetes")
+                    skills_val = st.text_input("Key skills (comma-separated) e.g., python, kubernetes",
+                                               placeholder=", ".join(state.market.get("skills", [])))
 
             submitted = st.form_submit_button("Continue")
             if submitted:
@@ -120,17 +226,14 @@ else:
                 if miss["hiring_type"] and type_val:
                     s.hiring_type = type_val.strip() or None
                 if miss["skills"] and skills_val:
-                    parsed = [x.strip() for x in skills_val.split(",") if x.strip()]
-                    # avoid duplicates
-                    existing = set(s.skills_hint or [])
-                    s.skills_hint = list(existing.union(parsed))
+                    # canonical names, deduplicated ("k8s" and "Kubernetes" are one skill)
+                    s.skills_hint = VOCAB.canonical(s.skills_hint, skills_val.split(","))
 
                 # Re-run the graph with updated slots (same user_query/session_id)
-                st.session_state.last = run_graph_with(state)
+                run_graph_with(state)
                 st.rerun()
 
     # ------ STEP 2: Results ------
-    state = st.session_state.last
     tabs = st.tabs(["Job Descriptions", "Checklist", "Export", "Analytics"])
 
     with tabs[0]:
@@ -152,15 +255,91 @@ else:
             st.json(state.artifacts.plan_json)
 
     with tabs[2]:
-        payload = state.model_dump()
-        st.download_button("Download session.json", data=json.dumps(payload, indent=2),
-                           file_name="session.json")
+        # serialized once per saved version of the state; later reruns reuse the bytes
+        st.download_button("Download session.json", data=EXPORTS.session_json(state, st.session_state.version),
+                           file_name="session.json", mime="application/json")
         st.download_button("Download results.md", data=state.artifacts.summary_md,
                            file_name="results.md")
 
+        st.caption(f"All sessions: plans, JDs and session metadata as compact NDJSON in `{EXPORT_DIR}`")
+        # runs on BULK_EXPORT's thread: a rerun only starts it or reads its status
+        job = BULK_EXPORT.status()
+        if st.button("Export all sessions", disabled=job["state"] == "running"):
+            BULK_EXPORT.start(STORE.iter_states, EXPORT_DIR)
+            job = BULK_EXPORT.status()
+        if job["state"] == "running":
+            st.info(f"Exporting in the background (started {time.time() - job['started_at']:.0f} s ago)…")
+            st.button("Refresh export status")
+        elif job["state"] == "failed":
+            st.error(f"Export failed: {job['error']}")
+        elif job["state"] == "done":
+            counts = job["counts"]
+            st.success(f"Exported {counts['sessions']} sessions, {counts['plans']} plan stages, {counts['jds']} JDs.")
+            st.dataframe(job["owners"], hide_index=True, use_container_width=True)
+
+        if state.artifacts.email_draft:
+            # queued in the outbox and sent by the mailer's background threads: never blocks the page
+            with st.form("email_form", clear_on_submit=False):
+                to = st.text_input("Send kickoff email to (comma-separated)", placeholder="lead@acme.com, hr@acme.com")
+                if st.form_submit_button("Send kickoff email"):
+                    try:
+                        MAILER.send_draft(state.session_id, to.split(","), state.artifacts.email_draft)
+                        st.success("Queued for delivery." if MAILER.enabled
+                                   else "Queued; set SKILLSCOUT_SMTP_HOST to deliver it.")
+                    except ValueError as e:  # no, malformed or disallowed recipients
+                        st.warning(f"Could not queue it: {e}.")
+            sent = MAILER.outbox.counts(state.session_id)
+            if any(sent.values()):
+                st.caption(f"Kickoff emails — queued: {sent['queued'] + sent['sending']}, sent: {sent['sent']}, "
+                           f"failed: {sent['dead']}")
+
     with tabs[3]:
         a = state.analytics or {}
         c1, c2, c3 = st.columns(3)
         c1.metric("Roles Created", a.get("roles_created", 0))
         c2.metric("Checklist Items", a.get("checklist_items", 0))
         c3.metric("Sessions", a.get("sessions", 1))
+
+        timing = st.session_state.timing
+        if timing:
+            st.caption("Last run")
+            t1, t2 = st.columns(2)
+            first_ms = timing["first_content_ms"]
+            t1.metric("Time to First Content", f"{first_ms:.0f} ms" if first_ms is not None else "—",
+                      help="From starting the run to the first JD, plan or email on screen")
+            t2.metric("Total Run Time", f"{timing['total_ms']:.0f} ms")
+
+        g = graph_stats()
+        st.caption("Graph compilation (this process)")
+        d1, d2, d3 = st.columns(3)
+        d1.metric("Compiles", g["compiles"])
+        d2.metric("Cache Hits", g["hits"])
+        d3.metric("Compile Time", f"{g['compile_ms']:.1f} ms")
+
+        cache = ARTIFACT_CACHE.snapshot()
+        if cache:
+            st.caption("Artifact cache (this process)")
+            cols = st.columns(len(cache))
+            for col, (ns, c) in zip(cols, sorted(cache.items())):
+                hits = c["hits"] + c["disk_hits"]
+                total = hits + c["misses"]
+                col.metric(f"{ns.title()} hits", f"{hits}/{total}",
+                           f"{hits / total:.0%} hit rate" if total else None, delta_color="off")
+
+        mem, held = SESSIONS.usage(state.session_id), SESSIONS.stats()
+        st.caption("Session state memory (this process)")
+        m1, m2, m3 = st.columns(3)
+        m1.metric("This Session", f"{mem['bytes'] / 1024:.1f} KiB", mem["where"] or "—", delta_color="off")
+        m2.metric("Resident", f"{held['resident_bytes'] / 2**20:.2f} / {held['max_bytes'] / 2**20:.0f} MiB",
+                  f"{held['resident_sessions']} sessions", delta_color="off")
+        m3.metric("Spilled to Disk", held["spilled_sessions"], f"{held['spilled_bytes'] / 2**20:.1f} MiB",
+                  delta_color="off")
+
+        timings = TRACER.last_run(state.session_id)
+        if timings:
+            st.caption("Node timings (last run of this session)")
+            st.dataframe(timings, hide_index=True, use_container_width=True)
+
+# First page is on screen: import langgraph and compile the graph in the background so
+# the first "Ask Agent" click does not pay for it (no-op after the first run).
+prewarm(incremental_mode=True)
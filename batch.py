@@ -0,0 +1,166 @@
+# batch.py — headless bulk runs: JSONL hiring requests in, JDs/plans/emails out
+#
+#   python batch.py hiring_requests.jsonl results.jsonl --workers 4
+#
+# Each input line is a JSON object with an id ("request_id" or "id") and the prompt
+# ("user_query", "prompt" or "body"); any Slots fields present (budget, timeline,
+# location, hiring_type, skills_hint, company_name) are used as clarified answers.
+# Results are appended to the output as they finish, so a crashed or interrupted run
+# can simply be started again: ids already written successfully are skipped, and so is
+# an id repeated within the input. A failed id is retried on the next run and its new
+# row is appended after the error row, so readers should keep the last row per id.
+#
+#   python batch.py requests.jsonl results.jsonl --email-to lead@acme.com,hr@acme.com
+#
+# also queues each result's kickoff email in the durable outbox (tools/mailer.py) as it
+# is written; delivery happens on the mailer's background threads and the run waits for
+# the queue to drain at the end. Re-running never sends the same draft twice.
+import argparse
+import json
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from state import AgentState, Slots
+
+QUERY_KEYS = ("user_query", "prompt", "body")
+SLOT_KEYS = ("budget", "timeline", "location", "hiring_type", "skills_hint", "company_name")
+
+def iter_requests(path: Path) -> Iterator[Tuple[str, Dict]]:
+    """Stream (request_id, record) pairs; blank or malformed lines are skipped."""
+    with path.open(encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"skipping malformed line {lineno}", file=sys.stderr)
+                continue
+            rid = str(rec.get("request_id") or rec.get("id") or f"line-{lineno}")
+            yield rid, rec
+
+def completed_ids(path: Path) -> Set[str]:
+    """Ids already written successfully; also drops a torn last line left by a crash."""
+    done: Set[str] = set()
+    if not path.exists():
+        return done
+    with path.open("r+b") as f:
+        offset = 0
+        for line in f:  # streamed: memory follows the number of ids, not the file size
+            if not line.endswith(b"\n"):
+                f.truncate(offset)
+                break
+            offset += len(line)
+            try:
+                rec = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if "error" not in rec:
+                done.add(str(rec.get("request_id")))
+    return done
+
+def run_request(rid: str, rec: Dict) -> Dict:
+    """Run one request through the compiled graph and return a compact result row."""
+    from graph import get_graph  # resolved inside the worker; compiled once per process
+
+    query = next((str(rec[k]) for k in QUERY_KEYS if rec.get(k)), "")
+    slots = Slots(**{k: rec[k] for k in SLOT_KEYS if rec.get(k)})
+    state = AgentState(session_id=rid, user_query=query, slots=slots)
+    try:
+        out = AgentState.model_construct(**get_graph().invoke(state))
+    except Exception as e:  # keep the batch going; failed ids are retried on resume
+        return {"request_id": rid, "error": f"{type(e).__name__}: {e}"}
+    a = out.artifacts
+    return {
+        "request_id": rid,
+        "roles": [r.title for r in out.slots.roles],
+        "jds": a.jds,
+        "plan": a.plan_json,
+        "plan_markdown": a.plan_markdown,
+        "email": a.email_draft,
+    }
+
+def run_batch(in_path, out_path, workers: int = 0, max_in_flight: Optional[int] = None,
+              email_to: Optional[List[str]] = None, mailer=None) -> Dict[str, int]:
+    """
+    Stream in_path through the graph, appending results to out_path.
+    workers=0 runs in-process; otherwise a process pool of that size is used and at
+    most max_in_flight requests (default 2 x workers) are queued at any time.
+    With email_to, each result's email draft is queued on `mailer` (default MAILER).
+    """
+    in_path, out_path = Path(in_path), Path(out_path)
+    done = completed_ids(out_path)
+    stats = {"written": 0, "skipped": 0, "errors": 0}
+    if email_to:
+        if mailer is None:
+            from tools.mailer import MAILER as mailer
+        email_to = mailer.check_recipients(email_to)  # a bad address fails before any request runs
+        stats["emailed"] = 0
+
+    def pending_requests() -> Iterator[Tuple[str, Dict]]:
+        for rid, rec in iter_requests(in_path):
+            if rid in done:
+                stats["skipped"] += 1
+                continue
+            done.add(rid)  # a repeated id later in the same input is skipped too
+            yield rid, rec
+
+    todo = pending_requests()
+    # one synchronous catch-up here, so every request (and every worker process, which opens
+    # the index from disk) sees the same postings instead of racing a background build
+    from tools.search_tool import INDEX
+    INDEX.update()
+
+    with out_path.open("a", encoding="utf-8") as out:
+        def write(row: Dict) -> None:
+            out.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+            out.flush()
+            stats["errors" if "error" in row else "written"] += 1
+            if email_to and row.get("email"):
+                mailer.send_draft(row["request_id"], email_to, row["email"])
+                stats["emailed"] += 1
+
+        if workers <= 0:
+            for rid, rec in todo:
+                write(run_request(rid, rec))
+            return stats
+
+        limit = max_in_flight or workers * 2
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for rid, rec in todo:
+                pending.add(pool.submit(run_request, rid, rec))
+                if len(pending) >= limit:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        write(fut.result())
+            for fut in wait(pending).done:
+                write(fut.result())
+    return stats
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Generate JDs, plans and emails for a JSONL file of hiring requests.")
+    ap.add_argument("input", help="input JSONL of hiring requests")
+    ap.add_argument("output", help="output JSONL (appended to; existing ids are skipped)")
+    ap.add_argument("--workers", type=int, default=0, help="process pool size (0 = run in-process)")
+    ap.add_argument("--max-in-flight", type=int, default=None, help="queued requests cap (default 2 x workers)")
+    ap.add_argument("--email-to", default=None, help="comma-separated recipients for each kickoff email")
+    args = ap.parse_args(argv)
+    email_to = [a for a in (args.email_to or "").split(",") if a.strip()]
+    stats = run_batch(args.input, args.output, workers=args.workers, max_in_flight=args.max_in_flight,
+                      email_to=email_to)
+    print(f"written={stats['written']} skipped={stats['skipped']} errors={stats['errors']}")
+    if email_to:
+        from tools.mailer import MAILER
+
+        if MAILER.enabled and not MAILER.flush(timeout=600):
+            print("mail still queued; it is sent on the next run", file=sys.stderr)
+        print(f"emailed={stats['emailed']} outbox={MAILER.outbox.counts()}"
+              + ("" if MAILER.enabled else " (no SKILLSCOUT_SMTP_HOST: queued, not sent)"))
+    return 0 if not stats["errors"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
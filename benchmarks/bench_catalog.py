@@ -0,0 +1,76 @@
+# benchmarks/bench_catalog.py — role catalogue cold start and lookup latency
+#
+#   python -m benchmarks.bench_catalog [--roles 5000]
+#
+# Builds a synthetic roles.yml, then times: the old import-time yaml.safe_load,
+# a cold RoleCatalog that has to compile the index, a cold RoleCatalog that finds
+# the cached index, and normalized/alias lookups on a warm catalogue.
+import argparse
+import random
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+import yaml
+
+from tools.role_catalog import RoleCatalog
+
+def synthetic_catalog(path: Path, n_roles: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    words = ["platform", "backend", "frontend", "data", "cloud", "security", "mobile", "ml",
+             "growth", "product", "analytics", "infra", "quant", "research", "devops"]
+    roles, titles = {}, []
+    for i in range(n_roles):
+        title = f"{rng.choice(words).title()} {rng.choice(words).title()} Engineer {i}"
+        titles.append(title)
+        roles[title] = {
+            "aliases": [f"{title} lead", f"sr {title}"],
+            "summary": f"You will own {title.lower()} work end to end.",
+            "responsibilities": [f"Responsibility {j} for {title}" for j in range(5)],
+            "must_have": [f"Must have {j}" for j in range(4)],
+            "nice_to_have": [f"Nice to have {j}" for j in range(3)],
+        }
+    path.write_text(yaml.safe_dump(roles, sort_keys=False), encoding="utf-8")
+    return titles
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--roles", type=int, default=5000)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        yml = tmp / "roles.yml"
+        titles = synthetic_catalog(yml, args.roles)
+
+        t0 = time.perf_counter()
+        yaml.safe_load(yml.read_text(encoding="utf-8"))
+        parse_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        RoleCatalog(yml, cache_dir=tmp / "cache").version
+        compile_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        cat = RoleCatalog(yml, cache_dir=tmp / "cache")
+        cat.version
+        cached_ms = (time.perf_counter() - t0) * 1000
+        assert cat.stats["index_hits"] == 1
+
+        probes = [titles[i].upper() for i in range(0, len(titles), max(1, len(titles) // 100))]
+        aliases = [f"sr-{t.lower()}" for t in probes]
+        n = 20000
+        exact_us = timeit.timeit(lambda: [cat.get(t) for t in probes], number=n // len(probes)) / n * 1e6
+        alias_us = timeit.timeit(lambda: [cat.get(t) for t in aliases], number=n // len(probes)) / n * 1e6
+        assert all(cat.get(t) for t in aliases)
+
+    print(f"roles: {args.roles}")
+    print(f"yaml.safe_load (old import-time path): {parse_ms:8.1f} ms")
+    print(f"cold start, compile + write index:     {compile_ms:8.1f} ms")
+    print(f"cold start, cached index:              {cached_ms:8.1f} ms")
+    print(f"lookup, normalized title:              {exact_us:8.2f} us")
+    print(f"lookup, alias:                         {alias_us:8.2f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_coldstart.py — fresh-process import and first-page render times
+#
+#   python -m benchmarks.bench_coldstart [--runs 5]
+#
+# Each measurement runs in a new interpreter so nothing is already imported. "first
+# page" renders app.py once through Streamlit's AppTest (no browser, same script run
+# a user's first visit triggers); "imports" is the bare import of each entry module.
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("langgraph", "langchain_core", "requests", "yaml")
+
+PAGE = """
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+assert not at.exception, at.exception
+print(json.dumps({"ms": (time.perf_counter() - t0) * 1000, "heavy": [m for m in %r if m in sys.modules]}))
+"""
+
+IMPORT = """
+import json, sys, time
+t0 = time.perf_counter()
+import %s
+print(json.dumps({"ms": (time.perf_counter() - t0) * 1000, "heavy": [m for m in %r if m in sys.modules]}))
+"""
+
+def fresh(code: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    targets = [("first page (app.py)", PAGE % (HEAVY,))]
+    targets += [(f"import {m}", IMPORT % (m, HEAVY)) for m in ("graph", "api", "batch", "nodes.jd_generator")]
+    for label, code in targets:
+        runs = [fresh(code) for _ in range(args.runs)]
+        ms = statistics.median(r["ms"] for r in runs)
+        print(f"{label:<28} {ms:8.0f} ms   heavy modules loaded: {', '.join(runs[0]['heavy']) or '-'}")
+
+if __name__ == "__main__":
+    main()
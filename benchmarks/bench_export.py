@@ -0,0 +1,78 @@
+# benchmarks/bench_export.py — bulk export size/speed and per-owner ETA aggregation
+#
+#   python -m benchmarks.bench_export [--sessions 5000]
+#
+# Fills a temp SessionStore with graph outputs (a handful of real runs re-keyed as many
+# sessions), then compares aggregating ETAs per owner from one pretty-printed
+# session.json per session (the Export tab's format) against the bulk NDJSON and
+# Parquet exports. Peak memory is measured with tracemalloc around each export.
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+from export import dumps_state, eta_by_owner, export_sessions, pq
+from graph import build_graph
+from memory import SessionStore
+from state import AgentState
+
+PROMPTS = ["need a founding engineer, remote, $150k, 6 weeks", "need a genai intern and a devops engineer",
+           "ml engineer and staff engineer, hybrid", "need a backend engineer, full-time"]
+
+def fill(store: SessionStore, sessions: int) -> None:
+    app = build_graph(tracer=None)
+    outs = [AgentState.model_construct(**app.invoke(AgentState(session_id="seed", user_query=p))) for p in PROMPTS]
+    for i in range(sessions):
+        store.save(outs[i % len(outs)].model_copy(update={"session_id": f"sess-{i:06d}"}))
+
+def per_file_totals(root: Path) -> dict:
+    totals = defaultdict(int)
+    for path in root.iterdir():
+        for it in json.loads(path.read_bytes())["artifacts"]["plan_json"]:
+            totals[it["owner"]] += it["eta_days"]
+    return totals
+
+def timed(fn):
+    """(result, seconds, peak traced bytes); timed and traced in separate runs."""
+    t0 = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, elapsed, peak
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=5000)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        store = SessionStore(tmp / "sessions.db")
+        fill(store, args.sessions)
+
+        per_file = tmp / "session_json"
+        per_file.mkdir()
+        _, t_write, peak = timed(lambda: [(per_file / f"{d['session_id']}.json").write_bytes(
+            dumps_state(AgentState.model_validate(d))) for d, _ in store.iter_states()])
+        size = sum(p.stat().st_size for p in per_file.iterdir())
+        totals, t_agg, _ = timed(lambda: per_file_totals(per_file))
+        print(f"{'session.json files':<20} write {t_write:6.2f} s  {size / 2**20:7.1f} MiB  "
+              f"peak {peak / 2**20:6.1f} MiB   aggregate {t_agg * 1000:7.0f} ms")
+
+        for fmt in ("ndjson", "parquet") if pq is not None else ("ndjson",):
+            out = tmp / fmt
+            _, t_write, peak = timed(lambda: export_sessions(store.iter_states(), out, fmt))
+            size = sum(p.stat().st_size for p in out.iterdir())
+            rows, t_agg, agg_peak = timed(lambda: eta_by_owner(out / f"plans.{fmt}"))
+            assert {r["owner"]: r["eta_days_total"] for r in rows} == dict(totals)
+            print(f"{'bulk ' + fmt:<20} write {t_write:6.2f} s  {size / 2**20:7.1f} MiB  "
+                  f"peak {peak / 2**20:6.1f} MiB   aggregate {t_agg * 1000:7.0f} ms (peak {agg_peak / 2**10:.0f} KiB)")
+
+if __name__ == "__main__":
+    main()
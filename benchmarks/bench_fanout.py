@@ -0,0 +1,71 @@
+# benchmarks/bench_fanout.py — end-to-end latency, chain vs fan-out, with a simulated slow LLM
+#
+#   python -m benchmarks.bench_fanout [--delay 0.3] [--roles 3]
+#
+# Every JD polish, plan build and email draft sleeps `delay` seconds, standing in for a
+# local LLM call. "chain" wires the nodes one after another and renders roles serially
+# (the previous topology); "fan-out" is graph.EDGES with concurrent per-role JDs.
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import graph
+import nodes.email_writer as email_writer
+import nodes.jd_generator as jd_generator
+import nodes.plan_builder as plan_builder
+from state import AgentState
+
+LINEAR_EDGES = [("intake", "market_research"), ("market_research", "clarifier"), ("clarifier", "jd_generator"),
+                ("jd_generator", "plan_builder"), ("plan_builder", "email_writer"), ("email_writer", "presenter")]
+
+ROLE_PROMPTS = ["founding engineer", "genai intern", "ml engineer", "devops"]
+
+def _slow(fn, delay):
+    def wrapper(*args, **kwargs):
+        time.sleep(delay)
+        return fn(*args, **kwargs)
+    return wrapper
+
+def run(edges, prompt: str, jd_workers: int) -> float:
+    pool = ThreadPoolExecutor(max_workers=jd_workers)
+    real_pool = jd_generator._jd_pool
+    jd_generator._jd_pool = lambda: pool
+    try:
+        app = graph.build_graph(edges=edges)
+        t0 = time.perf_counter()
+        app.invoke(AgentState(session_id="bench", user_query=prompt).model_dump())
+        return time.perf_counter() - t0
+    finally:
+        jd_generator._jd_pool = real_pool
+        pool.shutdown()
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--delay", type=float, default=0.3, help="simulated LLM latency per call (s)")
+    ap.add_argument("--roles", type=int, default=3, choices=range(1, len(ROLE_PROMPTS) + 1))
+    args = ap.parse_args(argv)
+
+    prompt = "need a " + " and a ".join(ROLE_PROMPTS[:args.roles]) + ", remote, $150k, 6 weeks"
+    saved = (jd_generator._polish, plan_builder.build_checklist, email_writer.kickoff_email,
+             os.environ.get("SKILLSCOUT_LLM_POLISH"))
+    jd_generator._polish = _slow(lambda title, draft: draft, args.delay)
+    plan_builder.build_checklist = _slow(plan_builder.build_checklist, args.delay)
+    email_writer.kickoff_email = _slow(email_writer.kickoff_email, args.delay)
+    os.environ["SKILLSCOUT_LLM_POLISH"] = "1"
+    try:
+        chain = run(LINEAR_EDGES, prompt, jd_workers=1)
+        fan = run(graph.EDGES, prompt, jd_workers=jd_generator.JD_WORKERS)
+    finally:
+        jd_generator._polish, plan_builder.build_checklist, email_writer.kickoff_email, polish = saved
+        if polish is None:
+            os.environ.pop("SKILLSCOUT_LLM_POLISH", None)
+        else:
+            os.environ["SKILLSCOUT_LLM_POLISH"] = polish
+
+    print(f"{args.roles} roles, {args.delay:.2f}s per simulated LLM call")
+    print(f"chain    {chain:6.2f} s")
+    print(f"fan-out  {fan:6.2f} s  x{chain / fan:.1f}")
+
+if __name__ == "__main__":
+    main()
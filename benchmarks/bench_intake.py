@@ -0,0 +1,87 @@
+# benchmarks/bench_intake.py — single-pass SlotExtractor vs the original per-keyword scans
+#
+#   python -m benchmarks.bench_intake [--aliases 300] [--skills 3000]
+#
+# The "legacy" functions below are the pre-extractor implementations of
+# nodes.intake.detect_roles / extract_slots, kept here as the reference.
+import argparse
+import random
+import re
+import timeit
+from typing import Dict, List
+
+from tools.rules import RULES, SlotExtractor
+
+_RULES = RULES.current()
+ROLE_ALIASES, SKILL_KEYWORDS = _RULES.role_aliases, _RULES.skills
+LOCATIONS, HIRING_TYPES = _RULES.locations, _RULES.hiring_types
+BUDGET_RE, TIMELINE_RE = _RULES.budget_re, _RULES.timeline_re
+
+def legacy_scan(text: str, role_aliases: Dict[str, List[str]], skills: List[str]) -> Dict:
+    t = text.lower()
+    roles = [c for c, keys in role_aliases.items() if any(k in t for k in keys)]
+    out = {"roles": tuple(roles), "budget": None, "timeline": None, "location": None,
+           "hiring_type": None, "skills": ()}
+    m = re.search(BUDGET_RE, t)
+    if m:
+        out["budget"] = m.group(0).replace(" ", "")
+    m = re.search(TIMELINE_RE, t)
+    if m:
+        out["timeline"] = m.group(0)
+    for loc, value in LOCATIONS.items():
+        if loc in t:
+            out["location"] = value
+            break
+    for ty, value in HIRING_TYPES.items():
+        if ty in t:
+            out["hiring_type"] = value
+            break
+    out["skills"] = tuple(sorted(set(s for s in skills if s in t)))
+    return out
+
+def synthetic_tables(n_aliases: int, n_skills: int, seed: int = 7):
+    rng = random.Random(seed)
+    words = ["platform", "backend", "frontend", "data", "cloud", "security", "mobile", "staff",
+             "principal", "growth", "product", "analytics", "infra", "quant", "research"]
+    aliases = {k: list(v) for k, v in ROLE_ALIASES.items()}
+    for i in range(n_aliases):
+        canonical = f"{rng.choice(words)} {rng.choice(words)} engineer {i}"
+        aliases[canonical] = [canonical, f"{canonical} lead"]
+    skills = list(SKILL_KEYWORDS) + [f"{rng.choice(words)}skill{i}" for i in range(n_skills)]
+    return aliases, skills
+
+def synthetic_prompt(length_words: int, seed: int = 11) -> str:
+    rng = random.Random(seed)
+    vocab = ["need", "a", "founding", "engineer", "and", "genai", "intern", "remote", "python",
+             "aws", "kubernetes", "for", "our", "team", "budget", "$150k", "in", "6", "weeks",
+             "contract", "react", "with", "experience", "startup", "ml", "eng", "hybrid"]
+    return " ".join(rng.choice(vocab) for _ in range(length_words))
+
+def check_equivalent(extractor: SlotExtractor, aliases, skills, prompts) -> None:
+    for p in prompts:
+        new = extractor.scan(p)._asdict()
+        old = legacy_scan(p, aliases, skills)
+        assert new == old, (p, new, old)
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--aliases", type=int, default=300, help="extra synthetic role aliases")
+    ap.add_argument("--skills", type=int, default=3000, help="extra synthetic skill keywords")
+    ap.add_argument("--number", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    for label, (aliases, skills) in [
+        ("shipped tables", ({k: list(v) for k, v in ROLE_ALIASES.items()}, list(SKILL_KEYWORDS))),
+        (f"+{args.aliases} aliases/+{args.skills} skills", synthetic_tables(args.aliases, args.skills)),
+    ]:
+        ex = SlotExtractor(aliases, LOCATIONS, HIRING_TYPES, skills, BUDGET_RE, TIMELINE_RE)
+        for words in (12, 120, 1200):
+            text = synthetic_prompt(words)
+            check_equivalent(ex, aliases, skills, [text])
+            legacy = min(timeit.repeat(lambda: legacy_scan(text, aliases, skills), number=args.number, repeat=3))
+            single = min(timeit.repeat(lambda: ex.scan(text), number=args.number, repeat=3))
+            print(f"{label:<32} {words:>5} words  legacy {legacy / args.number * 1e6:9.1f} us"
+                  f"  single-pass {single / args.number * 1e6:9.1f} us  x{legacy / single:5.1f}")
+
+if __name__ == "__main__":
+    main()
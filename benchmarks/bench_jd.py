@@ -0,0 +1,179 @@
+# benchmarks/bench_jd.py — compiled JD templates vs the original string assembly
+#
+#   python -m benchmarks.bench_jd [--seconds 2]
+#
+# legacy_compose_jd is the pre-template nodes.jd_generator._compose_jd, kept as the
+# reference the compiled renderer must match byte for byte. Since skills are canonicalized
+# (tools.skill_vocab) it maps skills_hint to display forms first, keeping request order,
+# and words skill bullets with _skill_sentence; cloud names already carry their display case.
+import argparse
+import itertools
+import time
+from typing import List, Optional
+
+from state import RoleSpec
+from nodes.jd_generator import (FALLBACK_ROLE, _bulletize, _compose_jd, _infer_duration_phrase,
+                                _sent, _skill_sentence)
+from tools.role_catalog import CATALOG
+from tools.skill_vocab import VOCAB
+
+render_jd = _compose_jd.__wrapped__  # the renderer itself, bypassing the artifact cache
+
+# -------- reference implementation --------
+def legacy_compose_jd(
+    role: RoleSpec,
+    skills_hint: List[str],
+    company_name: Optional[str],
+    location: Optional[str],
+    timeline: Optional[str],
+    budget: Optional[str],
+    hiring_type: Optional[str],
+) -> str:
+    data = CATALOG.get(role.title) or CATALOG.get(FALLBACK_ROLE) or {}
+    skills_hint = VOCAB.ordered(skills_hint or [])
+
+    # seeds
+    summary = data.get("summary", "")
+    resp_seed = list(data.get("responsibilities", []))
+    must_seed = list(data.get("must_have", []))
+    nice_seed = list(data.get("nice_to_have", []))
+
+    # merge skills into requirements (dedup, keep order)
+    if skills_hint:
+        for s in skills_hint:
+            if s not in must_seed:
+                must_seed.append(s)
+
+    # craft lines (professional)
+    company = company_name or "Our company"
+    loc_line = location or "Remote/Hybrid/Onsite (to be confirmed)"
+    duration_phrase = _infer_duration_phrase(timeline, hiring_type)
+
+    # Company Overview (two sentences is fine)
+    co_lines = [
+        f"{company} is dedicated to building innovative, AI-driven solutions for real customers.",
+        "We foster a collaborative, inclusive environment where ownership, learning, and delivery matter.",
+    ]
+    if duration_phrase and hiring_type and hiring_type.lower() in {"intern", "contract"}:
+        co_lines.append(f"We are seeking a motivated {role.title} to join the team on a {duration_phrase} basis.")
+
+    # Job Description (mix summary + skills + hiring type)
+    jd_lines = []
+    if summary:
+        jd_lines.append(summary)
+    if hiring_type and hiring_type.lower() in {"intern", "contract"} and not duration_phrase:
+        jd_lines.append(f"This is a {hiring_type.lower()} role.")
+    if skills_hint:
+        jd_lines.append("The ideal candidate is comfortable with " + ", ".join(skills_hint) + ".")
+
+    # Responsibilities (ensure full sentences)
+    resp_lines = [ _sent(x) for x in resp_seed ]
+    # add a couple sensible, professional items if missing
+    extras = []
+    if "python" in [s.lower() for s in skills_hint]:
+        extras.append("Write clean, well-documented Python code and contribute to code reviews.")
+    if any(s in {"GCP", "AWS", "Azure"} for s in skills_hint):
+        extras.append("Utilize cloud services to develop, deploy, and monitor AI workloads in a secure and cost-efficient manner.")
+    if extras:
+        resp_lines.extend(extras)
+
+    # Qualifications (must + nice) → bullets
+    qual_lines = [ _skill_sentence(m) for m in must_seed ] + [ _skill_sentence(n) for n in nice_seed ]
+
+    # Benefits (generic but professional)
+    if hiring_type and hiring_type.lower() in {"intern", "contract"}:
+        benefits = [
+            "Gain hands-on experience delivering scoped outcomes with close mentorship.",
+            "Work on real-world AI projects with clear learning objectives.",
+            "Flexible working hours and the ability to work remotely.",
+            "Competitive, market-informed compensation.",
+        ]
+    else:
+        benefits = [
+            "A culture of ownership and impact with early product influence.",
+            "Opportunities for growth, mentorship, and continuous learning.",
+            "Flexible work arrangements, including remote options.",
+            "Competitive, market-informed compensation.",
+        ]
+
+    # Build the final JD text (Markdown)
+    parts = []
+    parts.append(f"**Job Title:** {role.title}")
+    parts.append(f"**Location:** {loc_line}")
+    if duration_phrase:
+        parts.append(f"**Duration:** {duration_phrase}")
+    if budget:
+        parts.append(f"**Budget:** {budget}")
+    parts.append("")  # blank line
+
+    parts.append("**Company Overview:**")
+    parts.append(" ".join([_sent(l) for l in co_lines]))
+    parts.append("")
+
+    parts.append("**Job Description:**")
+    jd_text = " ".join([_sent(l) for l in jd_lines]) if jd_lines else "We are looking for a motivated professional to contribute to high-impact initiatives."
+    parts.append(jd_text)
+    parts.append("")
+
+    parts.append("**Responsibilities:**")
+    parts.append(_bulletize(resp_lines))
+    parts.append("")
+
+    parts.append("**Qualifications:**")
+    parts.append(_bulletize(qual_lines))
+    parts.append("")
+
+    parts.append("**Benefits:**")
+    parts.append(_bulletize(benefits))
+    parts.append("")
+
+    parts.append("**How to Apply:**")
+    parts.append("Please submit your resume (and portfolio or GitHub, if relevant). Include a brief note on your availability and the most relevant project you have built.")
+    parts.append("")
+
+    return "\n".join(parts)
+
+# -------- input grid --------
+TITLES = ["Founding Engineer", "GenAI Intern", "Genai Intern", "Ml Engineer", "Devops/Sre"]
+SKILLS = [[], ["python"], ["aws", "python", "react"], ["Kubernetes", "gcp", "vector db", "python"],
+          ["5+ years building production systems", "terraform", " ", "node"], ["k8s", "Azure", "kubernetes", "Rust"]]
+COMPANIES = [None, "acme", " Globex Corp "]
+LOCATIONS = [None, "Remote"]
+TIMELINES = [None, "8 weeks"]
+BUDGETS = [None, "$150k"]
+TYPES = [None, "intern", "Contract", "Full-Time"]
+
+def grid():
+    for title, skills, company, loc, tl, budget, htype in itertools.product(
+            TITLES, SKILLS, COMPANIES, LOCATIONS, TIMELINES, BUDGETS, TYPES):
+        yield dict(role=RoleSpec(title=title), skills_hint=skills, company_name=company,
+                   location=loc, timeline=tl, budget=budget, hiring_type=htype)
+
+def check_identical() -> int:
+    n = 0
+    for kw in grid():
+        assert render_jd(**kw) == legacy_compose_jd(**kw), kw
+        n += 1
+    return n
+
+def _rate(fn, cases, seconds: float) -> float:
+    done, t0 = 0, time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        for kw in cases:
+            fn(**kw)
+        done += len(cases)
+    return done / (time.perf_counter() - t0)
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=2.0)
+    args = ap.parse_args(argv)
+    print(f"byte-identical on {check_identical()} input combinations")
+    cases = list(grid())
+    legacy = _rate(legacy_compose_jd, cases, args.seconds)
+    compiled = _rate(render_jd, cases, args.seconds)
+    print(f"legacy   {legacy:10.0f} JDs/s/core")
+    print(f"compiled {compiled:10.0f} JDs/s/core  x{compiled / legacy:.1f}")
+
+if __name__ == "__main__":
+    main()
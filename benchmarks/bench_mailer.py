@@ -0,0 +1,202 @@
+# benchmarks/bench_mailer.py — bulk kickoff-email delivery: connect-per-email vs the pooled outbox
+#
+#   python -m benchmarks.bench_mailer [--sessions 200] [--recipients 3] [--latency-ms 5]
+#
+# Drafts kickoff emails for many sessions across a mix of roles, then delivers them to a
+# local SMTP stand-in two ways: the naive path (open a connection, send, quit — one email
+# at a time, as a "send" call inside the graph would) and tools.mailer (durable outbox,
+# worker threads with one pooled connection each, batched claims). The stand-in adds
+# --latency-ms to the greeting and to every DATA reply, modelling a remote relay's
+# handshake and acceptance time. Also reports what the caller pays per send_draft().
+#
+# LocalSMTP is a minimal stdlib SMTP server (aiosmtpd is not a dependency) with failure
+# injection; tests/test_mailer.py uses it too.
+import argparse
+import smtplib
+import socket
+import socketserver
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from nodes.email_writer import email_writer_node
+from state import AgentState, RoleSpec, Slots
+from tools.mailer import Mailer, Message, Outbox, SMTPSettings, build_email, split_draft
+
+ROLES = ["Founding Engineer", "GenAI Intern", "ML Engineer", "DevOps Engineer", "Backend Engineer",
+         "Data Engineer", "Staff Engineer"]
+
+class LocalSMTP:
+    """
+    Local SMTP server on 127.0.0.1 (random port). Received mail is kept in .messages as
+    (mail_from, [rcpt], data). Failure injection: fail_next(n, code) answers the next n
+    DATA commands with `code`; reject holds recipients refused with 550; drop_next(n)
+    closes the connection instead of answering the next n DATA commands.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.messages: List[Tuple[str, List[str], bytes]] = []
+        self.reject: Set[str] = set()
+        self.connections = 0
+        self._fail: List[int] = []
+        self._drop = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str) -> None:
+                self.wfile.write(line.encode("ascii") + b"\r\n")
+
+            def handle(self) -> None:
+                with server._lock:
+                    server.connections += 1
+                time.sleep(server.latency)
+                self.reply("220 localhost ESMTP stand-in")
+                mail_from, rcpts = None, []
+                for raw in self.rfile:
+                    cmd = raw.decode("utf-8", "replace").rstrip("\r\n")
+                    verb = cmd[:4].upper()
+                    if verb in ("EHLO", "HELO"):
+                        self.reply("250-localhost\r\n250 8BITMIME")
+                    elif verb == "MAIL":
+                        mail_from, rcpts = cmd.partition(":")[2].strip().strip("<>"), []
+                        self.reply("250 OK")
+                    elif verb == "RCPT":
+                        addr = cmd.partition(":")[2].strip().strip("<>")
+                        if addr in server.reject:
+                            self.reply("550 no such user")
+                        else:
+                            rcpts.append(addr)
+                            self.reply("250 OK")
+                    elif verb == "DATA":
+                        self.reply("354 end with <CRLF>.<CRLF>")
+                        lines = []
+                        for line in self.rfile:
+                            if line in (b".\r\n", b".\n"):
+                                break
+                            lines.append(line[1:] if line.startswith(b"..") else line)
+                        time.sleep(server.latency)
+                        with server._lock:
+                            drop = server._drop > 0
+                            server._drop -= drop
+                            code = server._fail.pop(0) if server._fail and not drop else None
+                            if not drop and code is None:
+                                server.messages.append((mail_from, rcpts, b"".join(lines)))
+                        if drop:
+                            return
+                        self.reply(f"{code} injected failure" if code else "250 queued")
+                    elif verb == "RSET":
+                        mail_from, rcpts = None, []
+                        self.reply("250 OK")
+                    elif verb == "NOOP":
+                        self.reply("250 OK")
+                    elif verb == "QUIT":
+                        self.reply("221 bye")
+                        return
+                    else:
+                        self.reply("502 command not implemented")
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+            def process_request(self, request, client_address):
+                request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                super().process_request(request, client_address)
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self.port = self._server.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    def fail_next(self, n: int, code: int = 451) -> None:
+        with self._lock:
+            self._fail.extend([code] * n)
+
+    def drop_next(self, n: int) -> None:
+        with self._lock:
+            self._drop += n
+
+    def settings(self) -> SMTPSettings:
+        return SMTPSettings(host="127.0.0.1", port=self.port, sender="hr-agent@example.com", timeout=5.0)
+
+    def __enter__(self) -> "LocalSMTP":
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+def drafts(sessions: int) -> List[Tuple[str, str]]:
+    """(session_id, kickoff email draft) for `sessions` sessions with one to three roles each."""
+    out = []
+    for i in range(sessions):
+        roles = [RoleSpec(title=ROLES[(i + k) % len(ROLES)]) for k in range(1 + i % 3)]
+        state = AgentState(session_id=f"sess-{i:05d}", user_query="bulk kickoff",
+                           slots=Slots(roles=roles, budget=f"${120 + 10 * (i % 6)}k",
+                                       timeline=f"{4 + i % 8} weeks", location="Remote"))
+        out.append((state.session_id, email_writer_node(state)["artifacts"].email_draft))
+    return out
+
+def naive(server: LocalSMTP, items: List[Tuple[str, List[str], str]]) -> float:
+    """Connect, send, quit per email, sequentially."""
+    s = server.settings()
+    t0 = time.perf_counter()
+    for sid, to, draft in items:
+        subject, body = split_draft(draft)
+        conn = smtplib.SMTP(s.host, s.port, timeout=s.timeout)
+        conn.ehlo()
+        conn.send_message(build_email(s.sender, Message(0, sid, to, subject, body, 0)))
+        conn.quit()
+    return time.perf_counter() - t0
+
+def pooled(server: LocalSMTP, items: List[Tuple[str, List[str], str]], db: Path, workers: int) -> dict:
+    mailer = Mailer(Outbox(db), server.settings(), workers=workers)
+    enqueue_us = []
+    t0 = time.perf_counter()
+    for sid, to, draft in items:
+        t = time.perf_counter()
+        mailer.send_draft(sid, to, draft)
+        enqueue_us.append((time.perf_counter() - t) * 1e6)
+    assert mailer.flush(timeout=600)
+    elapsed = time.perf_counter() - t0
+    mailer.stop()
+    mailer.outbox.close()
+    enqueue_us.sort()
+    return {"seconds": elapsed, "connects": mailer.stats["connects"],
+            "enqueue_p50_us": statistics.median(enqueue_us),
+            "enqueue_p99_us": enqueue_us[int(len(enqueue_us) * 0.99) - 1]}
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sessions", type=int, default=200)
+    ap.add_argument("--recipients", type=int, default=3, help="hiring-team addresses per session")
+    ap.add_argument("--latency-ms", type=float, default=5.0)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = ap.parse_args()
+
+    items = [(sid, [f"team{k}-{sid}@example.com" for k in range(args.recipients)], d)
+             for sid, d in drafts(args.sessions)]
+    n = len(items)
+    with LocalSMTP(latency=args.latency_ms / 1000) as server:
+        t = naive(server, items)
+        print(f"{n} emails, {args.latency_ms:g} ms server latency")
+        print(f"  naive connect-per-email  {t:7.2f} s  {n / t:8.1f} msg/s  connects={server.connections}")
+        assert len(server.messages) == n
+        for w in args.workers:
+            server.messages.clear()
+            with tempfile.TemporaryDirectory() as tmp:
+                r = pooled(server, items, Path(tmp) / "outbox.db", w)
+            assert len(server.messages) == n
+            print(f"  pooled outbox, {w} worker{'s' if w > 1 else ' '} {r['seconds']:7.2f} s  "
+                  f"{n / r['seconds']:8.1f} msg/s  connects={r['connects']}  "
+                  f"send_draft p50={r['enqueue_p50_us']:.0f} µs p99={r['enqueue_p99_us']:.0f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# benchmarks/bench_role_match.py — nearest-role lookup on a large synthetic catalogue
+#
+#   python -m benchmarks.bench_role_match [--names 30000] [--queries 2000] [--dense-dims 256]
+#
+# Builds a catalogue of seniority x domain x function titles with abbreviated aliases
+# ("Sr Data Platform Eng"; at most ~29.5k names), then queries it with inflected,
+# hyphenated, misspelt and padded variants ("need two senior data-platform engineers asap").
+# Reports build and cold-load time of tools.role_matcher.RoleIndex, per-query latency of
+# top(q, 1) and of best(q) (default min_score, as intake and the catalogue call it), and
+# top-1 accuracy against the exact normalised lookup (RoleCatalog.resolve's approach),
+# which finds none of the variants. As a reference it also scores a dense layout: the same
+# features hashed into --dense-dims columns of a memory-mapped float32 matrix, brute-force cosine.
+import argparse
+import random
+import statistics
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from tools.role_catalog import normalize_title
+from tools.role_matcher import RoleIndex, features
+
+SENIORITY = ["", "Junior", "Senior", "Staff", "Principal", "Lead", "Head of", "Associate", "Founding",
+             "Chief", "Distinguished", "Intern"]
+DOMAIN = ["Data", "Platform", "Backend", "Frontend", "Mobile", "Security", "Cloud", "Machine Learning", "GenAI",
+          "Payments", "Growth", "Analytics", "Infrastructure", "Site Reliability", "Developer Experience",
+          "Search", "Recommendations", "Embedded", "Firmware", "Robotics", "Compliance", "Identity",
+          "Observability", "Networking", "Storage", "Database", "Billing", "Quality", "Release",
+          "Integrations", "Localization", "Accessibility", "Design Systems", "Computer Vision", "NLP",
+          "Speech", "Ads", "Fraud", "Supply Chain", "Game"]
+FUNCTION = ["Engineer", "Developer", "Architect", "Manager", "Analyst", "Scientist", "Designer",
+            "Researcher", "Specialist", "Consultant", "Administrator", "Program Manager", "Product Manager",
+            "Technician", "Strategist", "Operations Lead", "Advocate", "Writer", "Recruiter", "Director",
+            "Coordinator", "Tester", "Auditor", "Evangelist", "Instructor"]
+SHORT = {"Senior": "Sr", "Junior": "Jr", "Engineer": "Eng", "Developer": "Dev", "Manager": "Mgr",
+         "Machine Learning": "ML", "Site Reliability": "SRE", "Infrastructure": "Infra", "Principal": "Prin"}
+FILLER = ["need", "a", "two", "we", "are", "hiring", "asap", "for", "our", "team", "looking", "an"]
+
+def catalogue(n_names: int, seed: int = 3):
+    """(name, label) pairs: every title plus one or two abbreviated aliases."""
+    titles = [" ".join(w for w in (s, d, f) if w) for s in SENIORITY for d in DOMAIN for f in FUNCTION]
+    random.Random(seed).shuffle(titles)
+    names = []
+    for title in titles:
+        names.append((title, title))
+        short = title
+        for long, abbr in SHORT.items():
+            short = short.replace(long, abbr)
+        if short != title:
+            names.append((short, title))
+        names.append((title.replace(" ", "-", 1), title))
+        if len(names) >= n_names:
+            break
+    return names[:n_names]
+
+def variant(name: str, rng: random.Random) -> str:
+    """A request that names `name` the way people type it, never in its exact form."""
+    words = name.split()
+    i = rng.randrange(len(words))
+    kind = rng.randrange(4)
+    if kind == 0:
+        words[-1] += "s"  # plural
+    elif kind == 1 and len(words) > 1:
+        words[i:i + 2] = ["-".join(words[i:i + 2]).lower()]
+    elif kind == 2 and len(words[i]) > 4:
+        j = rng.randrange(1, len(words[i]) - 1)
+        words[i] = words[i][:j] + words[i][j + 1:]  # dropped letter
+    else:
+        words[-1] += "s"
+        words.insert(0, rng.choice(["sr.", "the", "an"]))
+    pad = rng.sample(FILLER, 3)
+    return " ".join(pad[:2] + words + pad[2:])
+
+def dense_layout(names, dims: int, path: Path):
+    """Hashed features in a dims-wide row-normalised float32 memmap (n x dims)."""
+    mat = np.lib.format.open_memmap(str(path), mode="w+", dtype=np.float32, shape=(len(names), dims))
+    for row, (name, _) in enumerate(names):
+        for feat, tf in features(name).items():
+            mat[row, zlib.crc32(feat.encode()) % dims] += tf
+    mat /= np.maximum(np.linalg.norm(mat, axis=1, keepdims=True), 1e-9)
+    mat.flush()
+    return np.load(str(path), mmap_mode="r")
+
+def dense_top(mat, labels, text: str, dims: int) -> str:
+    q = np.zeros(dims, dtype=np.float32)
+    for feat, tf in features(text).items():
+        q[zlib.crc32(feat.encode()) % dims] += tf
+    return labels[int(np.argmax(mat @ q))]
+
+def timed_queries(fn, queries):
+    out, lat = [], []
+    for q in queries:
+        t = time.perf_counter()
+        out.append(fn(q))
+        lat.append((time.perf_counter() - t) * 1e6)
+    lat.sort()
+    return out, statistics.median(lat), lat[int(len(lat) * 0.99) - 1]
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--names", type=int, default=30000)
+    ap.add_argument("--queries", type=int, default=2000)
+    ap.add_argument("--dense-dims", type=int, default=256, help="0 skips the dense reference")
+    args = ap.parse_args()
+
+    names = catalogue(args.names)
+    labels = [label for _, label in names]
+    rng = random.Random(5)
+    picks = [rng.choice(names) for _ in range(args.queries)]
+    queries = [variant(name, rng) for name, _ in picks]
+    truth = [label for _, label in picks]
+    print(f"{len(names)} names ({len(set(labels))} roles), {len(queries)} queries, e.g. {queries[0]!r}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        idx = RoleIndex(names, Path(tmp))
+        idx.top("warm up")
+        build_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        cold = RoleIndex(names, Path(tmp))
+        cold.top("warm up")
+        load_ms = (time.perf_counter() - t0) * 1000
+        assert cold.stats["loads"] == 1
+        exact = {normalize_title(n): label for n, label in names}
+        _, ex_p50, _ = timed_queries(lambda q: exact.get(normalize_title(q)), queries)
+        ex_hits = sum(exact.get(normalize_title(q)) == t for q, t in zip(queries, truth))
+        got, p50, p99 = timed_queries(lambda q: (idx.top(q, 1) or [(None, 0)])[0][0], queries)
+        hits = sum(g == t for g, t in zip(got, truth))
+        print(f"  role_matcher   build {build_s:6.2f} s  cold load {load_ms:6.1f} ms  "
+              f"query p50 {p50:7.0f} µs  p99 {p99:7.0f} µs  top-1 {hits / len(queries):6.1%}")
+        got, p50, p99 = timed_queries(idx.best, queries)  # what intake and the catalogue call
+        hits = sum(g == t for g, t in zip(got, truth))
+        print(f"    .best()                                         "
+              f"query p50 {p50:7.0f} µs  p99 {p99:7.0f} µs  top-1 {hits / len(queries):6.1%}")
+        print(f"  exact lookup   query p50 {ex_p50:7.1f} µs                                      "
+              f"top-1 {ex_hits / len(queries):6.1%}")
+        if args.dense_dims:
+            t0 = time.perf_counter()
+            mat = dense_layout(names, args.dense_dims, Path(tmp) / "dense.npy")
+            build_s = time.perf_counter() - t0
+            got, p50, p99 = timed_queries(lambda q: dense_top(mat, labels, q, args.dense_dims), queries)
+            hits = sum(g == t for g, t in zip(got, truth))
+            print(f"  dense {args.dense_dims:4d}-d   build {build_s:6.2f} s                     "
+                  f"query p50 {p50:7.0f} µs  p99 {p99:7.0f} µs  top-1 {hits / len(queries):6.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_rules.py — compiled rule set vs per-call rule evaluation, on large rule sets
+#
+#   python -m benchmarks.bench_rules [--roles 2000] [--skills 5000] [--prompts 200]
+#
+# The shipped data/rules.yml is grown with synthetic roles (3 aliases each) and skills.
+# "per-call" is how the old tools/rules.py worked: every role pattern re.search'ed in
+# turn, every keyword tested with `in`, questions picked by if-chains, all per request.
+# "compiled" is RuleSet.scan() + ask(). Throughput is reported in requests/s and in
+# rules/s (rules in the set x requests per second). Also times compiling the YAML
+# against loading the pickled rule set a later process would reuse.
+import argparse
+import pickle
+import random
+import re
+import time
+from pathlib import Path
+
+import yaml
+
+from state import Slots
+from tools.rules import RULES_PATH, compile_rules
+
+WORDS = ["platform", "backend", "frontend", "data", "cloud", "security", "mobile", "staff", "principal",
+         "growth", "product", "analytics", "infra", "quant", "research", "payments", "search", "ads"]
+
+def grown_config(roles: int, skills: int, seed: int = 5) -> dict:
+    rng = random.Random(seed)
+    config = yaml.safe_load(RULES_PATH.read_text(encoding="utf-8"))
+    for i in range(roles):
+        name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} engineer {i}"
+        config["roles"][name] = [name, f"{name} lead", f"{rng.choice(WORDS)} eng {i}"]
+    config["skills"] += [f"{rng.choice(WORDS)}skill{i}" for i in range(skills)]
+    return config
+
+def rule_count(config: dict) -> int:
+    return (sum(len(a) for a in config["roles"].values()) + len(config["locations"]) + len(config["hiring_types"])
+            + len(config["skills"]) + len(config["patterns"]) + len(config["questions"]))
+
+def per_call(config: dict, text: str, slots: Slots):
+    t = text.lower()
+    roles = [c for c, aliases in config["roles"].items()
+             if re.search("|".join(re.escape(a) for a in aliases), t)]
+    budget = re.search(config["patterns"]["budget"], t)
+    timeline = re.search(config["patterns"]["timeline"], t)
+    location = next((v for k, v in config["locations"].items() if k in t), None)
+    htype = next((v for k, v in config["hiring_types"].items() if k in t), None)
+    skills = sorted({s for s in config["skills"] if s in t})
+    qs = [q["ask"] for q in config["questions"] if not getattr(slots, q["slot"])]
+    return roles, budget, timeline, location, htype, skills, qs
+
+def prompts(config: dict, n: int, seed: int = 9):
+    rng = random.Random(seed)
+    names = list(config["roles"])
+    filler = "we are a seed stage startup hiring remote for our team with a budget of $150k in 6 weeks".split()
+    return [" ".join(rng.choices(filler, k=30) + [rng.choice(names), rng.choice(config["skills"])])
+            for _ in range(n)]
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--roles", type=int, default=2000)
+    ap.add_argument("--skills", type=int, default=5000)
+    ap.add_argument("--prompts", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    for label, (n_roles, n_skills) in (("shipped", (0, 0)), ("large", (args.roles, args.skills))):
+        config = grown_config(n_roles, n_skills)
+        raw = yaml.safe_dump(config, allow_unicode=True, sort_keys=False).encode("utf-8")
+        t0 = time.perf_counter()
+        rules = compile_rules(raw)
+        compile_ms = (time.perf_counter() - t0) * 1000
+        blob = pickle.dumps(rules, protocol=pickle.HIGHEST_PROTOCOL)
+        t0 = time.perf_counter()
+        pickle.loads(blob)
+        load_ms = (time.perf_counter() - t0) * 1000
+
+        texts, slots, n = prompts(config, args.prompts), Slots(budget="$150k"), rule_count(config)
+        sample = texts[:max(10, len(texts) * 200 // max(n, 200))]  # per-call gets slow on big sets
+        t0 = time.perf_counter()
+        olds = [per_call(config, text, slots) for text in sample]
+        old_s = (time.perf_counter() - t0) / len(sample)
+        for text, old in zip(sample, olds):  # same answers both ways
+            new = rules.scan(text)
+            assert tuple(old[0]) == new.roles and tuple(old[5]) == new.skills and old[6] == rules.ask(slots)
+        t0 = time.perf_counter()
+        for text in texts:
+            rules.scan(text)
+            rules.ask(slots)
+        new_s = (time.perf_counter() - t0) / len(texts)
+        print(f"{label:<8} {n:6d} rules  compile {compile_ms:7.1f} ms  load compiled {load_ms:6.1f} ms")
+        print(f"         per-call {1 / old_s:9.0f} req/s {n / old_s / 1e6:8.2f} M rules/s   "
+              f"compiled {1 / new_s:9.0f} req/s {n / new_s / 1e6:8.2f} M rules/s   x{old_s / new_s:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_search.py — local postings index: build, query latency, incremental updates
+#
+#   python -m benchmarks.bench_search [--postings 50000] [--per-file 500] [--queries 200]
+#
+# Generates a synthetic corpus of JSON postings in a temp dir, builds the index cold,
+# then times queries and a one-file incremental update against a full rebuild.
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from tools.search_tool import PostingIndex
+from tools.skill_vocab import CANONICAL_SKILLS
+
+TITLES = ["Backend Engineer", "ML Engineer", "Frontend Engineer", "SRE", "Data Engineer", "Founding Engineer",
+          "GenAI Intern", "Platform Engineer", "Staff Engineer", "DevOps Engineer"]
+WORDS = ("build ship scale own design operate services pipelines models platform product api latency "
+         "reliability startup team customers data infra cloud mentor review on-call growth").split()
+
+def write_corpus(root: Path, postings: int, per_file: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    skills = list(CANONICAL_SKILLS) + [f"tool{i}" for i in range(300)]
+    for f in range(0, postings, per_file):
+        batch = []
+        for _ in range(min(per_file, postings - f)):
+            lo = rng.randrange(60, 220) * 1000
+            batch.append({"title": rng.choice(TITLES),
+                          "description": " ".join(rng.choices(WORDS + skills, k=rng.randrange(60, 240))),
+                          "skills": rng.sample(skills, 5), "salary_min": lo, "salary_max": lo + 40000})
+        (root / f"batch{f // per_file:05d}.json").write_text(json.dumps(batch))
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--postings", type=int, default=50000)
+    ap.add_argument("--per-file", type=int, default=500)
+    ap.add_argument("--queries", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus, index_dir = Path(tmp) / "postings", Path(tmp) / "index"
+        corpus.mkdir()
+        write_corpus(corpus, args.postings, args.per_file)
+        index = PostingIndex(corpus, index_dir, check_interval=3600)
+
+        t0 = time.perf_counter()
+        index.update()
+        build = time.perf_counter() - t0
+        size = sum(p.stat().st_size for p in index_dir.iterdir())
+        print(f"build        {build:8.2f} s     {args.postings} postings, {size / 2**20:.1f} MiB on disk")
+
+        t0 = time.perf_counter()
+        PostingIndex(corpus, index_dir, check_interval=3600).update()
+        print(f"open         {(time.perf_counter() - t0) * 1000:8.1f} ms    (existing index, no changes)")
+
+        rng = random.Random(3)
+        queries = [f"{rng.choice(TITLES)} {' '.join(rng.sample(list(CANONICAL_SKILLS), 2))} remote"
+                   for _ in range(args.queries)]
+        for label, fn in (("search k=10", lambda q: index.search(q, 10)),
+                          ("suggest", lambda q: index.suggest(q, ["Python"]))):
+            times = []
+            for q in queries:
+                t0 = time.perf_counter()
+                fn(q)
+                times.append((time.perf_counter() - t0) * 1000)
+            times.sort()
+            print(f"{label:<12} {statistics.median(times):8.2f} ms p50 {times[int(len(times) * .95)]:8.2f} ms p95")
+
+        target = next(corpus.iterdir())
+        target.write_text(target.read_text().replace("Engineer", "Engineer II"))
+        t0 = time.perf_counter()
+        changed = index.update()
+        inc = time.perf_counter() - t0
+        print(f"incremental  {inc * 1000:8.1f} ms    1 file of {args.per_file} postings changed -> {changed}")
+        print(f"             {build / inc:8.1f}x faster than the full build")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_session_state.py — memory held per UI session: AgentState vs packed SessionStates
+#
+#   python -m benchmarks.bench_session_state [--sessions 2000] [--cap-mb 8]
+#
+# Each session is a multi-role graph run re-keyed under its own id, copied so no
+# strings are shared between sessions (as with real, independently produced states).
+# "objects" keeps the AgentState per session as the app used to; "packed" holds the
+# same sessions in SessionStates, without a cap and with --cap-mb.
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from graph import build_graph
+from session_state import SessionStates
+from state import AgentState
+
+PROMPTS = ["need a founding engineer, a genai intern and an ml engineer, remote, $150k, 6 weeks",
+           "need a devops engineer and a backend engineer, hybrid", "need a staff engineer, full-time"]
+
+def sessions(n: int):
+    app = build_graph(tracer=None)
+    seeds = [AgentState.model_construct(**app.invoke(AgentState(session_id="seed", user_query=p))) for p in PROMPTS]
+    docs = [s.model_dump() for s in seeds]
+    for i in range(n):
+        doc = dict(docs[i % len(docs)], session_id=f"sess-{i:06d}")
+        yield AgentState.model_validate_json(AgentState.model_validate(doc).model_dump_json())
+
+def held(fn) -> int:
+    tracemalloc.start()
+    kept = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=2000)
+    ap.add_argument("--cap-mb", type=float, default=2)
+    args = ap.parse_args(argv)
+    states = list(sessions(args.sessions))
+
+    def objects():
+        return [AgentState.model_validate_json(s.model_dump_json()) for s in states]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def packed(cap):
+            store = SessionStates(max_bytes=cap, spill_dir=tmp)
+            for s in states:
+                store.put(s)
+            return store
+
+        n = args.sessions
+        print(f"objects      {held(objects) / 2**20:8.1f} MiB held for {n} sessions")
+        print(f"packed       {held(lambda: packed(1 << 40)) / 2**20:8.1f} MiB held (no cap)")
+        capped = packed(int(args.cap_mb * 2**20))
+        print(f"packed+cap   {held(lambda: packed(int(args.cap_mb * 2**20))) / 2**20:8.1f} MiB held   {capped.stats()}")
+
+        t0 = time.perf_counter()
+        for s in states:
+            capped.put(s)
+        put_us = (time.perf_counter() - t0) / n * 1e6
+        t0 = time.perf_counter()
+        for s in states[-200:]:
+            capped.get(s.session_id)
+        hot_us = (time.perf_counter() - t0) / 200 * 1e6
+        t0 = time.perf_counter()
+        for s in states[:200]:
+            capped.get(s.session_id)
+        cold_us = (time.perf_counter() - t0) / 200 * 1e6
+        print(f"put {put_us:6.0f} us   get resident {hot_us:6.0f} us   get spilled {cold_us:6.0f} us")
+
+if __name__ == "__main__":
+    main()
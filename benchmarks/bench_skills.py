@@ -0,0 +1,70 @@
+# benchmarks/bench_skills.py — interned skill sets vs free-form string lists
+#
+#   python -m benchmarks.bench_skills [--sessions 5000] [--skills 12]
+#
+# Simulates a batch of sessions whose skills arrive as fresh strings (parsed JSON, form
+# input). "strings" is the previous handling: sorted(set(...)) merges and a linear
+# `not in` dedup against the role's must-haves. "vocab" goes through tools.skill_vocab:
+# canonical merges keyed by vocabulary id or folded spelling, one shared display string
+# per vocabulary skill; free-text skills stay per-request strings and are never interned.
+import argparse
+import json
+import random
+import timeit
+import tracemalloc
+from typing import List
+
+from tools.skill_vocab import CANONICAL_SKILLS, VOCAB
+
+MUST_HAVE = ["5+ years building production systems", "Strong backend or full-stack skills",
+             "Startup bias for action", "Python and basic ML/AI understanding"]
+
+def corpus(sessions: int, per_session: int, seed: int = 5) -> List[List[str]]:
+    rng = random.Random(seed)
+    pool = [a for aliases in CANONICAL_SKILLS.values() for a in aliases] + [f"tool{i}" for i in range(200)]
+    # json round trip: every session gets its own string objects, as from a request body
+    return json.loads(json.dumps([[rng.choice(pool) for _ in range(per_session)] for _ in range(sessions)]))
+
+def strings_merge(a: List[str], b: List[str]) -> List[str]:
+    merged = sorted(set(a + b))
+    quals = list(MUST_HAVE)
+    for s in merged:
+        if s not in quals:
+            quals.append(s)
+    return merged
+
+MUST_KEYS = frozenset(VOCAB.key(m) for m in MUST_HAVE)
+
+def vocab_merge(a: List[str], b: List[str]) -> List[str]:
+    merged = VOCAB.canonical(a, b)
+    [s for s in merged if VOCAB.key(s) not in MUST_KEYS]
+    return merged
+
+def retained(fn, sessions: int, per_session: int) -> int:
+    """Bytes still held once the request strings are gone and only the merged lists remain."""
+    tracemalloc.start()
+    pairs = [(s[:per_session // 2], s[per_session // 2:]) for s in corpus(sessions, per_session)]
+    kept = [fn(a, b) for a, b in pairs]
+    del pairs
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=5000)
+    ap.add_argument("--skills", type=int, default=12, help="skills per session (half from the prompt, half typed)")
+    args = ap.parse_args(argv)
+
+    half = args.skills // 2
+    pairs = [(s[:half], s[half:]) for s in corpus(args.sessions, args.skills)]
+    for label, fn in (("strings", strings_merge), ("vocab", vocab_merge)):
+        t = min(timeit.repeat(lambda: [fn(a, b) for a, b in pairs], number=1, repeat=5))
+        for a, b in pairs:
+            fn(a, b)
+        print(f"{label:<8} {t / len(pairs) * 1e6:7.2f} us/merge   "
+              f"{retained(fn, args.sessions, args.skills) / 1024:9.1f} KiB retained for {len(pairs)} sessions")
+
+if __name__ == "__main__":
+    main()
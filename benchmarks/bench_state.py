@@ -0,0 +1,74 @@
+# benchmarks/bench_state.py — state copies per graph run and per Streamlit rerun
+#
+#   python -m benchmarks.bench_state [--roles 4] [--reruns 50]
+#
+# "before" is the previous path: model_dump() into the graph, model_validate() out, and
+# model_dump() + json.dumps(indent=2) of the whole session on every rerun of the Export
+# tab. "after" hands the model to the graph, rebuilds the result with model_construct()
+# and serializes the export only when requested, once per state version.
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from export import ExportCache
+from graph import build_graph
+from state import AgentState
+
+ROLE_PROMPTS = ["founding engineer", "genai intern", "ml engineer", "devops"]
+
+def measure(fn: Callable[[], object], n: int) -> Tuple[float, int]:
+    """(ms per call, peak bytes allocated during one call)."""
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    ms = (time.perf_counter() - t0) * 1000 / n
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return ms, peak
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--roles", type=int, default=4, choices=range(1, len(ROLE_PROMPTS) + 1))
+    ap.add_argument("--reruns", type=int, default=50, help="Streamlit reruns to simulate per state")
+    ap.add_argument("--number", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    app = build_graph(tracer=None)
+    query = "need a " + " and a ".join(ROLE_PROMPTS[:args.roles]) + ", remote, $150k, 6 weeks"
+    fresh = lambda: AgentState(session_id="bench", user_query=query)
+    final = AgentState.model_construct(**app.invoke(fresh()))
+    print(f"{args.roles} roles, state JSON {len(final.model_dump_json()):,} bytes")
+
+    def run_before():
+        return AgentState.model_validate(app.invoke(fresh().model_dump()))
+
+    def run_after():
+        return AgentState.model_construct(**app.invoke(fresh()))
+
+    size = len(json.dumps(final.model_dump(), indent=2))
+
+    def reruns_before():
+        for _ in range(args.reruns):
+            json.dumps(final.model_dump(), indent=2)
+
+    exports = ExportCache()
+    def reruns_after():
+        # nothing is serialized on a rerun; the user downloads twice, the second is a cache hit
+        exports._items.clear()
+        for _ in range(2):
+            exports.session_json(final, 1)
+
+    for label, before, after, n in (("graph run", run_before, run_after, args.number),
+                                    (f"{args.reruns} reruns", reruns_before, reruns_after, max(args.number // 10, 1))):
+        (b_ms, b_bytes), (a_ms, a_bytes) = measure(before, n), measure(after, n)
+        print(f"{label:<12} before {b_ms:8.3f} ms {b_bytes / 1024:8.1f} KiB peak   "
+              f"after {a_ms:8.3f} ms {a_bytes / 1024:8.1f} KiB peak   x{b_ms / a_ms:5.1f}")
+    print(f"export JSON produced over {args.reruns} reruns: before {args.reruns * size / 1024:,.1f} KiB, "
+          f"after {len(exports.session_json(final, 1)) / 1024:,.1f} KiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/loadtest_api.py — closed-loop load test for api.py
+#
+#   uvicorn api:app --workers 4 --port 8000 &
+#   python -m benchmarks.loadtest_api --url http://127.0.0.1:8000 --concurrency 32 --requests 2000
+#
+# Each client thread keeps one HTTP/1.1 connection open and issues requests back to back
+# (POST /generate by default, reading the NDJSON stream to the end). Reports throughput
+# and latency percentiles over all successful requests.
+import argparse
+import http.client
+import json
+import threading
+import time
+from typing import List
+from urllib.parse import urlparse
+
+PROMPTS = [
+    "need a founding engineer and a genai intern, remote, $150k, 8 weeks",
+    "hiring an ml engineer, hybrid, full-time, 12 lpa, next 2 months, python aws",
+    "devops/sre contract for 3 months, onsite, $80/hr, kubernetes terraform",
+]
+
+def percentile(sorted_vals: List[float], p: float) -> float:
+    if not sorted_vals:
+        return float("nan")
+    k = min(len(sorted_vals) - 1, max(0, round(p / 100 * (len(sorted_vals) - 1))))
+    return sorted_vals[k]
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--path", default="/generate", choices=["/generate", "/intake"])
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--requests", type=int, default=500, help="total requests across all clients")
+    args = ap.parse_args(argv)
+
+    target = urlparse(args.url)
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(args.requests))
+
+    def client() -> None:
+        conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=60)
+        for i in counter:
+            body = json.dumps({"user_query": PROMPTS[i % len(PROMPTS)]})  # a new session each time
+            t0 = time.perf_counter()
+            try:
+                conn.request("POST", args.path, body=body, headers={"Content-Type": "application/json"})
+                resp = conn.getresponse()
+                data = resp.read()
+                ok = resp.status == 200 and b'"error"' not in data[-200:]
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=60)
+                ok = False
+            elapsed = time.perf_counter() - t0
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+        conn.close()
+
+    threads = [threading.Thread(target=client) for _ in range(args.concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    lat = sorted(latencies)
+    print(f"{args.path}: {len(lat)} ok, {errors[0]} errors, {args.concurrency} concurrent clients, {wall:.2f}s")
+    print(f"throughput  {len(lat) / wall:8.1f} req/s")
+    for p in (50, 95, 99):
+        print(f"p{p:<3}        {percentile(lat, p) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
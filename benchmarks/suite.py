@@ -0,0 +1,212 @@
+# benchmarks/suite.py — throughput of every node, tool and the end-to-end graph
+#
+#   python -m benchmarks.suite                 # run and compare with benchmarks/baselines.json
+#   python -m benchmarks.suite --save          # record new baselines on this machine
+#   python -m benchmarks.suite -k jd --quick   # subset, shorter timing runs
+#
+# Each case runs over a synthetic corpus (short prompts, long multi-role prompts, large
+# skill lists) and reports calls/second. A case whose throughput drops more than
+# --threshold (default 25%) below its baseline is re-measured, and only counts as a
+# regression (exit code 1) if it is still slow, so a single noisy run does not fail.
+# Cached functions are timed through __wrapped__ and the graph through a private, cleared
+# artifact cache, so the numbers measure the work rather than cache lookups; the graph is
+# built with the default tracer, so per-node tracing is part of what is measured.
+import argparse
+import contextlib
+import json
+import platform
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import tools.artifact_cache as artifact_cache
+from graph import build_graph
+from nodes.intake import _nearest_role, _scan, detect_roles, extract_slots, scan
+from nodes.jd_generator import _compose_jd
+from nodes.presenter import presenter_node
+from state import AgentState, Artifacts, RoleSpec, Slots
+from tools.checklist_tool import build_checklist
+from tools.email_tool import kickoff_email
+from tools.rules import RULES
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+DEFAULT_THRESHOLD = 0.25
+SKILL_KEYWORDS = RULES.current().skills
+
+ROLE_PHRASES = ["founding engineer", "genai intern", "ml engineer", "devops", "data engineer",
+                "frontend engineer", "backend engineer", "product manager"]
+FILLER = ["we", "are", "a", "seed", "stage", "startup", "building", "tools", "for", "clinics",
+          "the", "team", "ships", "weekly", "and", "cares", "about", "quality", "with", "customers"]
+
+# ---------------- synthetic corpora ----------------
+def short_prompts(n: int = 64, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    return [f"need a {rng.choice(ROLE_PHRASES)}, {rng.choice(['remote', 'hybrid', 'austin'])}, "
+            f"${rng.randint(80, 220)}k, {rng.randint(2, 12)} weeks" for _ in range(n)]
+
+def long_prompts(n: int = 16, words: int = 600, roles: int = 4, seed: int = 2) -> List[str]:
+    rng = random.Random(seed)
+    vocab = FILLER + list(SKILL_KEYWORDS)
+    out = []
+    for _ in range(n):
+        body = [rng.choice(vocab) for _ in range(words)]
+        for phrase in rng.sample(ROLE_PHRASES, roles):
+            body.insert(rng.randrange(len(body)), f"hiring a {phrase}")
+        out.append(" ".join(body) + f" budget ${rng.randint(80, 220)}k within {rng.randint(2, 12)} weeks")
+    return out
+
+def skill_list(n: int, seed: int = 3) -> List[str]:
+    rng = random.Random(seed)
+    base = list(SKILL_KEYWORDS)
+    return [rng.choice(base) if i < len(base) else f"skill {i} ({rng.choice(FILLER)})" for i in range(n)]
+
+def role_dicts(n: int) -> List[Dict]:
+    return [RoleSpec(title=t).model_dump() for t in (ROLE_PHRASES * n)[:n]]
+
+def presented_state(n_roles: int) -> AgentState:
+    roles = [RoleSpec(title=t) for t in (ROLE_PHRASES * n_roles)[:n_roles]]
+    jds = {r.title: _compose_jd.__wrapped__(r, skill_list(20), "Acme", "Remote", "6 weeks", "$150k", None)
+           for r in roles}
+    plan = build_checklist.__wrapped__([r.model_dump() for r in roles], None)
+    return AgentState(session_id="bench", user_query="bench", slots=Slots(roles=roles),
+                      artifacts=Artifacts(jds=jds, plan_json=plan, plan_markdown="## Plan\n" + "\n".join(
+                          f"- {p['stage']}" for p in plan), email_draft=kickoff_email.__wrapped__(
+                          [r.model_dump() for r in roles], "$150k", "6 weeks"), summary_md="## Summary"))
+
+def _cycle(items: List) -> Callable[[], object]:
+    it = iter(())
+    def nxt():
+        nonlocal it
+        try:
+            return next(it)
+        except StopIteration:
+            it = iter(items)
+            return next(it)
+    return nxt
+
+@contextlib.contextmanager
+def isolated_artifact_cache() -> Iterator[artifact_cache.ArtifactCache]:
+    """Swap in a memory-only artifact cache so benchmarks never touch (or clear) the real one."""
+    saved = artifact_cache.ARTIFACT_CACHE
+    artifact_cache.ARTIFACT_CACHE = artifact_cache.ArtifactCache()
+    try:
+        yield artifact_cache.ARTIFACT_CACHE
+    finally:
+        artifact_cache.ARTIFACT_CACHE = saved
+
+# ---------------- cases ----------------
+def cases() -> List[Tuple[str, Callable[[], object]]]:
+    out: List[Tuple[str, Callable[[], object]]] = []
+    for label, corpus in (("short", short_prompts()), ("long", long_prompts())):
+        nxt = _cycle(corpus)
+        def roles(nxt=nxt):
+            _scan.cache_clear()
+            _nearest_role.cache_clear()
+            return detect_roles(nxt())
+        def slots(nxt=nxt):
+            _scan.cache_clear()
+            return extract_slots(nxt(), AgentState(session_id="bench", user_query=""))
+        out += [(f"intake.detect_roles[{label}]", roles), (f"intake.extract_slots[{label}]", slots)]
+
+    render = _compose_jd.__wrapped__
+    for n in (0, 40, 400):
+        skills = skill_list(n)
+        role = RoleSpec(title="Founding Engineer")
+        out.append((f"jd._compose_jd[{n} skills]",
+                    lambda skills=skills, role=role: render(role, skills, "Acme", "Remote", "6 weeks", "$150k", "contract")))
+
+    rs = role_dicts(48)
+    out.append(("checklist.build_checklist[48 roles]", lambda rs=rs: build_checklist.__wrapped__(rs, None)))
+    for n in (1, 8):
+        rs = role_dicts(n)
+        out.append((f"checklist.build_checklist[{n} roles]", lambda rs=rs: build_checklist.__wrapped__(rs, None)))
+        out.append((f"email.kickoff_email[{n} roles]", lambda rs=rs: kickoff_email.__wrapped__(rs, "$150k", "6 weeks")))
+        state = presented_state(n)
+        def present(state=state, base=state.artifacts.summary_md):
+            state.artifacts.summary_md = base  # presenter appends to the summary in place
+            return presenter_node(state)
+        out.append((f"presenter_node[{n} roles]", present))
+
+    app = build_graph()  # with the default tracer, as shipped
+    for label, corpus in (("short", short_prompts()), ("long", long_prompts(n=4, roles=3))):
+        nxt = _cycle(corpus)
+        def invoke(nxt=nxt):
+            artifact_cache.ARTIFACT_CACHE.clear()
+            return app.invoke(AgentState(session_id="bench", user_query=nxt()))
+        out.append((f"graph.invoke[{label}]", invoke))
+    return out
+
+# ---------------- runner ----------------
+def measure(fn: Callable[[], object], min_time: float = 0.2, repeat: int = 5) -> float:
+    """Best-of-`repeat` calls/second, each repeat lasting at least `min_time` seconds."""
+    timer = timeit.Timer(fn)
+    number, elapsed = 1, 0.0
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+    best = min([elapsed] + timer.repeat(repeat=repeat - 1, number=number))
+    return number / best
+
+def run(select: Optional[str] = None, min_time: float = 0.2, repeat: int = 5,
+        baselines: Optional[Dict[str, float]] = None, threshold: float = DEFAULT_THRESHOLD) -> Dict[str, float]:
+    """Calls/second per case; cases that look regressed against `baselines` get a second try."""
+    results: Dict[str, float] = {}
+    _scan.cache_clear()
+    with isolated_artifact_cache():
+        for name, fn in cases():
+            if select and select not in name:
+                continue
+            ops = measure(fn, min_time=min_time, repeat=repeat)
+            if compare({name: ops}, baselines or {}, threshold):
+                ops = max(ops, measure(fn, min_time=min_time * 2, repeat=repeat))
+            results[name] = ops
+    _scan.cache_clear()
+    return results
+
+def compare(results: Dict[str, float], baselines: Dict[str, float],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Names of cases whose throughput fell more than `threshold` below baseline."""
+    return [name for name, ops in results.items()
+            if name in baselines and ops < baselines[name] * (1 - threshold)]
+
+def load_baselines(path: Path = BASELINES) -> Dict[str, float]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+def save_baselines(results: Dict[str, float], path: Path = BASELINES) -> None:
+    merged = {**load_baselines(path), **results}
+    doc = {"machine": {"python": platform.python_version(), "platform": platform.platform(),
+                       "processor": platform.machine()},
+           "results": {k: round(v, 1) for k, v in sorted(merged.items())}}
+    path.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-k", dest="select", help="only run cases whose name contains this")
+    ap.add_argument("--save", action="store_true", help="write results as the new baselines")
+    ap.add_argument("--quick", action="store_true", help="shorter timing runs (noisier)")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    ap.add_argument("--baselines", type=Path, default=BASELINES)
+    args = ap.parse_args(argv)
+
+    baselines = {} if args.save else load_baselines(args.baselines)
+    results = run(args.select, min_time=0.05 if args.quick else 0.2, repeat=3 if args.quick else 5,
+                  baselines=baselines, threshold=args.threshold)
+    slow = set(compare(results, baselines, args.threshold))
+    for name, ops in results.items():
+        base = baselines.get(name)
+        delta = f"{ops / base - 1:+7.1%}" if base else "    new"
+        print(f"{name:<40} {ops:12,.1f} /s  {delta}{'  REGRESSION' if name in slow else ''}")
+    if args.save:
+        save_baselines(results, args.baselines)
+        print(f"baselines written to {args.baselines}")
+        return 0
+    return 1 if slow else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+# export.py — serialized session exports, built on demand and cached per state version
+#
+# The Streamlit script reruns on every widget interaction, so the Export tab must not
+# re-serialize the whole session each time. session_json() is only called when a
+# download is actually requested and remembers the bytes for (session_id, version),
+# where version is the sequence number SessionStore.save() returned for that state.
+# orjson is used when installed; otherwise pydantic's own JSON serializer.
+#
+# Bulk exports (export_sessions) stream every stored session into three tables —
+# sessions, plans (one row per checklist stage) and jds — as newline-delimited compact
+# JSON, or Parquet when pyarrow is installed (imported on first Parquet use, never at
+# module import). Rows are flushed every `batch_rows`, so
+# memory stays flat however many sessions there are, and each file is written under a
+# per-writer temp name and renamed into place only once complete. eta_by_owner()
+# aggregates the plans table in one pass. BULK_EXPORT runs one bulk export at a time on
+# a background thread, for callers (the Streamlit button) that must not wait for it.
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from state import AgentState
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+EXPORT_DIR = Path(__file__).resolve().parent / "storage" / "exports"
+FORMATS = ("ndjson", "parquet")
+
+def dumps_state(state: AgentState) -> bytes:
+    """Pretty-printed JSON of the full state."""
+    if orjson is not None:
+        return orjson.dumps(state.model_dump(), option=orjson.OPT_INDENT_2)
+    return state.model_dump_json(indent=2).encode("utf-8")
+
+class ExportCache:
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[Tuple[str, int], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def session_json(self, state: AgentState, version: int) -> bytes:
+        key = (state.session_id, version)
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                self.stats["hits"] += 1
+                return data
+            self.stats["misses"] += 1
+        data = dumps_state(state)
+        with self._lock:
+            self._items[key] = data
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return data
+
+EXPORTS = ExportCache()
+
+# ---------------- bulk export ----------------
+# column -> pyarrow type name; also fixes the key order of NDJSON rows
+TABLES: Dict[str, Dict[str, str]] = {
+    "sessions": {"session_id": "string", "updated_at": "float64", "user_query": "string",
+                 "roles": "list<string>", "budget": "string", "timeline": "string", "location": "string",
+                 "hiring_type": "string", "roles_created": "int64", "checklist_items": "int64",
+                 "duration_days": "int64"},
+    "plans": {"session_id": "string", "stage": "string", "owner": "string", "eta_days": "int64",
+              "start_day": "int64", "end_day": "int64", "critical": "bool", "roles": "list<string>"},
+    "jds": {"session_id": "string", "title": "string", "markdown": "string"},
+}
+
+def _tmp_path(path: Path) -> Path:
+    # unique per writer: two exports into one directory never share (or delete) a temp file
+    return path.with_name(f"{path.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp")
+
+def _dumps_line(row: Dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(row) + b"\n"
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def session_rows(doc: Dict, updated_at: float) -> Iterator[Tuple[str, Dict]]:
+    """(table, row) pairs for one stored state document."""
+    sid = doc.get("session_id")
+    slots, art = doc.get("slots") or {}, doc.get("artifacts") or {}
+    analytics = doc.get("analytics") or {}
+    plan = art.get("plan_json") or []
+    yield "sessions", {
+        "session_id": sid, "updated_at": updated_at, "user_query": doc.get("user_query"),
+        "roles": [r.get("title") for r in slots.get("roles") or []],
+        **{k: slots.get(k) for k in ("budget", "timeline", "location", "hiring_type")},
+        "roles_created": analytics.get("roles_created"), "checklist_items": analytics.get("checklist_items"),
+        # plans saved before scheduling have no end_day; fall back to the summed ETAs
+        "duration_days": (max((it.get("end_day") or 0 for it in plan), default=0)
+                          or sum(it.get("eta_days") or 0 for it in plan)),
+    }
+    for it in plan:
+        yield "plans", {"session_id": sid, **{k: it.get(k) for k in TABLES["plans"] if k != "session_id"}}
+    for title, md in (art.get("jds") or {}).items():
+        yield "jds", {"session_id": sid, "title": title, "markdown": md}
+
+class _NdjsonSink:
+    def __init__(self, path: Path, table: str):
+        self.path, self._tmp = path, _tmp_path(path)
+        self._f = self._tmp.open("wb")
+
+    def write(self, rows: List[Dict]) -> None:
+        self._f.write(b"".join(map(_dumps_line, rows)))
+
+    def close(self) -> None:
+        self._f.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        self._f.close()
+        self._tmp.unlink(missing_ok=True)
+
+def _pyarrow(action: str):
+    # imported on first Parquet use only: pyarrow (and numpy under it) adds ~100 ms to every cold start
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError(f"{action} needs pyarrow (pip install pyarrow)") from None
+    return pyarrow, pyarrow.parquet
+
+class _ParquetSink:
+    def __init__(self, path: Path, table: str):
+        pa, pq = _pyarrow("Parquet export")
+        self._pa = pa
+        types = {"string": pa.string(), "float64": pa.float64(), "int64": pa.int64(), "bool": pa.bool_(),
+                 "list<string>": pa.list_(pa.string())}
+        self.schema = pa.schema([(c, types[t]) for c, t in TABLES[table].items()])
+        self.path, self._tmp = path, _tmp_path(path)
+        self._w = pq.ParquetWriter(str(self._tmp), self.schema, compression="zstd")
+
+    def write(self, rows: List[Dict]) -> None:
+        self._w.write_batch(self._pa.RecordBatch.from_pylist(rows, schema=self.schema))
+
+    def close(self) -> None:
+        self._w.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        self._w.close()
+        self._tmp.unlink(missing_ok=True)
+
+def export_sessions(docs: Iterable[Tuple[Dict, float]], out_dir: Path = EXPORT_DIR, fmt: str = "ndjson",
+                    batch_rows: int = 1000) -> Dict[str, int]:
+    """
+    Stream (state document, updated_at) pairs — e.g. SessionStore.iter_states() — into
+    <out_dir>/{sessions,plans,jds}.<fmt>. Returns the row count per table.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r} (expected one of {FORMATS})")
+    if fmt == "parquet":
+        _pyarrow("Parquet export")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    sink_cls = _ParquetSink if fmt == "parquet" else _NdjsonSink
+    sinks = {t: sink_cls(out_dir / f"{t}.{fmt}", t) for t in TABLES}
+    buffers: Dict[str, List[Dict]] = {t: [] for t in TABLES}
+    counts = dict.fromkeys(TABLES, 0)
+    try:
+        for doc, updated_at in docs:
+            for table, row in session_rows(doc, updated_at):
+                buf = buffers[table]
+                buf.append(row)
+                if len(buf) >= batch_rows:
+                    sinks[table].write(buf)
+                    counts[table] += len(buf)
+                    buf.clear()
+        for table, buf in buffers.items():
+            if buf:
+                sinks[table].write(buf)
+                counts[table] += len(buf)
+    except BaseException:
+        for sink in sinks.values():
+            sink.abort()  # leave any previous export in place
+        raise
+    for sink in sinks.values():
+        sink.close()
+    return counts
+
+def _plan_records(path: Path, columns: List[str], batch_rows: int) -> Iterator[Dict]:
+    if path.suffix == ".parquet":
+        _, pq = _pyarrow("reading Parquet exports")
+        for batch in pq.ParquetFile(str(path)).iter_batches(batch_size=batch_rows, columns=columns):
+            yield from batch.to_pylist()
+        return
+    loads = orjson.loads if orjson is not None else json.loads
+    with path.open("rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+def eta_by_owner(path: Path = EXPORT_DIR / "plans.ndjson", batch_rows: int = 1000) -> List[Dict]:
+    """
+    Per-owner time-to-hire figures from an exported plans table, in one streaming pass.
+
+    stages / sessions: how many stages and sessions the owner appears in;
+    eta_days_total / mean / median / max: over the owner's stages (the median comes from
+    a histogram of day counts, so nothing per row is kept);
+    ready_by_day_mean: mean over sessions of the end_day of the owner's last stage.
+    Rows are grouped by session, as export_sessions writes them.
+    """
+    stats: Dict[str, Dict] = {}
+    current, ready = None, {}
+
+    def flush():
+        for owner, day in ready.items():
+            st = stats[owner]
+            st["sessions"] += 1
+            st["_ready_total"] += day
+        ready.clear()
+
+    for row in _plan_records(Path(path), ["session_id", "owner", "eta_days", "end_day"], batch_rows):
+        if row["session_id"] != current:
+            flush()
+            current = row["session_id"]
+        owner, eta = row.get("owner") or "Unassigned", row.get("eta_days") or 0
+        st = stats.get(owner)
+        if st is None:
+            st = stats[owner] = {"stages": 0, "sessions": 0, "_total": 0, "_max": 0, "_hist": Counter(),
+                                 "_ready_total": 0}
+        st["stages"] += 1
+        st["_total"] += eta
+        st["_max"] = max(st["_max"], eta)
+        st["_hist"][eta] += 1
+        if row.get("end_day") is not None:
+            ready[owner] = max(ready.get(owner, 0), row["end_day"])
+    flush()
+
+    out = []
+    for owner, st in stats.items():
+        half, seen, median = (st["stages"] + 1) // 2, 0, 0
+        for days in sorted(st["_hist"]):
+            seen += st["_hist"][days]
+            if seen >= half:
+                median = days
+                break
+        out.append({"owner": owner, "stages": st["stages"], "sessions": st["sessions"],
+                    "eta_days_total": st["_total"], "eta_days_mean": round(st["_total"] / st["stages"], 2),
+                    "eta_days_median": median, "eta_days_max": st["_max"],
+                    "ready_by_day_mean": round(st["_ready_total"] / st["sessions"], 2) if st["sessions"] else None})
+    return sorted(out, key=lambda r: -r["eta_days_total"])
+
+class BulkExport:
+    """
+    export_sessions() plus the eta_by_owner() summary on a background thread, one run at
+    a time per process. start() returns at once; status() is polled for the outcome:
+    {"state": "idle" | "running" | "done" | "failed", "started_at", "finished_at",
+    "counts", "owners", "error"}.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._status: Dict = {"state": "idle"}
+
+    def start(self, docs: Callable[[], Iterable[Tuple[Dict, float]]], out_dir: Path = EXPORT_DIR,
+              fmt: str = "ndjson") -> bool:
+        """Begin exporting docs() into out_dir; False if an export is already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._status = {"state": "running", "started_at": time.time()}
+            self._thread = threading.Thread(target=self._run, args=(docs, Path(out_dir), fmt),
+                                            name="bulk-export", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self, docs, out_dir: Path, fmt: str) -> None:
+        try:
+            counts = export_sessions(docs(), out_dir, fmt)
+            result = {"state": "done", "counts": counts, "owners": eta_by_owner(out_dir / f"plans.{fmt}")}
+        except Exception as e:  # reported through status(), the thread has no caller to raise to
+            result = {"state": "failed", "error": f"{type(e).__name__}: {e}"}
+        with self._lock:
+            self._status = {**self._status, **result, "finished_at": time.time()}
+
+    def status(self) -> Dict:
+        with self._lock:
+            return dict(self._status)
+
+    def wait(self, timeout: Optional[float] = None) -> Dict:
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.status()
+
+BULK_EXPORT = BulkExport()
+
+if __name__ == "__main__":
+    import argparse
+
+    from memory import STORE
+
+    ap = argparse.ArgumentParser(description="Bulk-export all stored sessions")
+    ap.add_argument("--out", type=Path, default=EXPORT_DIR)
+    ap.add_argument("--format", choices=FORMATS, default="ndjson")
+    ap.add_argument("--since", type=float, default=0.0, help="only sessions updated after this unix time")
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    counts = export_sessions(STORE.iter_states(since=args.since), args.out, args.format)
+    print(counts, f"{time.perf_counter() - t0:.2f} s -> {args.out}")
+    for r in eta_by_owner(args.out / f"plans.{args.format}"):
+        print(r)
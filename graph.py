@@ -1,30 +1,171 @@
 # graph.py
-from langgraph.graph import StateGraph, END
+import hashlib
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
 from state import AgentState
 from nodes.intake import intake_node
+from nodes.market_research import market_research_node
 from nodes.clarifier import clarifier_node
+import nodes.jd_generator as jd_generator
 from nodes.jd_generator import jd_generator_node
 from nodes.plan_builder import plan_builder_node
 from nodes.email_writer import email_writer_node
 from nodes.presenter import presenter_node
+import tools.checklist_tool as checklist_tool
+import tools.email_tool as email_tool
+from tracing import TRACER, Tracer
 
-def build_graph():
-    g = StateGraph(AgentState)
+# Bump whenever the topology or node contracts change so cached graphs are rebuilt.
+GRAPH_VERSION = "3"
 
-    g.add_node("intake", intake_node)
-    g.add_node("clarifier", clarifier_node)
-    g.add_node("jd_generator", jd_generator_node)
-    g.add_node("plan_builder", plan_builder_node)
-    g.add_node("email_writer", email_writer_node)
-    g.add_node("presenter", presenter_node)
+NODES: List[Tuple[str, Callable]] = [
+    ("intake", intake_node),
+    ("market_research", market_research_node),
+    ("clarifier", clarifier_node),
+    ("jd_generator", jd_generator_node),
+    ("plan_builder", plan_builder_node),
+    ("email_writer", email_writer_node),
+    ("presenter", presenter_node),
+]
 
-    g.set_entry_point("intake")
-    g.add_edge("intake", "clarifier")
+# jd_generator, plan_builder and email_writer only read slots and write disjoint
+# Artifacts fields, so they fan out from clarifier and fan back in at presenter.
+# Their partial updates are merged by the reducers declared on AgentState.
+FAN_OUT = ("jd_generator", "plan_builder", "email_writer")
+EDGES: List[Tuple] = [
+    ("intake", "market_research"),
+    ("market_research", "clarifier"),
     # if clarifier still has missing info we STILL proceed with sensible defaults
-    g.add_edge("clarifier", "jd_generator")
-    g.add_edge("jd_generator", "plan_builder")
-    g.add_edge("plan_builder", "email_writer")
-    g.add_edge("email_writer", "presenter")
-    g.add_edge("presenter", END)
+    *[("clarifier", n) for n in FAN_OUT],
+    (FAN_OUT, "presenter"),
+]
+
+# Slot fields each node reads. Nodes listed here are skipped on re-runs when those
+# fields are unchanged and their previous Artifacts are reused; intake, clarifier
+# and presenter are cheap and always run.
+NODE_INPUTS: Dict[str, Tuple[str, ...]] = {
+    "jd_generator": ("roles", "skills_hint", "company_name", "location", "timeline", "budget", "hiring_type"),
+    "plan_builder": ("roles", "hiring_type"),
+    "email_writer": ("roles", "budget", "timeline"),
+}
+
+# What else each skippable node's output depends on: its renderer's FORMAT and, for JDs,
+# the role catalogue the templates come from (the same versions their caches are keyed on).
+# Read at run time, so an edited roles.yml re-renders the JDs on the next run.
+NODE_VERSIONS: Dict[str, Callable[[], object]] = {
+    "jd_generator": lambda: (jd_generator.FORMAT, jd_generator.CATALOG.version),
+    "plan_builder": lambda: checklist_tool.FORMAT,
+    "email_writer": lambda: email_tool.FORMAT,
+}
+
+def graph_input(state: AgentState) -> AgentState:
+    """
+    The state to hand to invoke()/stream(). Nodes fill in slots and artifacts in place
+    (intake, presenter), so the run gets its own slots and artifacts; the caller's model
+    is left as it was. Both are small, so this costs far less than a dump/validate.
+    """
+    return state.model_copy(update={"slots": state.slots.model_copy(deep=True),
+                                    "artifacts": state.artifacts.model_copy()})
+
+def slot_fingerprint(state: AgentState, fields: Tuple[str, ...], versions: object = None) -> str:
+    """Stable hash of the given slot fields (plus GRAPH_VERSION and the node's `versions`)."""
+    payload = state.slots.model_dump(include=set(fields))
+    raw = json.dumps([GRAPH_VERSION, versions, payload], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def incremental(name: str, fn: Callable, fields: Tuple[str, ...],
+                versions: Optional[Callable[[], object]] = None) -> Callable:
+    """Wrap a node so it only runs when its input slots (or `versions()`) changed since its last run."""
+    def node(state: AgentState) -> Dict:
+        fp = slot_fingerprint(state, fields, versions() if versions else None)
+        if state.node_inputs.get(name) == fp:
+            return {}  # previous Artifacts are still valid
+        update = dict(fn(state))
+        update["node_inputs"] = {name: fp}
+        return update
+    node.__name__ = node.__qualname__ = f"incremental_{fn.__name__}"
+    node.__module__ = fn.__module__
+    return node
+
+def build_graph(nodes: Optional[List[Tuple[str, Callable]]] = None, incremental_mode: bool = False,
+                edges: Optional[List[Tuple]] = None, tracer: Optional[Tracer] = TRACER):
+    # langgraph (and the langchain-core/langsmith stack under it) is ~0.7 s of imports;
+    # deferring it to the first build keeps `import graph` and the first page render cheap
+    from langgraph.graph import StateGraph, END
+
+    nodes = nodes or NODES
+    edges = edges or EDGES
+    g = StateGraph(AgentState)
+
+    for name, fn in nodes:
+        if incremental_mode and name in NODE_INPUTS:
+            fn = incremental(name, fn, NODE_INPUTS[name], NODE_VERSIONS.get(name))
+        if tracer is not None:
+            fn = tracer.wrap(name, fn)  # outermost, so skipped incremental runs show up as ~0 ms
+        g.add_node(name, fn)
+
+    g.set_entry_point(nodes[0][0])
+    for src, dst in edges:
+        g.add_edge(list(src) if isinstance(src, tuple) else src, dst)
+    g.add_edge(nodes[-1][0], END)
 
     return g.compile()
+
+# ---------------- compiled-graph registry ----------------
+# Streamlit reruns the script (and every session shares the process), so compile once
+# per (node set, version) and hand the same compiled graph to every caller.
+_REGISTRY: Dict[Tuple, object] = {}
+_REGISTRY_LOCK = threading.Lock()
+_STATS = {"compiles": 0, "hits": 0, "compile_ms": 0.0}
+
+def _graph_key(nodes: List[Tuple[str, Callable]], incremental_mode: bool, edges: List[Tuple]) -> Tuple:
+    names = tuple((name, f"{fn.__module__}.{fn.__qualname__}") for name, fn in nodes)
+    return (GRAPH_VERSION, incremental_mode, tuple(edges)) + names
+
+def get_graph(nodes: Optional[List[Tuple[str, Callable]]] = None, incremental_mode: bool = False,
+              edges: Optional[List[Tuple]] = None):
+    """Return the process-wide compiled graph, building it on first use."""
+    nodes = nodes or NODES
+    edges = edges or EDGES
+    key = _graph_key(nodes, incremental_mode, edges)
+    app = _REGISTRY.get(key)
+    if app is not None:
+        with _REGISTRY_LOCK:
+            _STATS["hits"] += 1
+        return app
+    with _REGISTRY_LOCK:
+        app = _REGISTRY.get(key)  # another thread may have won the race
+        if app is not None:
+            _STATS["hits"] += 1
+            return app
+        t0 = time.perf_counter()
+        app = build_graph(nodes, incremental_mode=incremental_mode, edges=edges)
+        _STATS["compiles"] += 1
+        _STATS["compile_ms"] += (time.perf_counter() - t0) * 1000
+        _REGISTRY[key] = app
+        return app
+
+_PREWARM: Dict[bool, threading.Thread] = {}
+
+def prewarm(incremental_mode: bool = False) -> threading.Thread:
+    """Import langgraph and compile the default graph on a background thread (once per process)."""
+    with _REGISTRY_LOCK:
+        t = _PREWARM.get(incremental_mode)
+        if t is None:
+            t = threading.Thread(target=get_graph, kwargs={"incremental_mode": incremental_mode},
+                                 name="graph-prewarm", daemon=True)
+            _PREWARM[incremental_mode] = t
+            t.start()
+        return t
+
+def graph_stats() -> Dict[str, float]:
+    """Compile count, cache hits and total compile time (ms) for this process."""
+    with _REGISTRY_LOCK:
+        return dict(_STATS)
+
+def clear_graph_cache() -> None:
+    with _REGISTRY_LOCK:
+        _REGISTRY.clear()
@@ -0,0 +1,231 @@
+# memory.py — persistent session store (SQLite, append-only state deltas)
+#
+# Each save appends only what changed since the session's previous save (a list of
+# set/delete operations on flattened state paths), so a clarify-form edit costs one small
+# row instead of rewriting a JSON file. A session is materialized only when it is
+# resumed: its last snapshot plus the deltas after it. Once a session has accumulated
+# `compact_every` deltas they are folded into a new snapshot and deleted.
+#
+# Several processes (API workers, batch, Streamlit) may share one database. Each save
+# runs in a BEGIN IMMEDIATE transaction that re-reads the session's head: the in-process
+# copy of the last saved state is only used as the diff base when its seq is still the
+# head, otherwise the base is re-materialized, so a delta never omits another writer's paths.
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from state import AgentState
+
+ROOT = Path(__file__).resolve().parent
+DB_PATH = Path(os.getenv("SKILLSCOUT_SESSION_DB", ROOT / "storage" / "sessions.db"))
+
+Path_ = Tuple[str, ...]
+
+def flatten(doc: Dict, prefix: Path_ = ()) -> Dict[Path_, Any]:
+    """{'a': {'b': 1}} -> {('a', 'b'): 1}; lists and scalars are leaves."""
+    out: Dict[Path_, Any] = {}
+    for k, v in doc.items():
+        path = prefix + (k,)
+        if isinstance(v, dict) and v:
+            out.update(flatten(v, path))
+        else:
+            out[path] = v
+    return out
+
+def unflatten(flat: Dict[Path_, Any]) -> Dict:
+    doc: Dict = {}
+    for path, v in flat.items():
+        node = doc
+        for k in path[:-1]:
+            node = node.setdefault(k, {})
+        node[path[-1]] = v
+    return doc
+
+def diff(old: Dict[Path_, Any], new: Dict[Path_, Any]) -> Dict[str, list]:
+    return {
+        "set": [[list(p), v] for p, v in new.items() if p not in old or old[p] != v],
+        "del": [list(p) for p in old if p not in new],
+    }
+
+def apply_delta(flat: Dict[Path_, Any], delta: Dict[str, list]) -> None:
+    for p in delta.get("del", []):
+        flat.pop(tuple(p), None)
+    for p, v in delta.get("set", []):
+        path = tuple(p)
+        # a path that becomes a leaf (or a branch) replaces whatever was under/above it
+        for other in [o for o in flat if o != path and (o[:len(path)] == path or path[:len(o)] == o)]:
+            del flat[other]
+        flat[path] = v
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+@contextmanager
+def _transaction(db: sqlite3.Connection, mode: str = "IMMEDIATE") -> Iterator[sqlite3.Connection]:
+    """BEGIN <mode> ... COMMIT, rolled back on any error so the connection is never left mid-transaction."""
+    db.execute(f"BEGIN {mode}")
+    try:
+        yield db
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+
+class SessionStore:
+    def __init__(self, path=DB_PATH, compact_every: int = 20, cache_sessions: int = 256):
+        self.path = Path(path)
+        self.compact_every = compact_every
+        self.cache_sessions = cache_sessions
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        # session_id -> (flattened state as last saved, its seq): lets save() diff without a
+        # read while no other writer has moved the session's head
+        self._last: "OrderedDict[str, Tuple[Dict[Path_, Any], int]]" = OrderedDict()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("""CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY, user_query TEXT, snapshot TEXT, snapshot_seq INTEGER NOT NULL,
+                head_seq INTEGER NOT NULL, pending INTEGER NOT NULL, updated_at REAL NOT NULL)""")
+            db.execute("""CREATE TABLE IF NOT EXISTS deltas (
+                session_id TEXT NOT NULL, seq INTEGER NOT NULL, delta TEXT NOT NULL,
+                PRIMARY KEY (session_id, seq)) WITHOUT ROWID""")
+            db.execute("CREATE INDEX IF NOT EXISTS sessions_recent ON sessions(updated_at)")
+            self._db = db
+        return self._db
+
+    def _remember(self, session_id: str, flat: Dict[Path_, Any], seq: int) -> None:
+        self._last[session_id] = (flat, seq)
+        self._last.move_to_end(session_id)
+        while len(self._last) > self.cache_sessions:
+            self._last.popitem(last=False)
+
+    def _materialize(self, session_id: str) -> Optional[Tuple[Dict[Path_, Any], int]]:
+        db = self._conn()
+        if not db.in_transaction:  # one read snapshot, so a concurrent compaction can't split it
+            with _transaction(db, "DEFERRED"):
+                return self._materialize(session_id)
+        row = db.execute("SELECT snapshot, snapshot_seq, head_seq FROM sessions WHERE session_id=?",
+                         (session_id,)).fetchone()
+        if row is None:
+            return None
+        flat = flatten(json.loads(row[0])) if row[0] else {}
+        for (delta,) in db.execute("SELECT delta FROM deltas WHERE session_id=? AND seq>? ORDER BY seq",
+                                   (session_id, row[1])):
+            apply_delta(flat, json.loads(delta))
+        return flat, row[2]
+
+    # ---------- public API ----------
+    def save(self, state: AgentState) -> int:
+        """Append the changes since this session's last save; returns the new sequence number."""
+        sid = state.session_id
+        flat = flatten(state.model_dump(mode="json"))
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            with _transaction(db):
+                head = db.execute("SELECT head_seq, pending FROM sessions WHERE session_id=?", (sid,)).fetchone()
+                if head is None:
+                    db.execute("INSERT INTO sessions VALUES (?,?,?,?,?,?,?)",
+                               (sid, state.user_query, _dumps(unflatten(flat)), 0, 0, 0, now))
+                    seq, pending = 0, 0
+                else:
+                    cached = self._last.get(sid)
+                    if cached is not None and cached[1] == head[0]:
+                        prev = cached[0]
+                    else:  # never seen here, or another writer saved since: diff against the stored state
+                        prev = self._materialize(sid)[0]
+                    delta = diff(prev, flat)
+                    seq, pending = head
+                    if delta["set"] or delta["del"]:
+                        seq, pending = seq + 1, pending + 1
+                        db.execute("INSERT INTO deltas VALUES (?,?,?)", (sid, seq, _dumps(delta)))
+                        db.execute("UPDATE sessions SET head_seq=?, pending=?, updated_at=?, user_query=? "
+                                   "WHERE session_id=?", (seq, pending, now, state.user_query, sid))
+            self._remember(sid, flat, seq)
+            if pending >= self.compact_every:
+                self.compact(sid)
+            return seq
+
+    def load(self, session_id: str) -> Optional[AgentState]:
+        with self._lock:
+            loaded = self._materialize(session_id)
+            if loaded is None:
+                return None
+            self._remember(session_id, *loaded)
+            return AgentState.model_validate(unflatten(loaded[0]))
+
+    def compact(self, session_id: str) -> None:
+        """Fold all deltas into the snapshot and drop them."""
+        with self._lock:
+            db = self._conn()
+            with _transaction(db):
+                loaded = self._materialize(session_id)
+                if loaded is None:
+                    return
+                flat, head = loaded
+                db.execute("UPDATE sessions SET snapshot=?, snapshot_seq=?, pending=0 WHERE session_id=?",
+                           (_dumps(unflatten(flat)), head, session_id))
+                db.execute("DELETE FROM deltas WHERE session_id=? AND seq<=?", (session_id, head))
+
+    def head(self, session_id: str) -> Optional[int]:
+        """Sequence number of the session's latest save (None if unknown)."""
+        with self._lock:
+            row = self._conn().execute("SELECT head_seq FROM sessions WHERE session_id=?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def list_sessions(self, limit: int = 50) -> List[Dict]:
+        """Most recently updated sessions (metadata only; nothing is replayed)."""
+        with self._lock:
+            rows = self._conn().execute(
+                "SELECT session_id, user_query, updated_at, head_seq FROM sessions ORDER BY updated_at DESC LIMIT ?",
+                (limit,)).fetchall()
+        return [{"session_id": r[0], "user_query": r[1], "updated_at": r[2], "saves": r[3] + 1} for r in rows]
+
+    def iter_states(self, since: float = 0.0, page: int = 200) -> Iterator[Tuple[Dict, float]]:
+        """
+        Yield (state document, updated_at) for every session updated after `since`.
+
+        Sessions are read in pages of `page` ids (keyset pagination on session_id) and
+        materialized one at a time, so memory stays flat however many sessions exist;
+        the lock is only held per page and per session.
+        """
+        after = ""
+        while True:
+            with self._lock:
+                rows = self._conn().execute(
+                    "SELECT session_id, updated_at FROM sessions WHERE session_id>? AND updated_at>? "
+                    "ORDER BY session_id LIMIT ?", (after, since, page)).fetchall()
+            if not rows:
+                return
+            for sid, updated_at in rows:
+                with self._lock:
+                    loaded = self._materialize(sid)
+                if loaded is not None:
+                    yield unflatten(loaded[0]), updated_at
+            after = rows[-1][0]
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            with _transaction(self._conn()) as db:
+                db.execute("DELETE FROM deltas WHERE session_id=?", (session_id,))
+                db.execute("DELETE FROM sessions WHERE session_id=?", (session_id,))
+            self._last.pop(session_id, None)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+STORE = SessionStore()
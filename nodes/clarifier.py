@@ -1,18 +1,20 @@
 # nodes/clarifier.py
-from state import AgentState
+from typing import Dict, List, Optional
+from state import AgentState, Slots
+from tools.rules import RULES
 
-NEEDED = ["budget", "timeline", "location", "hiring_type"]
+def missing_questions(s: Slots, market: Optional[Dict] = None) -> List[str]:
+    # which questions, their order and wording come from data/rules.yml
+    return RULES.current().ask(s, market)
 
 def clarifier_node(state: AgentState) -> AgentState:
-    missing = []
-    s = state.slots
-    if not s.budget: missing.append("What’s your budget range?")
-    if not s.timeline: missing.append("What’s the hiring timeline?")
-    if not s.location: missing.append("Is the role remote, hybrid or onsite?")
-    if not s.hiring_type: missing.append("Is this full-time, intern, or contract?")
+    missing = missing_questions(state.slots, state.market)
     # store a quick summary markdown for UI
     if missing:
         state.artifacts.summary_md = "### Clarifying Questions\n" + "\n".join([f"- {q}" for q in missing])
     else:
         state.artifacts.summary_md = "### Clarifying Questions\n- All set (no blockers)."
+    if state.market.get("skills"):
+        state.artifacts.summary_md += ("\n\n_Often requested in similar postings: "
+                                       + ", ".join(state.market["skills"]) + "_")
     return state
@@ -1,8 +1,9 @@
 # nodes/email_writer.py
+from typing import Dict
 from tools.email_tool import kickoff_email
-from state import AgentState
+from state import AgentState, Artifacts
 
-def email_writer_node(state: AgentState) -> AgentState:
+def email_writer_node(state: AgentState) -> Dict:
     roles_payload = [{"title": r.title} for r in state.slots.roles]
-    state.artifacts.email_draft = kickoff_email(roles_payload, state.slots.budget, state.slots.timeline)
-    return state
+    draft = kickoff_email(roles_payload, state.slots.budget, state.slots.timeline)
+    return {"artifacts": Artifacts(email_draft=draft)}
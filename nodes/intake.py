@@ -1,51 +1,52 @@
 # nodes/intake.py
-import re
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 from state import AgentState, RoleSpec
+from tools.role_matcher import RoleIndex
+from tools.rules import RULES, Extraction, RuleSet
+from tools.skill_vocab import VOCAB
 
-ROLE_ALIASES = {
-    "founding engineer": ["founding engineer", "founder engineer", "first engineer"],
-    "genai intern": ["genai intern", "ai intern", "ml intern", "gen ai intern"],
-    "ml engineer": ["ml engineer", "machine learning engineer", "ml eng"],
-    "devops/sre": ["devops", "sre", "site reliability"]
-}
+# Role aliases, slot keywords and patterns live in data/rules.yml (compiled by tools.rules).
+# Requests that name no alias are matched to the nearest role name (tools.role_matcher).
+
+@lru_cache(maxsize=256)
+def _scan(rules: RuleSet, text: str) -> Extraction:
+    return rules.scan(text)
+
+def scan(text: str) -> Extraction:
+    """Extract roles and slots from free text (cached per rule set: intake scans the same query twice)."""
+    return _scan(RULES.current(), text)
+
+@lru_cache(maxsize=4)
+def _role_index(rules: RuleSet) -> RoleIndex:
+    return RoleIndex([(name, canonical) for canonical, aliases in rules.role_aliases.items()
+                      for name in [canonical, *aliases]])
+
+@lru_cache(maxsize=256)
+def _nearest_role(rules: RuleSet, text: str) -> Optional[str]:
+    return _role_index(rules).best(text, rules.role_match) if rules.role_match <= 1 else None
 
 def detect_roles(text: str) -> List[RoleSpec]:
-    roles: List[RoleSpec] = []
-    t = text.lower()
-    matched = False
-    for canonical, keys in ROLE_ALIASES.items():
-        if any(k in t for k in keys):
-            title = canonical.title()
-            roles.append(RoleSpec(title=title))
-            matched = True
-    if not matched:
-        roles.append(RoleSpec(title="Software Engineer (Startup)"))
-    return roles
+    rules = RULES.current()
+    found = _scan(rules, text).roles
+    if not found:
+        nearest = _nearest_role(rules, text)
+        return [RoleSpec(title=nearest.title() if nearest else rules.default_role)]
+    return [RoleSpec(title=canonical.title()) for canonical in found]
 
 def extract_slots(text: str, state: AgentState) -> AgentState:
-    t = text.lower()
-    # budget
-    m = re.search(r'(\$\s?\d[\d,]*\s?(k|/hr|k\+)?|\d+\s?lpa|\$\s?\d+\s?-\s?\$\s?\d+)', t)
-    if m and not state.slots.budget:
-        state.slots.budget = m.group(0).replace(" ", "")
-    # timeline
-    m = re.search(r'(\d+\s?(weeks?|months?))|(next\s?\d+\s?(weeks?|months?))', t)
-    if m and not state.slots.timeline:
-        state.slots.timeline = m.group(0)
-    # location
-    for loc in ["remote","hybrid","onsite"]:
-        if loc in t and not state.slots.location:
-            state.slots.location = loc.title()
-            break
-    # type
-    for ty in ["full-time","contract","intern","internship"]:
-        if ty in t and not state.slots.hiring_type:
-            state.slots.hiring_type = "intern" if "intern" in ty else ty.title()
-            break
-    # skills hint
-    skill_hits = [s for s in ["python","aws","kubernetes","terraform","vector","prompt","react","node"] if s in t]
-    state.slots.skills_hint = sorted(set(state.slots.skills_hint + skill_hits))
+    x = scan(text)
+    s = state.slots
+    if x.budget and not s.budget:
+        s.budget = x.budget
+    if x.timeline and not s.timeline:
+        s.timeline = x.timeline
+    if x.location and not s.location:
+        s.location = x.location
+    if x.hiring_type and not s.hiring_type:
+        s.hiring_type = x.hiring_type
+    # raw skill keywords -> canonical names ("k8s" -> "Kubernetes")
+    s.skills_hint = VOCAB.canonical(s.skills_hint, x.skills)
     return state
 
 def intake_node(state: AgentState) -> AgentState:
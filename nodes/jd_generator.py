@@ -1,10 +1,16 @@
 # nodes/jd_generator.py — JD in your example’s structure (Python 3.9–safe)
-from typing import List, Optional
-import yaml
-from pathlib import Path
-from state import AgentState, RoleSpec
-
-ROLE_DATA = yaml.safe_load(Path("data/roles.yml").read_text(encoding="utf-8"))
+import os
+import sys
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from state import AgentState, Artifacts, RoleSpec
+from tools.artifact_cache import cached
+from tools.role_catalog import CATALOG
+from tools.skill_vocab import CLOUD_MASK, PYTHON_BIT, VOCAB
+
+FALLBACK_ROLE = "Founding Engineer"
 
 # -------- helpers --------
 def _cap(s: str) -> str:
@@ -40,7 +46,81 @@ def _normalize_skill_sentence(s: str) -> str:
         return f"Proficiency in {ss.capitalize()}."
     return _sent(ss)
 
+def _skill_sentence(s: str) -> str:
+    """Qualification line: vocabulary skills by their display name, anything else as written."""
+    name = VOCAB.canonical_name(s)
+    return f"Proficiency in {name}." if name else _normalize_skill_sentence(s)
+
+# -------- compiled role templates --------
+# Everything that depends only on the catalogue entry is rendered once per role and
+# catalogue version; _compose_jd then splices in the request-specific fields.
+CONTRACT_TYPES = {"intern", "contract"}
+FORMAT = 2  # bump whenever the JD text layout changes (2: request skills in request order)
+
+CO_LINE_2 = _sent("We foster a collaborative, inclusive environment where ownership, learning, and delivery matter.")
+JD_DEFAULT = "We are looking for a motivated professional to contribute to high-impact initiatives."
+PYTHON_EXTRA = "- Write clean, well-documented Python code and contribute to code reviews."
+CLOUD_EXTRA = "- Utilize cloud services to develop, deploy, and monitor AI workloads in a secure and cost-efficient manner."
+BENEFITS_SHORT_TERM = _bulletize([
+    "Gain hands-on experience delivering scoped outcomes with close mentorship.",
+    "Work on real-world AI projects with clear learning objectives.",
+    "Flexible working hours and the ability to work remotely.",
+    "Competitive, market-informed compensation.",
+])
+BENEFITS_FULL_TIME = _bulletize([
+    "A culture of ownership and impact with early product influence.",
+    "Opportunities for growth, mentorship, and continuous learning.",
+    "Flexible work arrangements, including remote options.",
+    "Competitive, market-informed compensation.",
+])
+HOW_TO_APPLY = ("**How to Apply:**\n"
+                "Please submit your resume (and portfolio or GitHub, if relevant). Include a brief note "
+                "on your availability and the most relevant project you have built.\n")
+
+class _RoleTemplate:
+    __slots__ = ("summary", "resp_bullets", "must_keys", "must_bullets", "nice_bullets")
+
+    def __init__(self, data: dict):
+        summary = data.get("summary", "")
+        self.summary = _sent(summary) if summary else None
+        self.resp_bullets = [b for b in (_bullet(_sent(x)) for x in data.get("responsibilities", [])) if b]
+        must = list(data.get("must_have", []))
+        self.must_keys = frozenset(VOCAB.key(m) for m in must)
+        self.must_bullets = [b for b in (_qual_bullet(m) for m in must) if b]
+        self.nice_bullets = [b for b in (_qual_bullet(n) for n in data.get("nice_to_have", [])) if b]
+
+def _bullet(line: str) -> str:
+    """One _bulletize line, or '' when _bulletize would drop it."""
+    return "- " + _sent(line) if line and line.strip() else ""
+
+@lru_cache(maxsize=4096)
+def _qual_bullet(skill: str) -> str:
+    return _bullet(_skill_sentence(skill))
+
+_TEMPLATES: Dict[str, _RoleTemplate] = {}
+_TEMPLATES_VERSION: Optional[str] = None
+_TEMPLATES_LOCK = threading.Lock()
+
+def _template_for(title: str) -> _RoleTemplate:
+    global _TEMPLATES_VERSION
+    version = CATALOG.version
+    key = CATALOG.match(title) or FALLBACK_ROLE  # nearest catalogue role for unlisted titles
+    tpl = _TEMPLATES.get(key) if _TEMPLATES_VERSION == version else None
+    if tpl is None:
+        data = CATALOG.get(key) or {}
+        tpl = _RoleTemplate(data)
+        with _TEMPLATES_LOCK:
+            if _TEMPLATES_VERSION != version:  # catalogue changed: drop stale templates
+                _TEMPLATES.clear()
+                _TEMPLATES_VERSION = version
+            _TEMPLATES[key] = tpl
+    return tpl
+
+def _join_bullets(bullets: List[str]) -> str:
+    return "\n".join(bullets) if bullets else "- (none)"
+
 # -------- JD composer --------
+@cached("jd", version=lambda: (FORMAT, CATALOG.version))
 def _compose_jd(
     role: RoleSpec,
     skills_hint: List[str],
@@ -50,128 +130,122 @@ def _compose_jd(
     budget: Optional[str],
     hiring_type: Optional[str],
 ) -> str:
-    data = ROLE_DATA.get(role.title, ROLE_DATA.get("Founding Engineer", {}))
-
-    # seeds
-    summary = data.get("summary", "")
-    resp_seed = list(data.get("responsibilities", []))
-    must_seed = list(data.get("must_have", []))
-    nice_seed = list(data.get("nice_to_have", []))
-
-    # merge skills into requirements (dedup, keep order)
-    if skills_hint:
-        for s in skills_hint:
-            if s not in must_seed:
-                must_seed.append(s)
-
-    # craft lines (professional)
-    company = company_name or "Our company"
-    loc_line = location or "Remote/Hybrid/Onsite (to be confirmed)"
+    tpl = _template_for(role.title)
+    entries = VOCAB.entries(skills_hint) if skills_hint else []  # request order, deduplicated
+    skills = 0
+    for _, _, bit in entries:
+        skills |= bit
+    short_term = bool(hiring_type) and hiring_type.lower() in CONTRACT_TYPES
     duration_phrase = _infer_duration_phrase(timeline, hiring_type)
 
-    # Company Overview (two sentences is fine)
-    co_lines = [
-        f"{company} is dedicated to building innovative, AI-driven solutions for real customers.",
-        "We foster a collaborative, inclusive environment where ownership, learning, and delivery matter.",
-    ]
-    if duration_phrase and hiring_type and hiring_type.lower() in {"intern", "contract"}:
-        co_lines.append(f"We are seeking a motivated {role.title} to join the team on a {duration_phrase} basis.")
-
-    # Job Description (mix summary + skills + hiring type)
-    jd_lines = []
-    if summary:
-        jd_lines.append(summary)
-    if hiring_type and hiring_type.lower() in {"intern", "contract"} and not duration_phrase:
-        jd_lines.append(f"This is a {hiring_type.lower()} role.")
-    if skills_hint:
-        jd_lines.append("The ideal candidate is comfortable with " + ", ".join([s.upper() if s.lower() in {"gcp","aws","azure"} else s for s in skills_hint]) + ".")
-
-    # Responsibilities (ensure full sentences)
-    resp_lines = [ _sent(x) for x in resp_seed ]
-    # add a couple sensible, professional items if missing
-    extras = []
-    if "python" in [s.lower() for s in skills_hint]:
-        extras.append("Write clean, well-documented Python code and contribute to code reviews.")
-    if any(s.lower() in {"gcp","aws","azure"} for s in skills_hint):
-        extras.append("Utilize cloud services to develop, deploy, and monitor AI workloads in a secure and cost-efficient manner.")
-    if extras:
-        resp_lines.extend(extras)
-
-    # Qualifications (must + nice) → bullets
-    qual_lines = [ _normalize_skill_sentence(m) for m in must_seed ] + [ _normalize_skill_sentence(n) for n in nice_seed ]
-
-    # Benefits (generic but professional)
-    if hiring_type and hiring_type.lower() in {"intern", "contract"}:
-        benefits = [
-            "Gain hands-on experience delivering scoped outcomes with close mentorship.",
-            "Work on real-world AI projects with clear learning objectives.",
-            "Flexible working hours and the ability to work remotely.",
-            "Competitive, market-informed compensation.",
-        ]
-    else:
-        benefits = [
-            "A culture of ownership and impact with early product influence.",
-            "Opportunities for growth, mentorship, and continuous learning.",
-            "Flexible work arrangements, including remote options.",
-            "Competitive, market-informed compensation.",
-        ]
-
-    # Build the final JD text (Markdown)
-    parts = []
-    parts.append(f"**Job Title:** {role.title}")
-    parts.append(f"**Location:** {loc_line}")
+    # Header
+    parts = [f"**Job Title:** {role.title}",
+             f"**Location:** {location or 'Remote/Hybrid/Onsite (to be confirmed)'}"]
     if duration_phrase:
         parts.append(f"**Duration:** {duration_phrase}")
     if budget:
         parts.append(f"**Budget:** {budget}")
-    parts.append("")  # blank line
-
-    parts.append("**Company Overview:**")
-    parts.append(" ".join([_sent(l) for l in co_lines]))
     parts.append("")
 
-    parts.append("**Job Description:**")
-    jd_text = " ".join([_sent(l) for l in jd_lines]) if jd_lines else "We are looking for a motivated professional to contribute to high-impact initiatives."
-    parts.append(jd_text)
-    parts.append("")
-
-    parts.append("**Responsibilities:**")
-    parts.append(_bulletize(resp_lines))
-    parts.append("")
-
-    parts.append("**Qualifications:**")
-    parts.append(_bulletize(qual_lines))
-    parts.append("")
-
-    parts.append("**Benefits:**")
-    parts.append(_bulletize(benefits))
-    parts.append("")
-
-    parts.append("**How to Apply:**")
-    parts.append("Please submit your resume (and portfolio or GitHub, if relevant). Include a brief note on your availability and the most relevant project you have built.")
-    parts.append("")
+    # Company Overview
+    co = _sent(f"{company_name or 'Our company'} is dedicated to building innovative, AI-driven solutions for real customers.") + " " + CO_LINE_2
+    if duration_phrase and short_term:
+        co += f" We are seeking a motivated {role.title} to join the team on a {duration_phrase} basis."
+    parts += ["**Company Overview:**", co, ""]
 
+    # Job Description (summary + hiring type + skills)
+    jd_lines = [tpl.summary] if tpl.summary is not None else []
+    if short_term and not duration_phrase:
+        jd_lines.append(f"This is a {hiring_type.lower()} role.")
+    if entries:
+        jd_lines.append("The ideal candidate is comfortable with " + ", ".join(e[1] for e in entries) + ".")
+    parts += ["**Job Description:**", " ".join(jd_lines) if jd_lines else JD_DEFAULT, ""]
+
+    # Responsibilities
+    resp = tpl.resp_bullets
+    if skills & (PYTHON_BIT | CLOUD_MASK):
+        resp = list(resp)
+        if skills & PYTHON_BIT:
+            resp.append(PYTHON_EXTRA)
+        if skills & CLOUD_MASK:
+            resp.append(CLOUD_EXTRA)
+    parts += ["**Responsibilities:**", _join_bullets(resp), ""]
+
+    # Qualifications: seed must-haves, then request skills not already listed, then nice-to-haves
+    quals = list(tpl.must_bullets)
+    for key, s, _ in entries:
+        b = _qual_bullet(s) if key not in tpl.must_keys else ""
+        if b:
+            quals.append(b)
+    quals += tpl.nice_bullets
+    parts += ["**Qualifications:**", _join_bullets(quals), ""]
+
+    parts += ["**Benefits:**", BENEFITS_SHORT_TERM if short_term else BENEFITS_FULL_TIME, "", HOW_TO_APPLY]
     return "\n".join(parts)
 
-def jd_generator_node(state: AgentState) -> AgentState:
-    skills = state.slots.skills_hint or []
-    company = state.slots.company_name
-    loc = state.slots.location
-    tline = state.slots.timeline
-    budg = state.slots.budget
-    htype = state.slots.hiring_type
-
-    for role in state.slots.roles:
+def _polish(title: str, draft: str) -> str:
+    """Optional LLM rewrite of a template draft (SKILLSCOUT_LLM_POLISH=1); falls back to the draft."""
+    from tools.llm_cache import complete
+    try:
+        return complete("jd", {"role": title, "draft": draft}) or draft
+    except Exception:  # Ollama down / timed out: the template draft is still a usable JD
+        return draft
+
+JD_WORKERS = int(os.getenv("SKILLSCOUT_JD_WORKERS", "8"))
+_JD_POOL: Optional[ThreadPoolExecutor] = None
+_JD_POOL_LOCK = threading.Lock()
+
+def _jd_pool() -> ThreadPoolExecutor:
+    global _JD_POOL
+    with _JD_POOL_LOCK:
+        if _JD_POOL is None:
+            _JD_POOL = ThreadPoolExecutor(max_workers=JD_WORKERS, thread_name_prefix="jd")
+        return _JD_POOL
+
+def _progress_writer():
+    """LangGraph's custom-stream writer inside a graph run; a no-op when called directly."""
+    config = sys.modules.get("langgraph.config")
+    if config is None:  # langgraph not even imported, so not inside a graph run
+        return lambda chunk: None
+    try:
+        return config.get_stream_writer()
+    except RuntimeError:
+        return lambda chunk: None
+
+def jd_generator_node(state: AgentState) -> Dict:
+    """
+    Draft one JD per role; roles are rendered concurrently (LLM polishing is I/O-bound).
+    Each finished JD is also emitted as a {"jd": {title: markdown}} custom stream event,
+    so a UI consuming stream_mode="custom" can show it before the other roles are done.
+    """
+    s = state.slots
+    emit = _progress_writer()
+    polish = os.getenv("SKILLSCOUT_LLM_POLISH") == "1"
+
+    def render(role: RoleSpec) -> str:
         md = _compose_jd(
             role=role,
-            skills_hint=skills,
-            company_name=company,
-            location=loc,
-            timeline=tline,
-            budget=budg,
-            hiring_type=htype,
+            skills_hint=s.skills_hint or [],
+            company_name=s.company_name,
+            location=s.location,
+            timeline=s.timeline,
+            budget=s.budget,
+            hiring_type=s.hiring_type,
         )
-        state.artifacts.jds[role.title] = md
+        return _polish(role.title, md) if polish else md
+
+    roles = s.roles
+    drafts: Dict[int, str] = {}
+    if len(roles) > 1:
+        futures = {_jd_pool().submit(render, role): i for i, role in enumerate(roles)}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            drafts[i] = fut.result()
+            emit({"jd": {roles[i].title: drafts[i]}})
+    else:
+        for i, role in enumerate(roles):
+            drafts[i] = render(role)
+            emit({"jd": {role.title: drafts[i]}})
+    jds = {role.title: drafts[i] for i, role in enumerate(roles)}
 
-    state.analytics["roles_created"] = len(state.artifacts.jds)
-    return state
+    return {"artifacts": Artifacts(jds=jds), "analytics": {"roles_created": len(jds)}}
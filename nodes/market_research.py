@@ -0,0 +1,12 @@
+# nodes/market_research.py
+from typing import Dict
+from state import AgentState
+from tools.search_tool import INDEX
+
+def market_query(state: AgentState) -> str:
+    s = state.slots
+    return " ".join([r.title for r in s.roles] + s.skills_hint + [s.location or "", s.hiring_type or ""])
+
+def market_research_node(state: AgentState) -> Dict:
+    # Budget and skill hints from the local postings index (empty when there is no corpus)
+    return {"market": INDEX.suggest(market_query(state), state.slots.skills_hint)}
@@ -1,17 +1,27 @@
 # nodes/plan_builder.py
+from typing import Dict
 from tools.checklist_tool import build_checklist
-from state import AgentState
+from state import AgentState, Artifacts
 
 def plan_to_markdown(items):
     out = ["## Hiring Plan"]
+    scheduled = bool(items) and "end_day" in items[0]
+    if scheduled:
+        out.append(f"Estimated duration: **{max(it['end_day'] for it in items)} days** (★ = critical path)\n")
+    everyone = {t for it in items for t in it.get("roles", [])}
     for i, it in enumerate(items, 1):
-        out.append(f"{i}. **{it['stage']}** — Owner: {it['owner']}; ETA: {it['eta_days']} days")
+        line = f"{i}. **{it['stage']}** — Owner: {it['owner']}; ETA: {it['eta_days']} days"
+        if scheduled:
+            line += f"; Days {it['start_day']}–{it['end_day']}{' ★' if it['critical'] else ''}"
+        if len(everyone) > 1 and set(it.get("roles", [])) != everyone:
+            line += f"; Roles: {', '.join(it['roles'])}"
+        out.append(line)
     return "\n".join(out)
 
-def plan_builder_node(state: AgentState) -> AgentState:
+def plan_builder_node(state: AgentState) -> Dict:
     roles_payload = [{"title": r.title} for r in state.slots.roles]
     plan = build_checklist(roles_payload, state.slots.hiring_type)
-    state.artifacts.plan_json = plan
-    state.artifacts.plan_markdown = plan_to_markdown(plan)
-    state.analytics["checklist_items"] = len(plan)
-    return state
+    return {
+        "artifacts": Artifacts(plan_json=plan, plan_markdown=plan_to_markdown(plan)),
+        "analytics": {"checklist_items": len(plan)},
+    }
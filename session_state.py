@@ -0,0 +1,244 @@
+# session_state.py — bounded-memory holder for each UI session's current AgentState
+#
+# The Streamlit app used to keep the full AgentState per browser session, and
+# presenter's summary_md repeats every JD, the plan and the email a second time. Here a
+# session is held as one packed blob instead: the state as JSON with summary_md stored
+# as literal gaps plus references to the artifact fields it repeats, zlib-compressed.
+# Blobs are kept in an LRU capped at `max_bytes` per process; the least recently used
+# sessions spill to `spill_dir` and are read back (and re-admitted) on their next get().
+# Spill files are written after the lock is released. Spills older than `max_age`
+# (SKILLSCOUT_SESSION_SPILL_HOURS) or beyond `max_spilled` are dropped, and so are stray
+# files that earlier processes left behind. A dropped session just reads as missing:
+# callers reload it from the session store.
+# A session's cost is exactly its blob size, reported by usage() and stats().
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from state import AgentState
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+ROOT = Path(__file__).resolve().parent
+SPILL_DIR = Path(os.getenv("SKILLSCOUT_SESSION_SPILL_DIR", ROOT / "storage" / "session_spill"))
+MAX_BYTES = int(float(os.getenv("SKILLSCOUT_SESSION_MEMORY_MB", "64")) * 2**20)
+SPILL_MAX_AGE = float(os.getenv("SKILLSCOUT_SESSION_SPILL_HOURS", "24")) * 3600
+
+Segment = List  # ["t", literal text] or ["r", field path]
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _loads(raw: bytes):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def encode_summary(summary: str, pieces: List[Tuple[List[str], str]]) -> List[Segment]:
+    """Split `summary` into literal gaps and references to the given (path, text) pieces, in order."""
+    out: List[Segment] = []
+    pos = 0
+    for path, text in pieces:
+        if not text:
+            continue
+        at = summary.find(text, pos)
+        if at < 0:
+            continue  # piece not repeated (or out of order): it simply stays literal
+        if at > pos:
+            out.append(["t", summary[pos:at]])
+        out.append(["r", path])
+        pos = at + len(text)
+    if pos < len(summary):
+        out.append(["t", summary[pos:]])
+    return out
+
+def _lookup(doc: Dict, path: List[str]) -> str:
+    for k in path:
+        doc = doc[k]
+    return doc
+
+def decode_summary(doc: Dict, segments: List[Segment]) -> str:
+    return "".join(v if kind == "t" else _lookup(doc, v) for kind, v in segments)
+
+def pack(state: AgentState, level: int = 1) -> bytes:
+    doc = state.model_dump(mode="json")
+    art = doc["artifacts"]
+    # presenter's order: JDs, then the plan, then the email
+    pieces = [(["artifacts", "jds", title], md) for title, md in art["jds"].items()]
+    pieces += [(["artifacts", "plan_markdown"], art["plan_markdown"]),
+               (["artifacts", "email_draft"], art["email_draft"])]
+    art["summary_md"] = encode_summary(art["summary_md"], pieces)
+    return zlib.compress(_dumps(doc), level)
+
+def unpack(blob: bytes) -> AgentState:
+    doc = _loads(zlib.decompress(blob))
+    doc["artifacts"]["summary_md"] = decode_summary(doc, doc["artifacts"]["summary_md"])
+    return AgentState.model_validate(doc)
+
+class SessionStates:
+    def __init__(self, max_bytes: int = MAX_BYTES, spill_dir: Path = SPILL_DIR, level: int = 1,
+                 max_age: float = SPILL_MAX_AGE, max_spilled: int = 10000):
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir)
+        self.level = level
+        self.max_age = max_age
+        self.max_spilled = max_spilled
+        self._resident: "OrderedDict[str, bytes]" = OrderedDict()
+        # session_id -> (blob size, spilled at, file), oldest spill first
+        self._spilled: "OrderedDict[str, Tuple[int, float, Path]]" = OrderedDict()
+        self._writing: Dict[str, bytes] = {}  # evicted, file not written yet: still served from here
+        self._bytes = 0
+        self._files = 0
+        self._swept_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.counters = {"puts": 0, "hits": 0, "spills": 0, "loads": 0, "expired": 0, "spill_errors": 0}
+
+    def _admit(self, session_id: str, blob: bytes) -> List[Tuple[str, bytes]]:
+        """
+        Make `blob` the session's resident copy and evict LRU sessions over the cap (lock
+        held). Returns the evicted (session_id, blob) pairs for _spill() to write.
+        """
+        old = self._resident.pop(session_id, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._resident[session_id] = blob
+        self._bytes += len(blob)
+        evicted = []
+        while self._bytes > self.max_bytes and len(self._resident) > 1:
+            sid, victim = self._resident.popitem(last=False)
+            self._bytes -= len(victim)
+            self._writing[sid] = victim
+            evicted.append((sid, victim))
+        return evicted
+
+    def _spill(self, evicted: List[Tuple[str, bytes]]) -> None:
+        """Write evicted blobs to disk with the lock released, then record them as spilled."""
+        for sid, blob in evicted:
+            with self._lock:
+                self._files += 1
+                # one file per write, so a late writer never replaces or unlinks a newer spill
+                path = self.spill_dir / f"{sid}.{os.getpid()}.{self._files}.bin"
+            try:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(blob)
+                os.replace(tmp, path)
+                written = True
+            except OSError:
+                written = False  # dropped from this cache; the session store still has the state
+            with self._lock:
+                current = self._writing.get(sid) is blob
+                if current:
+                    del self._writing[sid]
+                    if written:
+                        self._spilled[sid] = (len(blob), time.time(), path)
+                        self.counters["spills"] += 1
+                    else:
+                        self.counters["spill_errors"] += 1
+            if written and not current:
+                path.unlink(missing_ok=True)  # re-admitted or discarded while it was being written
+        self._expire()
+
+    def _expire(self) -> None:
+        """Drop spills past max_age or beyond max_spilled, and (hourly) stray files of earlier runs."""
+        now = time.time()
+        dropped = []
+        with self._lock:
+            while self._spilled:
+                sid, (_, at, path) = next(iter(self._spilled.items()))
+                if len(self._spilled) <= self.max_spilled and now - at < self.max_age:
+                    break
+                del self._spilled[sid]
+                dropped.append(path)
+            self.counters["expired"] += len(dropped)
+            sweep = self._swept_at is None or now - self._swept_at >= min(self.max_age, 3600)
+            if sweep:
+                self._swept_at = now
+                ours = {path.name for _, _, path in self._spilled.values()}
+        for path in dropped:
+            path.unlink(missing_ok=True)
+        if sweep:
+            # a restarted process has no index of what the last one spilled: age it out
+            for path in self.spill_dir.glob("*.*"):
+                try:
+                    if path.name not in ours and now - path.stat().st_mtime >= self.max_age:
+                        path.unlink()
+                except OSError:
+                    pass
+
+    def put(self, state: AgentState) -> int:
+        """Store the session's current state; returns its packed size in bytes."""
+        blob = pack(state, self.level)
+        with self._lock:
+            self._writing.pop(state.session_id, None)
+            spilled = self._spilled.pop(state.session_id, None)
+            evicted = self._admit(state.session_id, blob)
+            self.counters["puts"] += 1
+        if spilled is not None:
+            spilled[2].unlink(missing_ok=True)
+        if evicted:
+            self._spill(evicted)
+        return len(blob)
+
+    def get(self, session_id: str) -> Optional[AgentState]:
+        with self._lock:
+            blob = self._resident.get(session_id)
+            if blob is not None:
+                self._resident.move_to_end(session_id)
+                self.counters["hits"] += 1
+                return unpack(blob)
+            blob = self._writing.pop(session_id, None)  # its spill, if still in flight, is dropped
+            spilled = self._spilled.pop(session_id, None) if blob is None else None
+        if blob is None:
+            if spilled is None:
+                return None
+            try:
+                blob = spilled[2].read_bytes()
+            except OSError:
+                return None
+            spilled[2].unlink(missing_ok=True)
+        with self._lock:
+            evicted = self._admit(session_id, blob)
+            self.counters["loads"] += 1
+        if evicted:
+            self._spill(evicted)
+        return unpack(blob)
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            blob = self._resident.pop(session_id, None)
+            if blob is not None:
+                self._bytes -= len(blob)
+            self._writing.pop(session_id, None)
+            spilled = self._spilled.pop(session_id, None)
+        if spilled is not None:
+            spilled[2].unlink(missing_ok=True)
+
+    def usage(self, session_id: str) -> Dict:
+        """Bytes the session's state takes and where it lives ('memory', 'disk' or None)."""
+        with self._lock:
+            blob = self._resident.get(session_id)
+            if blob is not None:
+                return {"bytes": len(blob), "where": "memory"}
+            if session_id in self._writing:
+                return {"bytes": len(self._writing[session_id]), "where": "disk"}
+            if session_id in self._spilled:
+                return {"bytes": self._spilled[session_id][0], "where": "disk"}
+        return {"bytes": 0, "where": None}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"resident_sessions": len(self._resident), "resident_bytes": self._bytes,
+                    "spilled_sessions": len(self._spilled) + len(self._writing),
+                    "spilled_bytes": sum(v[0] for v in self._spilled.values()) + sum(map(len, self._writing.values())),
+                    "max_bytes": self.max_bytes, **self.counters}
+
+SESSIONS = SessionStates()
@@ -1,6 +1,6 @@
 # state.py
 from __future__ import annotations
-from typing import List, Optional, Dict
+from typing import Annotated, Any, List, Optional, Dict
 from pydantic import BaseModel, Field
 
 class RoleSpec(BaseModel):
@@ -24,9 +24,25 @@ class Artifacts(BaseModel):
     email_draft: Optional[str] = None
     summary_md: str = ""
 
+# ---- graph reducers: parallel nodes return partial updates that are merged here ----
+def merge_artifacts(left: Optional[Artifacts], right: Any) -> Artifacts:
+    """Overlay the fields a node explicitly set (e.g. Artifacts(jds=...)) onto the current artifacts."""
+    if left is None:
+        left = Artifacts()
+    if right is None:
+        return left
+    if not isinstance(right, Artifacts):
+        right = Artifacts.model_validate(right)
+    return left.model_copy(update={f: getattr(right, f) for f in right.model_fields_set})
+
+def merge_dict(left: Optional[Dict], right: Optional[Dict]) -> Dict:
+    return {**(left or {}), **(right or {})}
+
 class AgentState(BaseModel):
     session_id: str
     user_query: str
     slots: Slots = Field(default_factory=Slots)
-    artifacts: Artifacts = Field(default_factory=Artifacts)
-    analytics: Dict[str, int] = Field(default_factory=lambda: {"roles_created": 0, "checklist_items": 0, "sessions": 1})
+    artifacts: Annotated[Artifacts, merge_artifacts] = Field(default_factory=Artifacts)
+    analytics: Annotated[Dict[str, int], merge_dict] = Field(default_factory=lambda: {"roles_created": 0, "checklist_items": 0, "sessions": 1})
+    market: Dict[str, Any] = Field(default_factory=dict)  # tools.search_tool suggestions: budget, skills, based_on
+    node_inputs: Annotated[Dict[str, str], merge_dict] = Field(default_factory=dict)  # node name -> fingerprint of the slots it last ran on
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+
+import api
+from memory import SessionStore
+from tools.mailer import Mailer, Outbox, SMTPSettings
+
+def call(method, path, body=None, token=None):
+    """Drive the ASGI app in-process; returns (status, [decoded body parts])."""
+    raw = json.dumps(body).encode() if body is not None else b""
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": raw, "more_body": False}
+
+    async def send(msg):
+        sent.append(msg)
+
+    asyncio.run(api.app({"type": "http", "method": method, "path": path, "headers": headers}, receive, send))
+    status = sent[0]["status"]
+    data = b"".join(m.get("body", b"") for m in sent[1:])
+    if sent[0]["headers"][0][1] == b"application/x-ndjson":
+        return status, [json.loads(l) for l in data.decode().splitlines()]
+    return status, json.loads(data)
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(api, "STORE", SessionStore(tmp_path / "sessions.db"))
+    monkeypatch.setattr(api, "MAILER", Mailer(Outbox(tmp_path / "outbox.db"), SMTPSettings(), domains=["example.com"]))
+    monkeypatch.setattr(api, "API_TOKEN", "s3cret")
+
+def test_intake_clarify_generate_flow():
+    status, out = call("POST", "/intake", {"user_query": "need a founding engineer, remote"})
+    assert status == 200 and out["state"]["slots"]["location"] == "Remote"
+    assert "What’s your budget range?" in out["questions"]
+    sid = out["state"]["session_id"]
+
+    status, out = call("POST", "/clarify", {"session_id": sid, "answers": {"budget": "$150k", "timeline": "6 weeks",
+                                                                           "hiring_type": "Full-time"}})
+    assert status == 200 and out["questions"] == []
+
+    status, lines = call("POST", "/generate", {"session_id": sid})
+    assert status == 200
+    nodes = [l["node"] for l in lines if "node" in l]
+    assert nodes[0] == "intake" and nodes[-1] == "presenter"
+    assert set(nodes) >= {"jd_generator", "plan_builder", "email_writer"}
+    final = lines[-1]
+    assert final["done"] and "$150k" in final["state"]["artifacts"]["jds"]["Founding Engineer"]
+
+    email = {"session_id": sid, "to": "lead@example.com, hr@example.com"}
+    assert call("POST", "/email", email)[0] == 401 and call("POST", "/email", email, token="nope")[0] == 401
+    status, out = call("POST", "/email", email, token="s3cret")
+    assert status == 200 and out["status"] == "queued" and out["sending"] is False
+    assert api.MAILER.outbox.counts(sid)["queued"] == 1
+    # not a relay: no caller-supplied drafts or states, and only allowed domains
+    assert call("POST", "/email", {**email, "state": final["state"]}, token="s3cret")[0] == 400
+    assert call("POST", "/email", {"session_id": sid, "to": "x@evil.test"}, token="s3cret")[0] == 400
+    assert call("POST", "/email", {"session_id": sid, "to": "a@example.com\r\nBcc: x@evil.test"},
+                token="s3cret")[0] == 400
+    assert api.MAILER.outbox.counts(sid)["queued"] == 1
+
+def test_posted_state_cannot_overwrite_a_session():
+    status, out = call("POST", "/intake", {"user_query": "need a founding engineer, remote"})
+    sid = out["state"]["session_id"]
+    forged = {**out["state"], "artifacts": {"email_draft": "Subject: Wire money\n\nnow"}}
+    status, lines = call("POST", "/generate", {"state": forged})
+    assert status == 200 and lines[-1]["state"]["session_id"] != sid
+    assert "Wire money" not in lines[-1]["state"]["artifacts"]["email_draft"]
+    status, out = call("POST", "/clarify", {"state": forged, "answers": {"budget": "$1"}})
+    assert out["state"]["session_id"] != sid
+    assert call("POST", "/intake", {"session_id": sid, "user_query": "need an ai intern"})[0] == 409
+    assert api.STORE.load(sid).artifacts.email_draft in (None, "")
+    assert api.STORE.load(sid).slots.budget is None
+
+def test_email_disabled_without_a_token(monkeypatch):
+    monkeypatch.setattr(api, "API_TOKEN", "")
+    assert call("POST", "/email", {"session_id": "s", "to": "a@example.com"}, token="anything")[0] == 403
+
+def test_errors():
+    assert call("POST", "/generate", {})[0] == 400
+    assert call("POST", "/clarify", {"session_id": "nope"})[0] == 404
+    assert call("GET", "/missing")[0] == 404
+    assert call("POST", "/clarify", {"user_query": "need a founding engineer", "answers": ["budget"]})[0] == 400
+    assert call("POST", "/clarify", {"user_query": "need a founding engineer", "answers": {"skills": 5}})[0] == 400
+    assert call("POST", "/clarify", {"user_query": "need a founding engineer", "answers": {"skills": [1]}})[0] == 400
+    assert call("POST", "/email", {"user_query": "need a founding engineer", "to": "a@example.com"},
+                token="s3cret")[0] == 400
+    status, out = call("POST", "/intake", {"user_query": "need a founding engineer"})
+    no_draft = {"session_id": out["state"]["session_id"], "to": "a@example.com"}
+    assert call("POST", "/email", no_draft, token="s3cret")[0] == 409
+    assert call("POST", "/email", {"session_id": "nope", "to": "a@example.com"}, token="s3cret")[0] == 404
+    assert call("GET", "/healthz") == (200, {"ok": True})
@@ -0,0 +1,45 @@
+from tools.artifact_cache import ArtifactCache, cached
+
+def test_memory_and_disk_tiers(tmp_path):
+    db = str(tmp_path / "artifacts.db")
+    cache = ArtifactCache(max_entries=2, db_path=db)
+    calls = []
+
+    @cached("plan", cache=cache)
+    def plan(roles, hiring_type):
+        calls.append(1)
+        return [{"stage": f"{r['title']} {hiring_type}"} for r in roles]
+
+    first = plan([{"title": "ML Engineer"}], "contract")
+    again = plan([{"title": "ML Engineer"}], "contract")
+    assert again == first and again is not first and len(calls) == 1
+    first[0]["stage"] = "mutated"
+    assert plan([{"title": "ML Engineer"}], "contract")[0]["stage"] == "ML Engineer contract"
+
+    assert plan(roles=[{"title": "ML Engineer"}], hiring_type="contract") == again and len(calls) == 1
+
+    @cached("email", cache=cache)
+    def email(title, sign_off="Thanks"):
+        return f"{title} {sign_off}"
+
+    email("A")
+    email("B", sign_off="Thanks")  # evicts the oldest memory entry, a plan
+    assert cache.snapshot()["plan"]["evictions"] == 1 and cache.snapshot()["email"]["evictions"] == 0
+    email(title="A", sign_off="Thanks")
+    assert cache.snapshot()["email"]["hits"] == 1
+
+    restarted = ArtifactCache(db_path=db)
+    hit, value = restarted.get("plan", next(iter(cache._mem)))
+    assert hit and value
+
+def test_ttl_expiry():
+    cache = ArtifactCache(ttl=0)
+    cache.put("email", "k", "draft")
+    cache._mem["k"] = ('"draft"', 0.0, "email")  # stored long ago
+    assert cache.get("email", "k") == (False, None)
+    assert cache.snapshot()["email"]["misses"] == 1
+
+def test_format_version_separates_entries():
+    cache = ArtifactCache()
+    cached("email", version=1, cache=cache)(lambda t: "v1 " + t)("x")
+    assert cached("email", version=2, cache=cache)(lambda t: "v2 " + t)("x") == "v2 x"
@@ -0,0 +1,41 @@
+import json
+from batch import run_batch
+
+def _write_requests(path, n):
+    with path.open("w") as f:
+        for i in range(n):
+            f.write(json.dumps({"request_id": f"r{i}", "user_query": "need a founding engineer, remote, $150k"}) + "\n")
+
+def test_batch_writes_results_and_resumes(tmp_path):
+    src, dst = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_requests(src, 3)
+    with src.open("a") as f:  # a repeated id is run once
+        f.write(json.dumps({"request_id": "r2", "user_query": "need a founding engineer"}) + "\n")
+    # simulate a crash: one finished row, one failed row, plus a torn partial line
+    dst.write_text(json.dumps({"request_id": "r0", "jds": {}}) + "\n"
+                   + json.dumps({"request_id": "r2", "error": "boom"}) + "\n" + '{"request_id": "r1", "jd')
+
+    stats = run_batch(src, dst)
+    assert stats == {"written": 2, "skipped": 2, "errors": 0}
+    rows = [json.loads(l) for l in dst.read_text().splitlines()]
+    assert [r["request_id"] for r in rows] == ["r0", "r2", "r1", "r2"]
+    assert "Founding Engineer" in rows[2]["jds"] and rows[2]["plan"] and rows[2]["email"]
+
+def test_batch_process_pool(tmp_path):
+    src, dst = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_requests(src, 5)
+    stats = run_batch(src, dst, workers=2)
+    assert stats["written"] == 5
+    assert sorted(json.loads(l)["request_id"] for l in dst.read_text().splitlines()) == [f"r{i}" for i in range(5)]
+
+def test_batch_queues_emails(tmp_path):
+    from tools.mailer import Mailer, Outbox, SMTPSettings
+
+    src, dst = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_requests(src, 3)
+    mailer = Mailer(Outbox(tmp_path / "outbox.db"), SMTPSettings())
+    stats = run_batch(src, dst, email_to=["lead@example.com"], mailer=mailer)
+    assert stats["emailed"] == 3 and mailer.outbox.counts()["queued"] == 3
+    dst.unlink()  # a full re-run queues nothing new
+    run_batch(src, dst, email_to=["lead@example.com"], mailer=mailer)
+    assert mailer.outbox.counts()["queued"] == 3
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from benchmarks import suite
+
+def test_every_case_runs(tmp_path):
+    results = suite.run(min_time=0.001, repeat=1)
+    names = {name.split("[")[0] for name in results}
+    assert names == {"intake.detect_roles", "intake.extract_slots", "jd._compose_jd", "checklist.build_checklist",
+                     "email.kickoff_email", "presenter_node", "graph.invoke"}
+    assert all(ops > 0 for ops in results.values())
+
+    path = tmp_path / "baselines.json"
+    suite.save_baselines(results, path)
+    slower = {name: ops * 0.5 for name, ops in suite.load_baselines(path).items()}
+    assert suite.compare(slower, suite.load_baselines(path)) == sorted(slower)
+
+@pytest.mark.skipif(os.getenv("SKILLSCOUT_BENCH") != "1", reason="timing-sensitive; set SKILLSCOUT_BENCH=1")
+def test_no_throughput_regression():
+    baselines = suite.load_baselines()
+    results = suite.run(baselines=baselines)
+    assert suite.compare(results, baselines) == []
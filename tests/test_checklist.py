@@ -0,0 +1,43 @@
+import pytest
+
+from nodes.plan_builder import plan_to_markdown
+from tools.checklist_tool import _owners, build_checklist
+
+plan_for = build_checklist.__wrapped__  # bypass the artifact cache
+
+def test_every_role_gets_its_track_and_shared_stages_merge():
+    plan = plan_for([{"title": "Founding Engineer"}, {"title": "Genai Intern"}], None)
+    stages = [it["stage"] for it in plan]
+    assert len(stages) == len(set(stages))
+    assert any("founder-level job description" in s for s in stages)
+    assert any("campus channels" in s for s in stages)
+    dei = next(it for it in plan if "DEI check" in it["stage"])
+    assert dei["roles"] == ["Founding Engineer", "Genai Intern"]
+
+    single = plan_for([{"title": "Founding Engineer"}], None)
+    assert len(single) == 14 and all(it["roles"] == ["Founding Engineer"] for it in single)
+
+def test_schedule_respects_order_and_owner_capacity():
+    roles = [{"title": t} for t in ("Founding Engineer", "Genai Intern", "Ml Engineer", "Staff Engineer")]
+    plan = plan_for(roles, None, owner_capacity=1)
+    by_stage = {it["stage"]: it for it in plan}
+    jd = by_stage["Draft and approve the job description and candidate profile."]
+    dei = next(it for it in plan if "DEI check" in it["stage"])
+    assert jd["roles"] == ["Ml Engineer", "Staff Engineer"] and dei["start_day"] >= jd["end_day"]
+    for day in range(max(it["end_day"] for it in plan)):
+        active = [it for it in plan if it["start_day"] <= day < it["end_day"]]
+        owners = [o for it in active for o in _owners(it["owner"])]
+        assert len(owners) == len(set(owners)), day
+    assert plan[-1]["stage"].startswith("Collect post-hire feedback") and plan[-1]["critical"]
+    assert "★" in plan_to_markdown(plan) and "Roles: Genai Intern" in plan_to_markdown(plan)
+
+def test_dozens_of_roles_share_stages():
+    roles = [{"title": f"{kind} {i}"} for i in range(20) for kind in ("Backend Engineer", "Data Intern", "Staff Engineer")]
+    plan = plan_for(roles, "full-time")
+    assert len(plan) < 30
+    assert len(next(it for it in plan if "DEI check" in it["stage"])["roles"]) == 60
+
+def test_owner_capacity_must_be_positive():
+    for bad in (0, -1):
+        with pytest.raises(ValueError, match="owner_capacity"):
+            plan_for([{"title": "Founding Engineer"}], None, owner_capacity=bad)
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from export import TABLES, BulkExport, ExportCache, eta_by_owner, export_sessions
+from graph import build_graph, graph_input
+from memory import SessionStore
+from state import AgentState, Slots
+
+def test_graph_takes_the_model_without_a_round_trip():
+    state = AgentState(session_id="ex1", user_query="need a founding engineer, remote")
+    out = AgentState.model_construct(**build_graph(tracer=None).invoke(graph_input(state)))
+    assert out.slots is not state.slots and state.slots == Slots()  # the caller's model is untouched
+    assert not state.artifacts.summary_md
+    assert out.slots.location == "Remote" and out.artifacts.jds and out.artifacts.summary_md
+    assert AgentState.model_validate(out.model_dump()) == out
+
+def test_export_cached_per_version():
+    state = AgentState(session_id="ex2", user_query="need a devops engineer")
+    cache = ExportCache(max_entries=2)
+    first = cache.session_json(state, 1)
+    assert json.loads(first) == json.loads(state.model_dump_json())
+    assert cache.session_json(state, 1) is first
+    state.slots.budget = "$100k"
+    assert json.loads(cache.session_json(state, 2))["slots"]["budget"] == "$100k"
+    assert cache.stats == {"hits": 1, "misses": 2}
+
+def _store_with_sessions(tmp_path, n=3):
+    store = SessionStore(tmp_path / "sessions.db")
+    app = build_graph(tracer=None)
+    prompts = ["need a founding engineer, remote, $150k", "need a genai intern and a devops engineer", "ml engineer"]
+    for i in range(n):
+        state = AgentState(session_id=f"s{i}", user_query=prompts[i % len(prompts)])
+        store.save(AgentState.model_construct(**app.invoke(state)))
+    return store
+
+def test_bulk_export_streams_every_session(tmp_path):
+    store = _store_with_sessions(tmp_path)
+    counts = export_sessions(store.iter_states(page=2), tmp_path / "out", batch_rows=4)
+    lines = {t: (tmp_path / "out" / f"{t}.ndjson").read_text().splitlines() for t in TABLES}
+    assert counts == {t: len(v) for t, v in lines.items()} and counts["sessions"] == 3
+    plans = [json.loads(l) for l in lines["plans"]]
+    assert list(plans[0]) == list(TABLES["plans"]) and ": " not in lines["plans"][0]  # compact rows
+    assert counts["jds"] == 4 and not list((tmp_path / "out").glob("*.tmp"))
+
+    summary = {r["owner"]: r for r in eta_by_owner(tmp_path / "out" / "plans.ndjson")}
+    expected = {}
+    for p in plans:
+        expected[p["owner"]] = expected.get(p["owner"], 0) + p["eta_days"]
+    assert {o: r["eta_days_total"] for o, r in summary.items()} == expected
+    assert all(1 <= r["sessions"] <= 3 and r["eta_days_median"] <= r["eta_days_max"] for r in summary.values())
+
+def test_bulk_export_runs_in_the_background(tmp_path):
+    store = _store_with_sessions(tmp_path, n=2)
+    job = BulkExport()
+    assert job.start(store.iter_states, tmp_path / "out")
+    done = job.wait(30)
+    assert done["state"] == "done" and done["counts"]["sessions"] == 2 and done["owners"]
+    assert not list((tmp_path / "out").glob("*.tmp"))
+
+    def broken():
+        raise OSError("disk gone")
+    assert job.start(broken, tmp_path / "out") and job.wait(30)["error"] == "OSError: disk gone"
+
+def test_bulk_export_parquet_matches_ndjson(tmp_path):
+    pytest.importorskip("pyarrow")
+    store = _store_with_sessions(tmp_path)
+    export_sessions(store.iter_states(), tmp_path / "nd")
+    export_sessions(store.iter_states(), tmp_path / "pq", fmt="parquet")
+    assert eta_by_owner(tmp_path / "pq" / "plans.parquet") == eta_by_owner(tmp_path / "nd" / "plans.ndjson")
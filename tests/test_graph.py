@@ -6,3 +6,69 @@ def test_graph_runs():
     state = AgentState(session_id="t1", user_query="I need a founding engineer and a GenAI intern")
     out = g.invoke(state.model_dump())
     assert "artifacts" in out
+
+def test_graph_compiled_once():
+    from concurrent.futures import ThreadPoolExecutor
+    from graph import get_graph, graph_stats, clear_graph_cache
+    clear_graph_cache()
+    before = graph_stats()
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        graphs = list(ex.map(lambda _: get_graph(), range(16)))
+    after = graph_stats()
+    assert all(g is graphs[0] for g in graphs)
+    assert after["compiles"] - before["compiles"] == 1
+    assert after["hits"] - before["hits"] == 15
+
+def test_incremental_rerun_skips_unchanged_nodes(monkeypatch):
+    import nodes.plan_builder as pb
+    import nodes.email_writer as ew
+    from graph import build_graph
+    calls = {"plan": 0, "email": 0}
+    real_plan, real_email = pb.build_checklist, ew.kickoff_email
+
+    def plan(*a):
+        calls["plan"] += 1
+        return real_plan(*a)
+
+    def email(*a):
+        calls["email"] += 1
+        return real_email(*a)
+
+    monkeypatch.setattr(pb, "build_checklist", plan)
+    monkeypatch.setattr(ew, "kickoff_email", email)
+    g = build_graph(incremental_mode=True)
+    first = AgentState.model_validate(g.invoke(AgentState(session_id="t2", user_query="need a founding engineer").model_dump()))
+    assert calls == {"plan": 1, "email": 1}
+
+    first.slots.location = "Remote"  # read only by jd_generator
+    second = AgentState.model_validate(g.invoke(first.model_dump()))
+    assert calls == {"plan": 1, "email": 1}
+    assert second.artifacts.plan_json == first.artifacts.plan_json
+    assert "Remote" in second.artifacts.jds["Founding Engineer"]
+
+    second.slots.budget = "$150k"  # email_writer input changed
+    g.invoke(second.model_dump())
+    assert calls == {"plan": 1, "email": 2}
+
+def test_incremental_rerun_follows_catalogue_changes(monkeypatch, tmp_path):
+    import nodes.jd_generator as jd
+    from tools.role_catalog import RoleCatalog
+    yml = tmp_path / "roles.yml"
+    yml.write_text('Founding Engineer:\n  summary: "Ship the first version."\n', encoding="utf-8")
+    monkeypatch.setattr(jd, "CATALOG", RoleCatalog(yml, cache_dir=tmp_path / "cache", check_interval=0))
+    g = build_graph(incremental_mode=True, tracer=None)
+    first = AgentState.model_validate(g.invoke(AgentState(session_id="t4", user_query="need a founding engineer").model_dump()))
+    assert "Ship the first version." in first.artifacts.jds["Founding Engineer"]
+
+    yml.write_text('Founding Engineer:\n  summary: "Own the platform from day one."\n', encoding="utf-8")  # slots unchanged
+    second = AgentState.model_validate(g.invoke(first.model_dump()))
+    assert "Own the platform from day one." in second.artifacts.jds["Founding Engineer"]
+
+def test_jds_stream_before_jd_generator_finishes():
+    g = build_graph(tracer=None)
+    state = AgentState(session_id="t3", user_query="need a founding engineer, a genai intern and devops")
+    events = list(g.stream(state, stream_mode=["custom", "updates"]))
+    streamed = [title for mode, chunk in events if mode == "custom" for title in chunk["jd"]]
+    done = next(i for i, (mode, chunk) in enumerate(events) if mode == "updates" and "jd_generator" in chunk)
+    assert sorted(streamed) == ["Devops/Sre", "Founding Engineer", "Genai Intern"]
+    assert all(i < done for i, (mode, _) in enumerate(events) if mode == "custom")
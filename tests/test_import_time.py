@@ -0,0 +1,24 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# Entry points must not pull these in at import time; they load on first real use.
+HEAVY = ("langgraph", "langchain_core", "langsmith", "requests", "yaml", "streamlit", "pyarrow", "numpy")
+BUDGET_MS = float(os.getenv("SKILLSCOUT_IMPORT_BUDGET_MS", "1000"))
+
+CODE = f"""
+import json, sys, time
+t0 = time.perf_counter()
+import api, batch, graph, memory, export, tracing
+import nodes.jd_generator, nodes.intake, nodes.plan_builder, nodes.email_writer, nodes.presenter
+print(json.dumps({{"ms": (time.perf_counter() - t0) * 1000, "heavy": [m for m in {HEAVY!r} if m in sys.modules]}}))
+"""
+
+def test_entry_points_import_within_budget():
+    out = subprocess.run([sys.executable, "-c", CODE], cwd=ROOT, capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert result["heavy"] == []
+    assert result["ms"] < BUDGET_MS, f"cold import took {result['ms']:.0f} ms (budget {BUDGET_MS:.0f} ms)"
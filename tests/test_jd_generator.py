@@ -0,0 +1,4 @@
+from benchmarks.bench_jd import check_identical
+
+def test_compiled_jd_matches_reference_renderer():
+    assert check_identical() > 0
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from tools.artifact_cache import ArtifactCache
+from tools.llm_cache import CachedLLM, SingleFlight
+
+class SlowLLM:
+    model = "stub"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt):
+        self.calls += 1
+        time.sleep(0.1)
+        return f"completion #{self.calls}"
+
+def test_cache_and_single_flight(tmp_path):
+    llm = SlowLLM()
+    cached = CachedLLM(llm, cache=ArtifactCache(db_path=str(tmp_path / "llm.db")))
+    variables = {"role": "ML Engineer", "draft": "..."}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cached.complete("jd", variables))) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["completion #1"] * 6 and llm.calls == 1
+    assert cached.flight.stats["followers"] == 5
+
+    assert cached.complete("jd", variables) == "completion #1"
+    assert cached.complete("email", variables) == "completion #2"  # different template
+    assert cached.complete("jd", {"role": "Data Engineer"}) == "completion #3"
+
+    restarted = CachedLLM(llm, cache=ArtifactCache(db_path=str(tmp_path / "llm.db")))
+    assert restarted.complete("jd", variables) == "completion #1" and llm.calls == 3
+
+def test_single_flight_rechecks_before_leading():
+    flight, calls = SingleFlight(), []
+    # the caller missed the cache, but the previous leader stored its result and left meanwhile
+    assert flight.do("k", lambda: calls.append(1) or "rerun", check=lambda: (True, "stored")) == "stored"
+    assert not calls and flight.stats == {"leaders": 0, "followers": 0, "late_hits": 1}
@@ -0,0 +1,138 @@
+import sqlite3
+import time
+
+import pytest
+
+from benchmarks.bench_mailer import LocalSMTP
+from tools.mailer import DEAD, SENT, Mailer, Outbox, SMTPSettings, split_draft
+
+DRAFT = "Subject: Kickoff – Founding Engineer\n\nHi team,\nLet's kick off hiring."
+
+@pytest.fixture
+def server():
+    with LocalSMTP() as s:
+        yield s
+
+def make(tmp_path, server=None, **kw):
+    settings = server.settings() if server else SMTPSettings()
+    kw.setdefault("backoff", 0.01)
+    return Mailer(Outbox(tmp_path / "outbox.db"), settings, **kw)
+
+def test_split_draft():
+    assert split_draft(DRAFT) == ("Kickoff – Founding Engineer", "Hi team,\nLet's kick off hiring.")
+    assert split_draft("no subject") == ("Hiring kickoff", "no subject")
+
+def test_delivers_once_per_draft(tmp_path, server):
+    m = make(tmp_path, server)
+    mid = m.send_draft("s1", ["a@example.com", "b@example.com"], DRAFT)
+    assert m.send_draft("s1", ["b@example.com", "a@example.com", ""], DRAFT) == mid  # idempotent
+    assert m.flush(5)
+    m.stop()
+    assert m.outbox.status(mid)["status"] == SENT
+    [(sender, rcpts, data)] = server.messages
+    assert sender == "hr-agent@example.com" and rcpts == ["a@example.com", "b@example.com"]
+    assert b"X-SkillScout-Session: s1" in data
+    with pytest.raises(ValueError):
+        m.send_draft("s1", [" "], DRAFT)
+
+def test_pools_connection_and_retries(tmp_path, server):
+    m = make(tmp_path, server, workers=1)
+    server.fail_next(2, 451)  # transient: retried with backoff
+    ids = [m.send_draft(f"s{i}", ["team@example.com"], DRAFT) for i in range(20)]
+    deadline = time.monotonic() + 10
+    while m.outbox.counts()[SENT] < 20 and time.monotonic() < deadline:
+        m.flush(1)
+    m.stop()
+    assert m.outbox.counts() == {"queued": 0, "sending": 0, "sent": 20, "dead": 0}
+    assert len(server.messages) == 20 and server.connections == 1
+    assert m.stats["retried"] == 2 and max(m.outbox.status(i)["attempts"] for i in ids) == 2
+
+def test_permanent_failures_and_dropped_connections(tmp_path, server):
+    m = make(tmp_path, server, workers=1, max_attempts=2)
+    server.reject.add("nobody@example.com")
+    bad = m.send_draft("s1", ["nobody@example.com"], DRAFT)
+    m.flush(5)
+    assert m.outbox.status(bad)["status"] == DEAD and "nobody@example.com" in m.outbox.status(bad)["last_error"]
+
+    def settled(mid):
+        deadline = time.monotonic() + 10
+        while m.outbox.status(mid)["status"] not in (SENT, DEAD) and time.monotonic() < deadline:
+            m.flush(1)
+        return m.outbox.status(mid)
+
+    server.drop_next(1)  # connection lost mid-send: reconnect and resend
+    assert settled(m.send_draft("s2", ["team@example.com"], DRAFT))["status"] == SENT
+    assert server.connections == 2
+    server.fail_next(2, 452)  # keeps failing: dead after max_attempts
+    assert settled(m.send_draft("s3", ["team@example.com"], DRAFT)) == {
+        "status": DEAD, "attempts": 2, "last_error": "452 b'injected failure'", "sent_at": None}
+    m.stop()
+
+def test_outbox_survives_restart(tmp_path, server):
+    offline = make(tmp_path)  # no SMTP host: queued only
+    mid = offline.send_draft("s1", ["team@example.com"], DRAFT)
+    assert not offline.enabled and offline.outbox.counts()["queued"] == 1
+    offline.outbox.close()
+
+    # a worker that crashed mid-send leaves its lease behind; it is picked up once it expires
+    crashed = Outbox(tmp_path / "outbox.db")
+    assert [msg.id for msg in crashed.claim(10, lease=0.05)] == [mid]
+    crashed.close()
+    time.sleep(0.06)
+
+    m = make(tmp_path, server)
+    m.start()
+    assert m.flush(5)
+    m.stop()
+    assert m.outbox.status(mid)["status"] == SENT and len(server.messages) == 1
+
+def test_rejects_header_injection_and_foreign_domains(tmp_path):
+    m = make(tmp_path, domains=["example.com"])
+    for bad in ["a@example.com\r\nBcc: x@evil.test", "not an address", "a@@example.com", "a@"]:
+        with pytest.raises(ValueError):
+            m.send_draft("s1", [bad], DRAFT)
+    with pytest.raises(ValueError, match="allowed domains"):
+        m.send_draft("s1", ["lead@example.com", "x@evil.test"], DRAFT)
+    mid = m.send_draft("s1", ["Lead <Lead@Example.com>"], DRAFT)
+    assert m.outbox.status(mid)["status"] == "queued" and m.outbox.counts()["queued"] == 1
+
+def test_worker_survives_bad_rows_and_outbox_errors(tmp_path, server):
+    m = make(tmp_path, server, workers=1)
+    bad = m.outbox.enqueue("s1", ["team@example.com"], "Kickoff", "hi")
+    with m.outbox._lock:  # a row written before addresses were validated
+        m.outbox._conn().execute("UPDATE outbox SET recipients=? WHERE id=?",
+                                 ('["a@example.com\\r\\nBcc: x@evil.test"]', bad))
+    claim, calls = m.outbox.claim, []
+
+    def flaky(*args):
+        calls.append(1)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return claim(*args)
+    m.outbox.claim = flaky
+    good = m.send_draft("s2", ["team@example.com"], DRAFT)
+    assert m.flush(10)
+    assert m.outbox.status(bad)["status"] == DEAD and "build" in m.outbox.status(bad)["last_error"]
+    assert m.outbox.status(good)["status"] == SENT and m.stats["errors"] == 1
+    [worker] = m._threads
+    assert worker.is_alive()
+    m.stop()
+    m._threads = [worker]  # a dead worker left in the list is replaced on the next start()
+    m.start()
+    assert len(m._threads) == 1 and m._threads[0] is not worker and m._threads[0].is_alive()
+    m.stop()
+
+def test_failed_statement_rolls_back(tmp_path):
+    outbox = Outbox(tmp_path / "outbox.db")
+    mid = outbox.enqueue("s1", ["team@example.com"], "Kickoff", "hi")
+    db = outbox._conn()
+    db.execute("CREATE TEMP TRIGGER boom BEFORE UPDATE ON outbox BEGIN SELECT RAISE(ABORT, 'boom'); END")
+    with pytest.raises(sqlite3.DatabaseError):
+        outbox.claim(10, lease=30)
+    with pytest.raises(sqlite3.DatabaseError):
+        outbox.settle([mid], [], [])
+    assert not db.in_transaction
+    db.execute("DROP TRIGGER boom")
+    assert [m.id for m in outbox.claim(10, lease=30)] == [mid]  # the connection is still usable
+    outbox.settle([mid], [], [])
+    assert outbox.status(mid)["status"] == SENT
@@ -0,0 +1,57 @@
+from memory import SessionStore
+from state import AgentState
+
+def test_deltas_resume_and_compaction(tmp_path):
+    db = tmp_path / "sessions.db"
+    store = SessionStore(db, compact_every=3)
+    state = AgentState(session_id="s1", user_query="need a founding engineer")
+    assert store.save(state) == 0
+
+    state.slots.budget = "$150k"
+    state.artifacts.jds = {"Founding Engineer": "draft 1", "GenAI Intern": "draft 2"}
+    assert store.save(state) == 1
+    state.artifacts.jds["Founding Engineer"] = "draft 1b"
+    assert store.save(state) == 2
+    assert store.save(state) == 2  # unchanged: nothing appended
+
+    conn = store._conn()
+    deltas = [d for (d,) in conn.execute("SELECT delta FROM deltas WHERE session_id='s1' ORDER BY seq")]
+    assert len(deltas) == 2 and "need a founding engineer" not in deltas[1]
+
+    reopened = SessionStore(db)
+    resumed = reopened.load("s1")
+    assert resumed == state
+    assert list(resumed.artifacts.jds) == ["Founding Engineer", "GenAI Intern"]
+    assert reopened.list_sessions()[0]["session_id"] == "s1"
+
+    state.artifacts.jds = {}
+    store.save(state)  # third pending delta triggers compaction
+    assert conn.execute("SELECT COUNT(*) FROM deltas").fetchone()[0] == 0
+    assert SessionStore(db).load("s1") == state
+    assert store.load("missing") is None
+
+def test_writers_sharing_one_database(tmp_path, monkeypatch):
+    import pytest
+    import memory
+
+    db = tmp_path / "sessions.db"
+    a, b = SessionStore(db), SessionStore(db)  # e.g. an API worker and the Streamlit app
+    state = AgentState(session_id="s1", user_query="need a founding engineer")
+    a.save(state)
+    other = b.load("s1")
+    other.artifacts.jds = {"Founding Engineer": "from b"}
+    assert b.save(other) == 1
+    state.slots.budget = "$150k"  # a's cached base predates b's save: it must not keep b's jds
+    assert a.save(state) == 2
+    assert SessionStore(db).load("s1") == state
+
+    def boom(*args):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(memory, "diff", boom)
+    state.slots.timeline = "6 weeks"
+    with pytest.raises(RuntimeError):
+        a.save(state)
+    assert not a._conn().in_transaction  # rolled back, the next writer isn't blocked
+    monkeypatch.undo()
+    assert b.save(state) == 3 and a.load("s1") == state
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tools.ollama_llm import LLMError, LocalLLM
+
+class StubOllama(BaseHTTPRequestHandler):
+    """Imitates Ollama's /api/generate: echoes the prompt word by word."""
+    protocol_version = "HTTP/1.1"
+    fail_next = 0
+    fail_status = 503
+    delay = 0.0
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls = type(self)
+        with cls.lock:
+            if cls.fail_next:
+                cls.fail_next -= 1
+                self.send_response(cls.fail_status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(cls.delay)
+            words = body["prompt"].split()
+            if not body.get("stream"):
+                out = json.dumps({"response": " ".join(words), "done": True, "eval_count": len(words),
+                                  "eval_duration": 1_000_000}).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+                return
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            lines = [{"response": w + " ", "done": False} for w in words] + [{"response": "", "done": True, "eval_count": len(words)}]
+            for msg in lines:
+                data = (json.dumps(msg) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.write(b"0\r\n\r\n")
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+@pytest.fixture()
+def stub():
+    StubOllama.fail_next, StubOllama.fail_status, StubOllama.delay, StubOllama.peak = 0, 503, 0.0, 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+def test_generate_stream_and_retry(stub):
+    llm = LocalLLM(host=stub, backoff=0.01)
+    assert llm.generate("draft a job description") == "draft a job description"
+    assert list(llm.stream("hello there")) == ["hello ", "there "]
+    assert llm.history[-1]["tokens"] == 2 and llm.history[-1]["first_token_s"] is not None
+
+    StubOllama.fail_next = 1
+    assert llm.generate("retry me") == "retry me"
+    assert llm.metrics_summary()["retries"] == 1
+
+    StubOllama.fail_next = 5
+    with pytest.raises(LLMError):
+        llm.generate("give up")
+
+    StubOllama.fail_next, StubOllama.fail_status = 2, 404  # not retried, same error type
+    with pytest.raises(LLMError, match="HTTP 404"):
+        llm.generate("no such model")
+    assert StubOllama.fail_next == 1
+
+def test_async_concurrency_is_bounded(stub):
+    StubOllama.delay = 0.05
+    llm = LocalLLM(host=stub)
+    prompts = [f"prompt {i}" for i in range(8)]
+    out = asyncio.run(llm.agenerate_many(prompts, concurrency=3))
+    assert out == prompts
+    assert 2 <= StubOllama.peak <= 3
+
+    llm.max_concurrency = 2  # the default semaphore is per event loop, so reuse across runs works
+    for _ in range(2):
+        StubOllama.peak = 0
+        assert asyncio.run(llm.agenerate_many(prompts[:4])) == prompts[:4]
+        assert StubOllama.peak == 2
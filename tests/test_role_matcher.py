@@ -0,0 +1,63 @@
+import os
+
+from state import RoleSpec
+from nodes.intake import detect_roles
+from nodes.jd_generator import _compose_jd
+from tools.role_catalog import CATALOG, RoleCatalog
+from tools.role_matcher import KEEP, RoleIndex, prune
+from tools.rules import RULES
+
+NAMES = [("Data Engineer", "Data Engineer"), ("Data Eng", "Data Engineer"), ("ML Engineer", "ML Engineer"),
+         ("Machine Learning Engineer", "ML Engineer"), ("Product Designer", "Product Designer")]
+
+def test_index_ranks_variants_and_maps_cached_arrays(tmp_path):
+    idx = RoleIndex(NAMES, tmp_path)
+    [(label, score), (other, _)] = idx.top("hiring machine-learning engineers", 2)
+    assert label == "ML Engineer" and score > 0.9 and other == "Data Engineer"
+    assert idx.best("sr. data engineering lead") == "Data Engineer"
+    assert idx.best("need an engineer") is None  # close by cosine, but covers too little of any name
+    assert idx.top("help me hire") == []
+    assert idx.stats["builds"] == 1
+
+    mapped = RoleIndex(list(NAMES), tmp_path)
+    assert mapped.top("product designers") == idx.top("product designers")
+    assert mapped.stats == {"builds": 0, "loads": 1, "queries": 1, "skipped": 0}
+
+def test_intake_falls_back_to_nearest_role():
+    assert [r.title for r in detect_roles("hiring machine-learning engineers")] == ["Ml Engineer"]
+    assert [r.title for r in detect_roles("gen-ai internship, 8 weeks")] == ["Genai Intern"]
+    assert [r.title for r in detect_roles("backend platform lead")] == ["Backend Engineer"]
+    assert [r.title for r in detect_roles("help me hire")] == ["Software Engineer (Startup)"]
+    RULES.swap({**RULES.current().config, "role_match": 2})  # above 1: fallback off
+    try:
+        assert [r.title for r in detect_roles("hiring machine-learning engineers")] == ["Software Engineer (Startup)"]
+    finally:
+        RULES.swap(None)
+
+def test_catalog_matches_unlisted_titles(tmp_path):
+    yml = tmp_path / "roles.yml"
+    yml.write_text("Data Engineer:\n  aliases: [DE]\n  summary: pipelines\nDesigner:\n  summary: pixels\n",
+                   encoding="utf-8")
+    cat = RoleCatalog(yml, cache_dir=tmp_path / "cache", match_cache=2)
+    assert cat.match("DE") == "Data Engineer" and cat.match("Senior Data Engineers") == "Data Engineer"
+    assert cat.match("Recruiter") is None and cat.match("Recruiter") is None
+    assert list(cat._matcher[2]) == [("Senior Data Engineers", None), ("Recruiter", None)]  # bounded LRU
+    assert list((tmp_path / "cache" / "role_match").glob("*.npy"))
+    jd = _compose_jd(RoleSpec(title="Gen-AI Interns"), [], None, None, None, None, None)
+    assert "prototyping, evaluation" in jd  # the GenAI Intern template, not the fallback
+    emitted = [canonical.title() for canonical in RULES.current().role_aliases] + [RULES.current().default_role]
+    assert all(CATALOG.resolve(title) for title in emitted)  # every role intake emits has a template
+
+def test_index_cache_keeps_recent_versions(tmp_path):
+    versions = [NAMES[:2] + [(f"Role {i}", f"Role {i}")] for i in range(KEEP + 3)]
+    for i, names in enumerate(versions):
+        index = RoleIndex(names, tmp_path)
+        index.top("data engineer")
+        os.utime(index._path().with_suffix(".json"), (i, i))
+    (tmp_path / "0123456789abcdef.v4.999.tmp").write_bytes(b"")  # left by a crashed build
+    os.utime(tmp_path / "0123456789abcdef.v4.999.tmp", (0, 0))
+    prune(tmp_path)
+    kept = [RoleIndex(names, tmp_path)._path() for names in versions[-KEEP:]]
+    assert sorted(tmp_path.iterdir()) == sorted(kept + [path.with_suffix(".json") for path in kept])
+    latest = RoleIndex(versions[-1], tmp_path)
+    assert latest.best("data engineer") == "Data Engineer" and latest.stats["loads"] == 1
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from state import AgentState, Slots
+from nodes.intake import detect_roles
+from tools.rules import RULES, RuleEngine
+
+SHIPPED = (Path(__file__).resolve().parent.parent / "data" / "rules.yml").read_text(encoding="utf-8")
+
+def test_questions_follow_the_decision_table():
+    rules = RULES.current()
+    s = Slots(budget="$150k", location="Remote")
+    assert rules.ask(s) == ["Which role(s) do you want to hire? (e.g., Founding Engineer, GenAI Intern)",
+                            "What’s the hiring timeline?", "Is this full-time, intern, or contract?"]
+    s.roles = detect_roles("need a data engineer")
+    assert [r.title for r in s.roles] == ["Data Engineer"]
+    s.budget = None
+    assert rules.ask(s, {"budget": "$140k–$180k"})[0] == "What’s your budget range? (similar postings: $140k–$180k)"
+    assert rules.ask(s, {"skills": ["AWS"]})[0] == "What’s your budget range?"
+
+def test_rules_hot_reload_and_keep_last_good(tmp_path):
+    path = tmp_path / "rules.yml"
+    path.write_text(SHIPPED, encoding="utf-8")
+    engine = RuleEngine(path, cache_dir=tmp_path / "cache", check_interval=0)
+    v1 = engine.version
+    assert engine.current().scan("need a qa engineer").roles == ()
+
+    path.write_text(SHIPPED.replace("version: 1", "version: 2").replace(
+        "  data engineer: [data engineer]", "  data engineer: [data engineer]\n  qa engineer: [qa engineer, tester]")
+        .replace("max_questions: 0", "max_questions: 2"), encoding="utf-8")
+    rules = engine.current()
+    assert rules.version.startswith("2-") and rules.version != v1
+    assert rules.scan("need a tester").roles == ("qa engineer",) and len(rules.ask(Slots())) == 2
+
+    path.write_text(SHIPPED.replace("patterns:\n  budget: '(", "patterns:\n  budget: '(("), encoding="utf-8")
+    assert engine.current() is rules and "pattern" in engine.last_error and engine.stats["errors"] == 1
+    path.unlink()  # briefly missing, e.g. mid-deploy: still the last good rules
+    assert engine.current() is rules and engine.stats["errors"] == 2
+    path.write_text("roles: [unclosed\n", encoding="utf-8")  # not YAML
+    assert engine.current() is rules and engine.stats["errors"] == 3
+    path.write_text("- a list\n- not a mapping\n", encoding="utf-8")
+    assert engine.current() is rules and "mapping" in engine.last_error and engine.stats["errors"] == 4
+
+    # a second process reuses the compiled rules without parsing YAML
+    path.write_text(SHIPPED, encoding="utf-8")
+    engine.current()
+    again = RuleEngine(path, cache_dir=tmp_path / "cache")
+    assert again.version == v1 and again.stats["index_hits"] == 1
+
+def test_swap_replaces_rules_for_the_graph_nodes():
+    config = RULES.current().config
+    previous = RULES.swap({**config, "version": 99, "roles": {"qa engineer": ["qa"]}, "default_role": "Generalist"})
+    try:
+        assert RULES.version.startswith("99-")
+        assert [r.title for r in detect_roles("need a qa person")] == ["Qa Engineer"]
+        assert [r.title for r in detect_roles("need a product designer")] == ["Generalist"]
+    finally:
+        RULES.swap(None)
+    assert RULES.current().version == previous.version
+    state = AgentState(session_id="r", user_query="need a founding engineer")
+    assert [r.title for r in detect_roles(state.user_query)] == ["Founding Engineer"]
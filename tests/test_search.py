@@ -0,0 +1,87 @@
+import json
+import os
+
+from tools.search_tool import PostingIndex
+
+POSTINGS = [
+    {"title": "Senior Python Engineer", "description": "Python backend services on AWS, kubernetes",
+     "skills": ["python", "aws", "k8s"], "salary_min": 150000, "salary_max": 190000},
+    {"title": "ML Engineer", "description": "Train models in python, deploy with terraform",
+     "skills": ["Python", "Terraform"], "salary": "$160k - $200k"},
+    {"title": "Frontend Engineer", "description": "React and node.js product work",
+     "skills": ["react", "node"], "salary_min": 120000, "salary_max": 150000},
+]
+
+def _corpus(tmp_path):
+    corpus = tmp_path / "postings"
+    corpus.mkdir()
+    (corpus / "jobs.json").write_text(json.dumps(POSTINGS))
+    (corpus / "sre.md").write_text("# SRE\nOn-call for kubernetes clusters on GCP. Pay $140,000 to $170,000.")
+    return corpus, PostingIndex(corpus, tmp_path / "index", check_interval=0)
+
+def test_bm25_ranks_matching_postings(tmp_path):
+    _, index = _corpus(tmp_path)
+    index.update()
+    hits = index.search("python backend engineer")
+    assert hits[0].title == "Senior Python Engineer"
+    assert {h.title for h in hits} >= {"ML Engineer"}
+    assert index.search("kubernetes")[0].key in ("jobs.json#0", "sre.md#0")
+    assert index.search("") == [] and index.search("cobol") == []
+
+def test_incremental_update_and_tombstones(tmp_path):
+    corpus, index = _corpus(tmp_path)
+    assert index.update() == {"added": 2, "removed": 0, "segments": 1}
+    assert index.update() == {"added": 0, "removed": 0, "segments": 1}
+    (corpus / "rust.json").write_text(json.dumps({"title": "Rust Engineer", "description": "rust systems"}))
+    assert index.update()["added"] == 1 and index.search("rust")[0].title == "Rust Engineer"
+    os.remove(corpus / "sre.md")
+    index.update()
+    assert all(h.key != "sre.md#0" for h in index.search("kubernetes gcp"))
+    # a fresh instance reads the same manifest and segments
+    reopened = PostingIndex(corpus, tmp_path / "index", check_interval=0)
+    assert [h.key for h in reopened.search("rust")] == ["rust.json#0"]
+
+def test_compaction_publishes_before_deleting_segments(tmp_path):
+    corpus, index = _corpus(tmp_path)
+    index.update()
+    (corpus / "rust.json").write_text(json.dumps({"title": "Rust Engineer", "description": "rust systems"}))
+    assert index.update()["segments"] == 2
+    index.max_segments = 1
+    assert index.update() == {"added": 0, "removed": 0, "segments": 1}  # rebuilt with no file changes
+    fresh = PostingIndex(corpus, tmp_path / "index", check_interval=3600)
+    assert fresh.search("rust")[0].title == "Rust Engineer"
+    assert fresh.search("python")[0].title == "Senior Python Engineer"
+
+def test_queries_never_build_on_the_callers_thread(tmp_path):
+    corpus, index = _corpus(tmp_path)
+    assert index.search("python") == []  # nothing built yet: the build runs in the background
+    index.refresh().join(10)
+    assert index.search("python")[0].title == "Senior Python Engineer"
+    assert index.stats["updates"] >= 1 and index.stats["refresh_errors"] == 0
+    # a restart (or another process) serves what is on disk at once, even with the corpus gone
+    for f in corpus.iterdir():
+        f.unlink()
+    other = PostingIndex(corpus, tmp_path / "index", check_interval=3600)
+    assert other.search("python")[0].title == "Senior Python Engineer"
+
+def test_segments_are_named_per_writer(tmp_path):
+    corpus, index = _corpus(tmp_path)
+    index.update()
+    [seg] = json.loads((tmp_path / "index" / "manifest.json").read_text())["segments"]
+    assert seg.endswith(f"-{os.getpid()}")
+
+def test_suggest_budget_and_missing_skills(tmp_path):
+    _, index = _corpus(tmp_path)
+    index.update()
+    out = index.suggest("python", known_skills=["Python"])
+    assert out["budget"] == "$155k–$195k" and out["based_on"] == 2
+    assert "Python" not in out["skills"] and {"AWS", "Terraform"} <= set(out["skills"])
+
+def test_picks_up_segments_written_by_another_process(tmp_path):
+    corpus, index = _corpus(tmp_path)
+    index.update()
+    other = PostingIndex(corpus, tmp_path / "index", check_interval=0)
+    other.update()
+    (corpus / "rust.json").write_text(json.dumps({"title": "Rust Engineer", "description": "rust systems"}))
+    assert other.update()["added"] == 1
+    assert index.update()["added"] == 0 and index.search("rust")[0].title == "Rust Engineer"
@@ -0,0 +1,51 @@
+import os
+import time
+
+from graph import build_graph
+from session_state import SessionStates, encode_summary, pack, unpack
+from state import AgentState
+
+def _run(sid, query="need a founding engineer and a genai intern, remote, $150k"):
+    state = AgentState(session_id=sid, user_query=query)
+    return AgentState.model_construct(**build_graph(tracer=None).invoke(state))
+
+def test_pack_round_trips_and_references_repeated_artifacts():
+    out = _run("p1")
+    assert unpack(pack(out)) == AgentState.model_validate(out.model_dump())
+    art = out.artifacts
+    segments = encode_summary(art.summary_md, [(["jds", t], md) for t, md in art.jds.items()])
+    assert sum(kind == "r" for kind, _ in segments) == len(art.jds)
+    assert len(pack(out)) < len(out.model_dump_json()) / 3
+
+def test_lru_spills_to_disk_and_reloads(tmp_path):
+    states = [_run(f"s{i}") for i in range(4)]
+    one = len(pack(states[0]))
+    cache = SessionStates(max_bytes=int(one * 2.5), spill_dir=tmp_path)
+    for s in states:
+        cache.put(s)
+    st = cache.stats()
+    assert st["resident_sessions"] == 2 and st["spilled_sessions"] == 2 and st["resident_bytes"] <= cache.max_bytes
+    assert cache.usage("s0") == {"bytes": one, "where": "disk"} and cache.usage("s3")["where"] == "memory"
+
+    assert cache.get("s0").artifacts.summary_md == states[0].artifacts.summary_md
+    assert cache.usage("s0")["where"] == "memory" and cache.usage("s1")["where"] == "disk"
+    assert not list(tmp_path.glob("s0.*")) and cache.stats()["loads"] == 1
+
+    cache.discard("s1")
+    assert cache.get("s1") is None and not list(tmp_path.glob("s1.*"))
+
+def test_spills_expire_and_stray_files_are_pruned(tmp_path):
+    stray = tmp_path / "old-session.123.1.bin"  # left behind by an earlier process
+    stray.write_bytes(b"x")
+    os.utime(stray, (time.time() - 7200, time.time() - 7200))
+    states = [_run(f"e{i}") for i in range(4)]
+    cache = SessionStates(max_bytes=1, spill_dir=tmp_path, max_age=3600, max_spilled=2)
+    for s in states:
+        cache.put(s)
+    assert not stray.exists()
+    assert cache.stats()["spilled_sessions"] == 2 and cache.counters["expired"] == 1
+    assert cache.get("e0") is None and cache.get("e1").session_id == "e1"  # e0: over max_spilled
+    assert len(list(tmp_path.glob("*.bin"))) == cache.stats()["spilled_sessions"]
+    cache.max_age = 0
+    cache.put(states[0])
+    assert cache.stats()["spilled_sessions"] == 0 and not list(tmp_path.glob("*.bin"))
@@ -0,0 +1,52 @@
+from state import AgentState, RoleSpec
+from nodes.intake import detect_roles, extract_slots
+from tools.rules import SlotExtractor
+from benchmarks.bench_intake import (BUDGET_RE, HIRING_TYPES, LOCATIONS, ROLE_ALIASES, SKILL_KEYWORDS, TIMELINE_RE,
+                                     check_equivalent, synthetic_prompt, synthetic_tables)
+
+PROMPTS = [
+    "need a founding engineer and a GenAI intern (remote, 8 weeks, $150–180k)",
+    "Hiring an ML Eng + devops, hybrid, contract, $40/hr, next 2 months, python aws kubernetes",
+    "first engineer, onsite or remote, full-time internship, 12 LPA, 3 months, react/node",
+    "i need to hire an ai engineer. can you help?",
+    "",
+]
+
+def test_extract_slots():
+    state = AgentState(session_id="s", user_query=PROMPTS[1])
+    s = extract_slots(PROMPTS[1], state).slots
+    assert (s.budget, s.timeline, s.location, s.hiring_type) == ("$40/hr", "next 2 months", "Hybrid", "Contract")
+    assert s.skills_hint == ["AWS", "Kubernetes", "Python"]
+    assert [r.title for r in detect_roles(PROMPTS[1])] == ["Ml Engineer", "Devops/Sre"]
+    assert [r.title for r in detect_roles(PROMPTS[3])] == ["Software Engineer (Startup)"]
+
+def test_single_pass_matches_keyword_scans():
+    ex = SlotExtractor(ROLE_ALIASES, LOCATIONS, HIRING_TYPES, SKILL_KEYWORDS, BUDGET_RE, TIMELINE_RE)
+    check_equivalent(ex, ROLE_ALIASES, SKILL_KEYWORDS, PROMPTS + [synthetic_prompt(300, seed=i) for i in range(5)])
+    aliases, skills = synthetic_tables(50, 500)
+    big = SlotExtractor(aliases, LOCATIONS, HIRING_TYPES, skills, BUDGET_RE, TIMELINE_RE)
+    mixed = " ".join(list(aliases)[4:10] + skills[20:40]) + " " + PROMPTS[0]
+    check_equivalent(big, aliases, skills, PROMPTS + [mixed] + [synthetic_prompt(300, seed=i) for i in range(5)])
+
+def test_skill_vocabulary_canonicalizes_and_merges():
+    from tools.skill_vocab import SkillVocab, CANONICAL_SKILLS
+    vocab = SkillVocab(CANONICAL_SKILLS)
+    assert vocab.canonical(["k8s", "aws", " Rust "], ["Kubernetes", "rust", "", "AWS"]) == ["AWS", "Kubernetes", "Rust"]
+    assert vocab.mask(["k8s"]) == vocab.mask(["kubernetes"]) == vocab.bit("Kubernetes")
+    assert vocab.canonical_name("nodejs") == "Node.js" and vocab.canonical_name("Rust") is None
+    assert vocab.ordered(["rust", "k8s", "Rust ", "kubernetes", "aws"]) == ["rust", "Kubernetes", "AWS"]
+
+    bounded = SkillVocab(CANONICAL_SKILLS, free_cache=8)  # free text never grows the vocabulary
+    for i in range(100):
+        bounded.canonical([f"tool {i}", "python"])
+    assert len(bounded._free) <= 8 and len(bounded._ids) == len(vocab._ids)
+    assert bounded.mask(["tool 1", "Rust"]) == 0 and bounded.mask(["python", "tool 2"]) == bounded.bit("Python")
+
+    from nodes.jd_generator import _compose_jd
+    jd = _compose_jd.__wrapped__(RoleSpec(title="ML Engineer"), ["Terraform", "rust", "aws", "AWS"],
+                                 None, None, None, None, None)
+    assert "comfortable with Terraform, rust, AWS." in jd  # request order, deduplicated
+    assert jd.index("Proficiency in Terraform.") < jd.index("Proficiency in Rust.") < jd.index("Proficiency in AWS.")
+    state = AgentState(session_id="s", user_query="k8s and python")
+    state.slots.skills_hint = ["kubernetes", "Go"]
+    assert extract_slots(state.user_query, state).slots.skills_hint == ["Go", "Kubernetes", "Python"]
@@ -0,0 +1,29 @@
+import json
+
+from graph import NODES, build_graph
+from state import AgentState
+from tracing import Tracer
+
+def test_every_node_emits_a_span(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    tracer = Tracer(jsonl_path=str(path), measure_memory=True, measure_sizes=True)
+    g = build_graph(tracer=tracer)
+    g.invoke(AgentState(session_id="tr1", user_query="need a founding engineer in Austin").model_dump())
+
+    rows = tracer.last_run("tr1")
+    assert {r["node"] for r in rows} == {name for name, _ in NODES}
+    assert rows[0]["node"] == "intake" and rows[-1]["node"] == "presenter"
+    assert all(r["status"] == "OK" and r["wall_ms"] >= 0 and r["alloc_kb"] is not None for r in rows)
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(spans) == len(NODES)
+    assert len({s["traceId"] for s in spans}) == 1
+    jd = next(s for s in spans if s["name"] == "node.jd_generator")
+    assert jd["endTimeUnixNano"] >= jd["startTimeUnixNano"]
+    assert jd["attributes"]["node.output_bytes"] > 0
+
+def test_default_tracer_records_timings_only():
+    tracer = Tracer()
+    build_graph(tracer=tracer).invoke(AgentState(session_id="tr2", user_query="need a founding engineer"))
+    rows = tracer.last_run("tr2")
+    assert rows and all(r["in_kb"] is None and r["out_kb"] is None and r["wall_ms"] >= 0 for r in rows)
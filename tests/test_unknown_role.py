@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from state import RoleSpec
+from nodes.jd_generator import _compose_jd
+from tools.role_catalog import RoleCatalog
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def _jd(title):
+    return _compose_jd(RoleSpec(title=title), [], None, None, None, None, None)
+
+def test_alias_and_normalized_lookup():
+    assert "prototyping, evaluation" in _jd("Genai Intern")  # title as produced by intake
+    assert "prototyping, evaluation" in _jd("ml-intern")
+
+def test_unknown_role_falls_back_to_founding_engineer():
+    jd = _jd("Chief Vibes Officer")
+    assert "**Job Title:** Chief Vibes Officer" in jd
+    assert "first version of our product" in jd
+
+def test_hot_reload_and_cached_index(tmp_path):
+    yml = tmp_path / "roles.yml"
+    yml.write_text("Data Engineer:\n  aliases: [DE]\n  summary: v1\n", encoding="utf-8")
+    cat = RoleCatalog(yml, cache_dir=tmp_path / "cache", check_interval=0)
+    assert cat.get("de")["summary"] == "v1"
+    v1 = cat.version
+
+    yml.write_text("Data Engineer:\n  aliases: [DE]\n  summary: version two\n", encoding="utf-8")
+    os.utime(yml, ns=(1, 1))  # force a different mtime even on coarse filesystems
+    assert cat.get("Data Engineer")["summary"] == "version two"
+    assert cat.version != v1 and cat.stats["reloads"] == 1
+
+    fresh = RoleCatalog(yml, cache_dir=tmp_path / "cache")
+    assert fresh.get("DE")["summary"] == "version two"
+    assert fresh.stats["index_hits"] == 1
+
+def test_broken_or_missing_catalogue_keeps_last_good(tmp_path):
+    yml = tmp_path / "roles.yml"
+    yml.write_text("Data Engineer:\n  aliases: [DE]\n  summary: good\n", encoding="utf-8")
+    cat = RoleCatalog(yml, cache_dir=tmp_path / "cache", check_interval=0)
+    v1 = cat.version
+
+    yml.write_text("Data Engineer: [unclosed\n", encoding="utf-8")  # not YAML
+    assert cat.get("DE")["summary"] == "good" and cat.stats["errors"] == 1
+    yml.write_text("- a list\n- not a mapping\n", encoding="utf-8")
+    assert cat.resolve("de") == "Data Engineer" and "mapping" in cat.last_error
+    yml.unlink()  # briefly missing, e.g. mid-deploy
+    assert cat.version == v1 and cat.stats["errors"] == 3
+
+    yml.write_text("Data Engineer:\n  summary: fixed\n", encoding="utf-8")
+    assert cat.get("Data Engineer")["summary"] == "fixed" and cat.last_error is None
+
+def test_import_does_not_depend_on_cwd(tmp_path):
+    code = "import nodes.jd_generator as j; from state import RoleSpec; j._compose_jd(RoleSpec(title='x'), [], None, None, None, None, None)"
+    env = dict(os.environ, PYTHONPATH=str(ROOT), SKILLSCOUT_CACHE_DIR=str(tmp_path))
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True)
@@ -0,0 +1,179 @@
+# tools/artifact_cache.py
+# Content-addressed cache for pure artifact builders (JDs, plans, emails) (Python 3.9–safe)
+#
+# Keys are a SHA-256 over the tool name, an optional version (e.g. the role catalogue
+# version) and the canonical JSON of the call arguments, so identical requests from any
+# session or tenant share one entry. @cached binds the call to the function's signature
+# first (defaults applied), so positional and keyword spellings of one call share a key.
+# Two tiers:
+#   - in-memory LRU, bounded by entry count and total bytes, with a TTL
+#   - optional SQLite file (SKILLSCOUT_ARTIFACT_DB=path) shared across processes/restarts
+# Values are stored as JSON text, so every hit hands back a fresh object.
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+def _default(o: Any):
+    if hasattr(o, "model_dump"):  # pydantic models (RoleSpec, Slots, ...)
+        return o.model_dump()
+    if isinstance(o, (set, frozenset)):
+        return sorted(o, key=str)
+    return str(o)
+
+def canonical_key(namespace: str, *args, version: Any = None, **kwargs) -> str:
+    raw = json.dumps([namespace, version, args, kwargs], sort_keys=True,
+                     separators=(",", ":"), ensure_ascii=False, default=_default)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class ArtifactCache:
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 32 * 1024 * 1024,
+                 ttl: Optional[float] = 24 * 3600, db_path: Optional[str] = None,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.db_path = db_path
+        self.max_disk_bytes = max_disk_bytes
+        self._mem: "OrderedDict[str, Tuple[str, float, str]]" = OrderedDict()  # key -> (json, stored_at, namespace)
+        self._bytes = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes: Optional[int] = None
+        self._lock = threading.RLock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    # ---------- counters ----------
+    def _count(self, namespace: str, field: str) -> None:
+        ns = self.stats.setdefault(namespace, {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0})
+        ns[field] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {ns: dict(v) for ns, v in self.stats.items()}
+
+    # ---------- disk tier ----------
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        if not self.db_path:
+            return None
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS artifacts ("
+                             "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, size INTEGER NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS artifacts_age ON artifacts(stored_at)")
+        return self._db
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        db = self._conn()
+        if db is None:
+            return None
+        row = db.execute("SELECT value, stored_at FROM artifacts WHERE key=?", (key,)).fetchone()
+        if row is None:
+            return None
+        if self.ttl is not None and now - row[1] > self.ttl:
+            db.execute("DELETE FROM artifacts WHERE key=?", (key,))
+            return None
+        return row[0], row[1]
+
+    def _disk_put(self, key: str, raw: str, now: float) -> None:
+        db = self._conn()
+        if db is None:
+            return
+        if self._disk_bytes is None:
+            self._disk_bytes = db.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+        db.execute("INSERT OR REPLACE INTO artifacts(key, value, stored_at, size) VALUES (?,?,?,?)",
+                   (key, raw, now, len(raw)))
+        self._disk_bytes += len(raw)  # upper bound; re-measured after each eviction
+        if self._disk_bytes > self.max_disk_bytes:
+            # drop everything expired plus the oldest ~10%, then re-measure
+            if self.ttl is not None:
+                db.execute("DELETE FROM artifacts WHERE stored_at < ?", (now - self.ttl,))
+            db.execute("DELETE FROM artifacts WHERE key IN (SELECT key FROM artifacts ORDER BY stored_at LIMIT "
+                       "MAX(1, (SELECT COUNT(*) FROM artifacts) / 10))")
+            self._disk_bytes = db.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+
+    # ---------- memory tier ----------
+    def _mem_put(self, namespace: str, key: str, raw: str, stored_at: float) -> None:
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old[0])
+        self._mem[key] = (raw, stored_at, namespace)
+        self._bytes += len(raw)
+        while self._mem and (len(self._mem) > self.max_entries or self._bytes > self.max_bytes):
+            _, (evicted, _, owner) = self._mem.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._count(owner, "evictions")  # charged to the namespace that loses the entry
+
+    # ---------- public API ----------
+    def get(self, namespace: str, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None and (self.ttl is None or now - hit[1] <= self.ttl):
+                self._mem.move_to_end(key)
+                self._count(namespace, "hits")
+                return True, json.loads(hit[0])
+            if hit is not None:  # expired
+                self._bytes -= len(self._mem.pop(key)[0])
+            row = self._disk_get(key, now)
+            if row is not None:
+                self._mem_put(namespace, key, row[0], row[1])
+                self._count(namespace, "disk_hits")
+                return True, json.loads(row[0])
+            self._count(namespace, "misses")
+            return False, None
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        raw = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            self._mem_put(namespace, key, raw, now)
+            self._disk_put(key, raw, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._bytes = 0
+            self.stats.clear()
+            db = self._conn()
+            if db is not None:
+                db.execute("DELETE FROM artifacts")
+                self._disk_bytes = 0
+
+ARTIFACT_CACHE = ArtifactCache(db_path=os.getenv("SKILLSCOUT_ARTIFACT_DB"))
+
+def cached(namespace: str, version: Union[None, int, str, Callable[[], Any]] = None,
+           cache: Optional[ArtifactCache] = None):
+    """
+    Memoize a pure, JSON-returning function in the artifact cache.
+    `version` is folded into the key: a constant (the builder's output format, bumped
+    whenever its shape changes) or a callable run per lookup (e.g. catalogue version),
+    so entries built by older code or from stale inputs are never served. The
+    undecorated function is available as `fn.__wrapped__`.
+    """
+    def deco(fn: Callable) -> Callable:
+        sig = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            c = cache or ARTIFACT_CACHE
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            v = version() if callable(version) else version
+            key = canonical_key(namespace, dict(bound.arguments), version=v)
+            hit, value = c.get(namespace, key)
+            if hit:
+                return value
+            value = fn(*args, **kwargs)
+            c.put(namespace, key, value)
+            return value
+        return wrapper
+    return deco
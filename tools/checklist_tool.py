@@ -1,26 +1,33 @@
 # tools/checklist_tool.py
 # Dynamic, professional hiring plans (Python 3.9–safe)
 
-from typing import List, Dict, Optional
+import heapq
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from tools.artifact_cache import cached
 
 # ---------------- utilities ----------------
-def _title_flags(roles: List[Dict]) -> Dict[str, bool]:
-    """Infer role category signals from titles."""
-    titles = [str(r.get("title", "")).lower() for r in roles]
-    is_founding = any(any(k in t for k in ["founding", "founder", "first engineer"]) for t in titles)
-    is_lead = any(any(k in t for k in ["lead", "principal", "staff", "head", "director"]) for t in titles)
-    return {"founding": is_founding, "lead": is_lead}
-
-def _dedup(stages: List[Dict]) -> List[Dict]:
-    """Remove duplicate stage lines while preserving order."""
-    seen = set()
-    out: List[Dict] = []
-    for s in stages:
-        key = s.get("stage", "").strip().lower()
-        if key and key not in seen:
-            seen.add(key)
-            out.append(s)
-    return out
+FOUNDING_KEYS = ("founding", "founder", "first engineer")
+LEAD_KEYS = ("lead", "principal", "staff", "head", "director")
+SHORT_TERM_TYPES = {"intern", "contract", "contractor"}
+# Bump whenever a plan's stages or fields change: cached plans are keyed on it.
+# 2: multi-role plans with roles, start_day/end_day and critical.
+FORMAT = 2
+
+def _role_track(title: str, hiring_type: str) -> str:
+    """Which plan template a role follows (title is lower-cased)."""
+    if any(k in title for k in FOUNDING_KEYS):
+        return "founding"
+    if "intern" in title or hiring_type in SHORT_TERM_TYPES:
+        return "short_term"
+    return "full_time_lead" if any(k in title for k in LEAD_KEYS) else "full_time"
+
+def _stage_key(stage: Dict) -> str:
+    return " ".join(stage["stage"].lower().split())
+
+def _owners(owner: str) -> List[str]:
+    """'Founders/HR' -> ['founders', 'hr']: a stage ties up every owner it names."""
+    return [o.strip().lower() for o in owner.split("/") if o.strip()]
 
 def _extras_common() -> List[Dict]:
     """Cross-functional touches that raise quality and fairness."""
@@ -72,25 +79,151 @@ def _plan_fulltime_standard(is_lead: bool) -> List[Dict]:
         {"stage": "Pre-onboarding checklist; assign buddy and 30/60/90-day plan.", "owner": "HR/Manager", "eta_days": 2},
     ]
 
+TRACK_PLANS: Dict[str, Callable[[], List[Dict]]] = {
+    "founding": _plan_founding,
+    "short_term": _plan_intern_or_contract,
+    "full_time": lambda: _plan_fulltime_standard(is_lead=False),
+    "full_time_lead": lambda: _plan_fulltime_standard(is_lead=True),
+}
+JD_STAGE = 1  # every track drafts its job description second
+
+# ---------------- scheduling ----------------
+def _schedule(stages: Dict[str, Dict], deps: Dict[str, Set[str]], owner_capacity: int) -> List[Dict]:
+    """
+    Critical-path + list scheduling. Each stage starts once its dependencies are done and
+    every owner it names has a free slot (at most `owner_capacity` concurrent stages per
+    owner); among ready stages the one with the longest remaining path goes first.
+    """
+    keys = list(stages)
+    index = {k: i for i, k in enumerate(keys)}
+    succ: Dict[str, List[str]] = {k: [] for k in keys}
+    indeg = {k: len(deps[k]) for k in keys}
+    for k in keys:
+        for d in deps[k]:
+            succ[d].append(k)
+
+    topo = [k for k in keys if not indeg[k]]
+    remaining = dict(indeg)
+    for k in topo:  # appending while iterating walks the whole DAG
+        for n in succ[k]:
+            remaining[n] -= 1
+            if not remaining[n]:
+                topo.append(n)
+    if len(topo) != len(keys):
+        raise ValueError("hiring plan stages have a dependency cycle")
+
+    eta = {k: stages[k]["eta_days"] for k in keys}
+    earliest: Dict[str, int] = {}
+    for k in topo:
+        earliest[k] = max((earliest[d] + eta[d] for d in deps[k]), default=0)
+    tail: Dict[str, int] = {}
+    for k in reversed(topo):
+        tail[k] = eta[k] + max((tail[n] for n in succ[k]), default=0)
+    length = max((earliest[k] + tail[k] for k in keys), default=0)
+
+    owners = {k: _owners(stages[k]["owner"]) for k in keys}
+    busy: Dict[str, int] = {}
+    ready = [(-tail[k], index[k], k) for k in keys if not indeg[k]]
+    heapq.heapify(ready)
+    running: List[Tuple[int, int, str]] = []
+    start: Dict[str, int] = {}
+    now = 0
+    while ready or running:
+        blocked = []
+        while ready:
+            item = heapq.heappop(ready)
+            k = item[2]
+            if all(busy.get(o, 0) < owner_capacity for o in owners[k]):
+                start[k] = now
+                for o in owners[k]:
+                    busy[o] = busy.get(o, 0) + 1
+                heapq.heappush(running, (now + eta[k], index[k], k))
+            else:
+                blocked.append(item)
+        for item in blocked:
+            heapq.heappush(ready, item)
+        now = running[0][0]
+        while running and running[0][0] == now:
+            _, _, k = heapq.heappop(running)
+            for o in owners[k]:
+                busy[o] -= 1
+            for n in succ[k]:
+                indeg[n] -= 1
+                if not indeg[n]:
+                    heapq.heappush(ready, (-tail[n], index[n], n))
+
+    plan = []
+    for k in sorted(keys, key=lambda k: (start[k], index[k])):
+        s = stages[k]
+        plan.append({"stage": s["stage"], "owner": s["owner"], "eta_days": s["eta_days"],
+                     "roles": list(s["roles"]), "start_day": start[k], "end_day": start[k] + eta[k],
+                     "critical": earliest[k] + tail[k] == length})
+    return plan
+
+@lru_cache(maxsize=256)
+def _track_schedule(tracks: Tuple[str, ...], owner_capacity: int) -> Tuple[Tuple[Dict, Tuple[str, ...]], ...]:
+    """Scheduled stages for a set of tracks, each with the tracks it serves (roles filled in later)."""
+    stages: Dict[str, Dict] = {}
+    deps: Dict[str, Set[str]] = {}
+
+    def add(stage: Dict, on: Iterable[str], after: List[str]) -> str:
+        key = _stage_key(stage)
+        merged = stages.get(key)
+        if merged is None:
+            merged = stages[key] = {**stage, "roles": {}}
+            deps[key] = set()
+        merged["roles"].update(dict.fromkeys(on))  # ordered set of tracks, at this point
+        deps[key].update(after)
+        return key
+
+    jd_keys, last_keys = [], []
+    for track in tracks:
+        prev: List[str] = []
+        for i, stage in enumerate(TRACK_PLANS[track]()):
+            key = add(stage, [track], prev)
+            if i == JD_STAGE:
+                jd_keys.append(key)
+            prev = [key]
+        last_keys += prev
+
+    dei, training, sla, analytics, feedback = _extras_common()
+    dei_key = add(dei, tracks, jd_keys)
+    add(training, tracks, [dei_key])
+    add(sla, tracks, [])
+    add(analytics, tracks, [])
+    add(feedback, tracks, last_keys)
+    return tuple((it, tuple(it.pop("roles"))) for it in _schedule(stages, deps, owner_capacity))
+
 # ---------------- public API ----------------
-def build_checklist(roles: List[Dict], hiring_type: Optional[str]) -> List[Dict]:
+@cached("checklist", version=FORMAT)
+def build_checklist(roles: List[Dict], hiring_type: Optional[str], owner_capacity: int = 2) -> List[Dict]:
     """
-    Returns a professional, role-aware hiring plan.
+    Returns a professional, role-aware hiring plan covering every requested role.
     - Founding roles: founder-specific flow (equity, mutual references, strategy onboarding).
     - Intern/Contract: scope-first, mentorship, weekly demos, midpoint review, final presentation.
     - Full-time: structured rubric, panel loop, reference + calibration, 30/60/90 onboarding.
     Includes quality extras (DEI, interview training, candidate experience, analytics, post-hire feedback).
+
+    Roles on the same track share one set of stages, and identical stages across tracks
+    (the extras, for one) are merged; each stage lists the roles it covers. Stages are
+    scheduled from eta_days: a track runs in order, the DEI check follows every JD draft,
+    post-hire feedback follows every track, and each owner runs at most `owner_capacity`
+    stages at once. Every stage carries start_day/end_day and whether it is on the
+    critical path. The schedule depends only on which tracks are present, so it is
+    computed once per combination.
     """
-    flags = _title_flags(roles)
+    if not isinstance(owner_capacity, int) or owner_capacity < 1:
+        raise ValueError(f"owner_capacity must be a positive integer, got {owner_capacity!r}")
     htype = (hiring_type or "").lower()
+    tracks: Dict[str, List[str]] = {}
+    for r in roles:
+        title = str(r.get("title", ""))
+        tracks.setdefault(_role_track(title.lower(), htype), []).append(title)
+    if not tracks:
+        tracks[_role_track("", htype)] = []
 
-    if flags["founding"]:
-        base = _plan_founding()
-    elif htype in {"intern", "contract", "contractor"}:
-        base = _plan_intern_or_contract()
-    else:
-        base = _plan_fulltime_standard(is_lead=flags["lead"])
-
-    # Add cross-functional quality extras
-    plan = base + _extras_common()
-    return _dedup(plan)
+    plan = []
+    for stage, on in _track_schedule(tuple(tracks), owner_capacity):
+        titles = tracks[on[0]] if len(on) == 1 else [t for track in on for t in tracks[track]]
+        plan.append({**stage, "roles": list(dict.fromkeys(titles))})
+    return plan
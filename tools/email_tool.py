@@ -1,6 +1,10 @@
 # tools/email_tool.py  — professional kickoff email (Python 3.9–safe)
 from typing import List, Dict, Optional
+from tools.artifact_cache import cached
 
+FORMAT = 1  # bump whenever the draft's wording or layout changes: cached drafts are keyed on it
+
+@cached("email", version=FORMAT)
 def kickoff_email(roles: List[Dict], budget: Optional[str], timeline: Optional[str]) -> str:
     roles_str = ", ".join([r.get("title", "") for r in roles]) or "the role"
     b = budget or "TBD"
@@ -0,0 +1,125 @@
+# tools/llm_cache.py
+# Prompt-template rendering, persistent LLM response cache and single-flight coalescing
+#
+# complete("jd", {...}) renders prompts/jd.md with the given variables and returns the
+# completion. Responses are cached (memory LRU + SQLite, see tools.artifact_cache) under
+# a key built from the model, the template's content hash and the rendered variables, so
+# editing a prompt file invalidates its entries. Concurrent callers asking for the same
+# completion while it is in flight wait for the one request instead of each paying the
+# local inference cost.
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from tools.artifact_cache import ArtifactCache, canonical_key
+
+ROOT = Path(__file__).resolve().parent.parent
+PROMPTS_DIR = ROOT / "prompts"
+CACHE_DIR = Path(os.getenv("SKILLSCOUT_CACHE_DIR", ROOT / "storage" / "cache"))
+LLM_CACHE_DB = os.getenv("SKILLSCOUT_LLM_CACHE_DB", str(CACHE_DIR / "llm.db"))
+
+# ---------------- templates ----------------
+_TEMPLATES: Dict[str, Tuple[int, str, str]] = {}  # name -> (mtime_ns, text, sha)
+
+def load_template(name: str) -> Tuple[str, str]:
+    """(text, content hash) of prompts/<name>.md, re-read when the file changes."""
+    path = PROMPTS_DIR / f"{name}.md"
+    mtime = path.stat().st_mtime_ns
+    cached = _TEMPLATES.get(name)
+    if cached is None or cached[0] != mtime:
+        text = path.read_text(encoding="utf-8")
+        cached = (mtime, text, hashlib.sha1(text.encode("utf-8")).hexdigest()[:12])
+        _TEMPLATES[name] = cached
+    return cached[1], cached[2]
+
+def render(template: str, variables: Dict) -> str:
+    """Template instructions followed by the request inputs as a stable JSON block."""
+    inputs = json.dumps(variables, sort_keys=True, indent=2, ensure_ascii=False, default=str)
+    return f"{template.rstrip()}\n\nInputs:\n```json\n{inputs}\n```\n"
+
+# ---------------- single flight ----------------
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self.stats = {"leaders": 0, "followers": 0, "late_hits": 0}
+
+    def do(self, key: str, fn: Callable[[], str],
+           check: Optional[Callable[[], Tuple[bool, str]]] = None) -> str:
+        """
+        Run fn() once per key among concurrent callers. `check` (e.g. a cache lookup) is
+        re-run under the lock before becoming leader: a caller that missed just as the
+        previous leader stored its result and left gets that result instead of a rerun.
+        """
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is None and check is not None:
+                hit, value = check()
+                if hit:
+                    self.stats["late_hits"] += 1
+                    return value
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._inflight[key] = fut
+                self.stats["leaders"] += 1
+            else:
+                self.stats["followers"] += 1
+        if not leader:
+            return fut.result()
+        try:
+            fut.set_result(fn())
+        except BaseException as e:
+            fut.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return fut.result()
+
+# ---------------- cached completions ----------------
+class CachedLLM:
+    def __init__(self, llm=None, cache: Optional[ArtifactCache] = None):
+        self._llm = llm
+        self.cache = cache or ArtifactCache(max_entries=512, ttl=7 * 24 * 3600, db_path=LLM_CACHE_DB)
+        self.flight = SingleFlight()
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            from tools.ollama_llm import LocalLLM  # requests is only needed once an LLM is used
+            self._llm = LocalLLM()
+        return self._llm
+
+    def complete(self, template_name: str, variables: Dict) -> str:
+        template, template_hash = load_template(template_name)
+        key = canonical_key("llm", self.llm.model, template_name, template_hash, variables)
+        hit, text = self.cache.get("llm", key)
+        if hit:
+            return text
+
+        def call() -> str:
+            text = self.llm.generate(render(template, variables))
+            self.cache.put("llm", key, text)
+            return text
+
+        return self.flight.do(key, call, check=lambda: self.cache.get("llm", key))
+
+_DEFAULT: Optional[CachedLLM] = None
+_DEFAULT_LOCK = threading.Lock()
+
+def get_cached_llm() -> CachedLLM:
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = CachedLLM()
+        return _DEFAULT
+
+def complete(template_name: str, variables: Dict) -> str:
+    return get_cached_llm().complete(template_name, variables)
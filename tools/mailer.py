@@ -0,0 +1,386 @@
+# tools/mailer.py
+# Outbound email: durable outbox + background SMTP delivery (Python 3.9–safe)
+#
+# - Nothing here runs inside the graph: email_writer_node still only drafts. Callers
+#   (Streamlit "Send", POST /email, batch --email-to) enqueue a draft and return at once.
+# - Outbox: SQLite (storage/outbox.db, SKILLSCOUT_OUTBOX_DB). Every message is written
+#   before it is sent, so queued mail survives restarts. Enqueueing is idempotent per
+#   (session, recipients, draft): re-running a batch or double-clicking does not re-send.
+# - Delivery: `workers` threads, each holding one pooled SMTP connection. A worker
+#   claims up to `batch` due messages under a lease, sends them over its open connection
+#   and records the results in one transaction. A crashed process's leased messages are
+#   picked up again once the lease expires.
+# - Failures: connection errors and 4xx replies are retried with exponential backoff
+#   and jitter, up to `max_attempts`; 5xx replies (bad recipient, rejected content) are
+#   marked dead at once. The connection is reopened after any connection error and
+#   closed when a worker has been idle for `idle_close` seconds.
+# - SMTP settings come from SKILLSCOUT_SMTP_HOST/PORT/USER/PASSWORD/STARTTLS and
+#   SKILLSCOUT_MAIL_FROM; without a host, mail is queued but not sent.
+# - Recipients must be plain addresses (no CR/LF, one "@"); SKILLSCOUT_MAIL_DOMAINS, when
+#   set, lists the only domains send_draft() will mail. A message that still cannot be
+#   built is marked dead, and a worker survives any error in its loop.
+import hashlib
+import json
+import os
+import random
+import smtplib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from email.message import EmailMessage
+from email.utils import parseaddr
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+OUTBOX_DB = Path(os.getenv("SKILLSCOUT_OUTBOX_DB", ROOT / "storage" / "outbox.db"))
+
+QUEUED, SENDING, SENT, DEAD = "queued", "sending", "sent", "dead"
+
+class SMTPSettings(NamedTuple):
+    host: Optional[str] = None
+    port: int = 25
+    user: Optional[str] = None
+    password: Optional[str] = None
+    starttls: bool = False
+    sender: str = "hr-agent@localhost"
+    timeout: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> "SMTPSettings":
+        return cls(host=os.getenv("SKILLSCOUT_SMTP_HOST") or None,
+                   port=int(os.getenv("SKILLSCOUT_SMTP_PORT", "25")),
+                   user=os.getenv("SKILLSCOUT_SMTP_USER") or None,
+                   password=os.getenv("SKILLSCOUT_SMTP_PASSWORD") or None,
+                   starttls=os.getenv("SKILLSCOUT_SMTP_STARTTLS", "0") == "1",
+                   sender=os.getenv("SKILLSCOUT_MAIL_FROM", "hr-agent@localhost"))
+
+class Message(NamedTuple):
+    id: int
+    session_id: str
+    to: List[str]
+    subject: str
+    body: str
+    attempts: int
+
+def split_draft(draft: str) -> Tuple[str, str]:
+    """('Subject: X\\n\\nbody') -> ('X', 'body'); drafts without a subject line get a default."""
+    head, sep, rest = draft.partition("\n")
+    if head.lower().startswith("subject:"):
+        return head[len("subject:"):].strip(), rest.lstrip("\n")
+    return "Hiring kickoff", draft
+
+def parse_recipients(to: Iterable[str]) -> List[str]:
+    """Bare, sorted, distinct addresses; ValueError on anything that is not one address."""
+    out = set()
+    for raw in to:
+        raw = (raw or "").strip()
+        if not raw:
+            continue
+        if any(c in raw for c in "\r\n\0"):
+            raise ValueError(f"invalid recipient {raw!r}")
+        _, addr = parseaddr(raw)
+        if addr.count("@") != 1 or not all(addr.split("@")) or any(c.isspace() for c in addr):
+            raise ValueError(f"invalid recipient {raw!r}")
+        out.add(addr)
+    return sorted(out)
+
+def build_email(sender: str, m: Message) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = sender
+    msg["To"] = ", ".join(m.to)
+    msg["Subject"] = m.subject
+    msg["X-SkillScout-Session"] = m.session_id or ""
+    msg.set_content(m.body)
+    return msg
+
+# ---------------- outbox ----------------
+@contextmanager
+def _transaction(db: sqlite3.Connection, mode: str = "IMMEDIATE") -> Iterator[sqlite3.Connection]:
+    """BEGIN <mode> ... COMMIT, rolled back on any error so the connection is never left mid-transaction."""
+    db.execute(f"BEGIN {mode}")
+    try:
+        yield db
+        db.execute("COMMIT")
+    except BaseException:
+        if db.in_transaction:  # some errors (SQLITE_FULL, ...) have already rolled it back
+            db.execute("ROLLBACK")
+        raise
+
+class Outbox:
+    def __init__(self, path=OUTBOX_DB):
+        self.path = Path(path)
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("""CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, session_id TEXT, recipients TEXT NOT NULL,
+                subject TEXT NOT NULL, body TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL,
+                due_at REAL NOT NULL, last_error TEXT, created_at REAL NOT NULL, sent_at REAL)""")
+            db.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox(status, due_at)")
+            self._db = db
+        return self._db
+
+    def enqueue(self, session_id: str, to: Iterable[str], subject: str, body: str) -> int:
+        """Queue a message (or return the id of the identical one already queued/sent)."""
+        rcpts = parse_recipients(to)
+        if not rcpts:
+            raise ValueError("no recipients")
+        key = hashlib.sha1(json.dumps([session_id, rcpts, subject, body]).encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            db.execute("INSERT OR IGNORE INTO outbox (key, session_id, recipients, subject, body, status, attempts, "
+                       "due_at, created_at) VALUES (?,?,?,?,?,?,0,?,?)",
+                       (key, session_id, json.dumps(rcpts), subject, body, QUEUED, now, now))
+            return db.execute("SELECT id FROM outbox WHERE key=?", (key,)).fetchone()[0]
+
+    def claim(self, limit: int, lease: float) -> List[Message]:
+        """Lease up to `limit` due messages (queued, or sending with an expired lease)."""
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            with _transaction(db):
+                rows = db.execute("SELECT id, session_id, recipients, subject, body, attempts FROM outbox "
+                                  "WHERE status IN (?, ?) AND due_at<=? ORDER BY due_at LIMIT ?",
+                                  (QUEUED, SENDING, now, limit)).fetchall()
+                db.executemany("UPDATE outbox SET status=?, attempts=attempts+1, due_at=? WHERE id=?",
+                               [(SENDING, now + lease, r[0]) for r in rows])
+        return [Message(r[0], r[1], json.loads(r[2]), r[3], r[4], r[5] + 1) for r in rows]
+
+    def settle(self, sent: List[int], retry: List[Tuple[int, float, str]], dead: List[Tuple[int, str]]) -> None:
+        """Record one batch's outcome: sent ids, (id, due_at, error) retries, (id, error) failures."""
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            with _transaction(db, "DEFERRED"):
+                db.executemany("UPDATE outbox SET status=?, sent_at=?, last_error=NULL WHERE id=?",
+                               [(SENT, now, i) for i in sent])
+                db.executemany("UPDATE outbox SET status=?, due_at=?, last_error=? WHERE id=?",
+                               [(QUEUED, due, err, i) for i, due, err in retry])
+                db.executemany("UPDATE outbox SET status=?, last_error=? WHERE id=?",
+                               [(DEAD, err, i) for i, err in dead])
+
+    def status(self, message_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn().execute("SELECT status, attempts, last_error, sent_at FROM outbox WHERE id=?",
+                                       (message_id,)).fetchone()
+        return dict(zip(("status", "attempts", "last_error", "sent_at"), row)) if row else None
+
+    def counts(self, session_id: Optional[str] = None) -> Dict[str, int]:
+        sql, args = "SELECT status, COUNT(*) FROM outbox", ()
+        if session_id is not None:
+            sql, args = sql + " WHERE session_id=?", (session_id,)
+        with self._lock:
+            rows = self._conn().execute(sql + " GROUP BY status", args).fetchall()
+        return {QUEUED: 0, SENDING: 0, SENT: 0, DEAD: 0, **dict(rows)}
+
+    def pending(self) -> int:
+        """Messages in flight or due now."""
+        with self._lock:
+            return self._conn().execute("SELECT COUNT(*) FROM outbox WHERE status=? OR (status=? AND due_at<=?)",
+                                        (SENDING, QUEUED, time.time())).fetchone()[0]
+
+    def next_due(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn().execute("SELECT MIN(due_at) FROM outbox WHERE status IN (?, ?)",
+                                       (QUEUED, SENDING)).fetchone()
+        return row[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+# ---------------- delivery ----------------
+class Mailer:
+    def __init__(self, outbox: Optional[Outbox] = None, settings: Optional[SMTPSettings] = None,
+                 workers: int = 2, batch: int = 10, lease: float = 120.0, max_attempts: int = 5,
+                 backoff: float = 2.0, max_backoff: float = 600.0, idle_close: float = 30.0,
+                 connect: Callable[..., smtplib.SMTP] = smtplib.SMTP, domains: Optional[Iterable[str]] = None):
+        self.outbox = outbox or Outbox()
+        self.settings = settings or SMTPSettings.from_env()
+        if domains is None:
+            domains = os.getenv("SKILLSCOUT_MAIL_DOMAINS", "").split(",")
+        self.domains = frozenset(d.strip().lower().lstrip("@") for d in domains if d.strip())  # empty: any
+        self.workers = workers
+        self.batch = batch
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.backoff, self.max_backoff = backoff, max_backoff
+        self.idle_close = idle_close
+        self._connect = connect
+        self._wake = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self._lock = threading.Lock()
+        self.stats = {"sent": 0, "retried": 0, "dead": 0, "connects": 0, "batches": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.settings.host)
+
+    def send_draft(self, session_id: str, to: Iterable[str], draft: str) -> int:
+        """Queue a drafted email ('Subject: ...' first line) for delivery; returns the outbox id."""
+        rcpts = self.check_recipients(to)
+        subject, body = split_draft(draft)
+        mid = self.outbox.enqueue(session_id, rcpts, subject, body)
+        if self.enabled:
+            self.start()
+            with self._wake:
+                self._wake.notify()
+        return mid
+
+    def check_recipients(self, to: Iterable[str]) -> List[str]:
+        """parse_recipients(), limited to the allowed domains; ValueError otherwise."""
+        rcpts = parse_recipients(to)
+        if not rcpts:
+            raise ValueError("no recipients")
+        outside = [a for a in rcpts if self.domains and a.rsplit("@", 1)[1].lower() not in self.domains]
+        if outside:
+            raise ValueError(f"recipients outside the allowed domains: {', '.join(outside)}")
+        return rcpts
+
+    # ---------- workers ----------
+    def start(self) -> None:
+        """Start the worker threads, or replace any that have died."""
+        with self._lock:
+            if not self.enabled:
+                return
+            self._threads = [t for t in self._threads if t.is_alive()]
+            if len(self._threads) >= self.workers:
+                return
+            self._stopping = False
+            fresh = [threading.Thread(target=self._run, name=f"mailer-{i}", daemon=True)
+                     for i in range(len(self._threads), self.workers)]
+            self._threads += fresh
+            for t in fresh:
+                t.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+            self._stopping = True
+        with self._wake:
+            self._wake.notify_all()
+        for t in threads:
+            t.join(timeout)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until nothing is due or in flight (retries scheduled for later do not count)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self.outbox.pending():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def _open(self) -> smtplib.SMTP:
+        s = self.settings
+        conn = self._connect(s.host, s.port, timeout=s.timeout)
+        conn.ehlo()
+        if s.starttls:
+            conn.starttls()
+            conn.ehlo()
+        if s.user:
+            conn.login(s.user, s.password or "")
+        with self._lock:
+            self.stats["connects"] += 1
+        return conn
+
+    def _delay(self, attempts: int) -> float:
+        return min(self.max_backoff, self.backoff * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+
+    def _run(self) -> None:
+        conn, idle_since = None, time.monotonic()
+        while not self._stopping:
+            try:
+                msgs = self.outbox.claim(self.batch, self.lease)
+                if not msgs:
+                    if conn is not None and time.monotonic() - idle_since > self.idle_close:
+                        _quit(conn)
+                        conn = None
+                    due = self.outbox.next_due()
+                    wait = 1.0 if due is None else min(1.0, max(0.01, due - time.time()))
+                    with self._wake:
+                        self._wake.wait(wait)
+                    continue
+                conn = self._deliver(conn, msgs)
+                idle_since = time.monotonic()
+            except Exception:
+                # outbox locked or unwritable, or a bug: whatever this batch leased comes back
+                # once the lease expires, so drop the connection, pause and carry on
+                with self._lock:
+                    self.stats["errors"] += 1
+                _quit(conn)
+                conn = None
+                with self._wake:
+                    self._wake.wait(min(self.max_backoff, self.backoff))
+        _quit(conn)
+
+    def _deliver(self, conn: Optional[smtplib.SMTP], msgs: List[Message]) -> Optional[smtplib.SMTP]:
+        """Send one claimed batch and settle it; returns the connection to keep using."""
+        sent, retry, dead = [], [], []
+
+        def failed(m: Message, err: str, permanent: bool = False) -> None:
+            if permanent or m.attempts >= self.max_attempts:
+                dead.append((m.id, err))
+            else:
+                retry.append((m.id, time.time() + self._delay(m.attempts), err))
+
+        for i, m in enumerate(msgs):
+            try:
+                built = build_email(self.settings.sender, m)
+            except (ValueError, TypeError) as e:  # e.g. a header the outbox let through: never sendable
+                failed(m, f"build: {type(e).__name__}: {e}", permanent=True)
+                continue
+            if conn is None:
+                try:
+                    conn = self._open()
+                except (smtplib.SMTPException, OSError) as e:
+                    # server unreachable or refusing us: the whole rest of the batch waits
+                    for rest in msgs[i:]:
+                        failed(rest, f"connect: {type(e).__name__}: {e}")
+                    break
+            try:
+                conn.send_message(built)
+                sent.append(m.id)
+            except smtplib.SMTPRecipientsRefused as e:
+                failed(m, f"recipients refused: {sorted(e.recipients)}", permanent=True)
+            except smtplib.SMTPResponseException as e:
+                failed(m, f"{e.smtp_code} {e.smtp_error!r}", permanent=e.smtp_code >= 500)
+                if e.smtp_code == 421:  # server is closing the connection
+                    _quit(conn)
+                    conn = None
+            except (smtplib.SMTPException, OSError) as e:
+                # dropped connection: reopen for the next message
+                _quit(conn)
+                conn = None
+                failed(m, f"{type(e).__name__}: {e}")
+            except (ValueError, TypeError) as e:  # raised while serialising the message
+                failed(m, f"build: {type(e).__name__}: {e}", permanent=True)
+        self.outbox.settle(sent, retry, dead)
+        with self._lock:
+            self.stats["sent"] += len(sent)
+            self.stats["retried"] += len(retry)
+            self.stats["dead"] += len(dead)
+            self.stats["batches"] += 1
+        return conn
+
+def _quit(conn: Optional[smtplib.SMTP]) -> None:
+    if conn is None:
+        return
+    try:
+        conn.quit()
+    except (smtplib.SMTPException, OSError):
+        conn.close()
+
+MAILER = Mailer()
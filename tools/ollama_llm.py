@@ -1,18 +1,157 @@
+import asyncio
+import json
 import os
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, Iterator, List, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
 
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class LLMError(RuntimeError):
+    pass
+
 class LocalLLM:
-    def __init__(self, model=None, host=None):
+    """
+    Ollama /api/generate client.
+
+    - one pooled requests.Session per client (keep-alive, `pool_size` connections)
+    - generate(): full completion; stream(): yields tokens as they arrive
+    - agenerate()/agenerate_many(): asyncio variants, concurrency bounded by a semaphore
+    - connection errors, timeouts and 429/5xx are retried with exponential backoff
+    - per-call metrics (latency, time to first token, tokens, tokens/s) in `history`
+    """
+
+    def __init__(self, model=None, host=None, timeout=(5.0, 120.0), retries: int = 2,
+                 backoff: float = 0.5, pool_size: int = 8, max_concurrency: int = 4):
         self.model = model or OLLAMA_MODEL
         self.host = (host or OLLAMA_HOST).rstrip("/")
+        self.timeout = timeout  # (connect, read) seconds
+        self.retries = retries
+        self.backoff = backoff
+        self.max_concurrency = max_concurrency
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.history: deque = deque(maxlen=256)
+        self._lock = threading.Lock()
+        # one default semaphore per event loop: a semaphore is bound to the loop it first
+        # waits on, and each asyncio.run() starts a new one
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
 
-    def generate(self, prompt: str) -> str:
-        """Call Ollama locally (no streaming)."""
+    # ---------- transport ----------
+    def _post(self, prompt: str, stream: bool):
+        """POST with retries; returns (response, attempts)."""
         url = f"{self.host}/api/generate"
-        payload = {"model": self.model, "prompt": prompt, "stream": False}
-        r = requests.post(url, json=payload, timeout=120)
-        r.raise_for_status()
-        return r.json().get("response", "")
+        payload = {"model": self.model, "prompt": prompt, "stream": stream}
+        for attempt in range(self.retries + 1):
+            try:
+                r = self.session.post(url, json=payload, timeout=self.timeout, stream=stream)
+                if r.status_code not in RETRY_STATUS:
+                    if r.status_code >= 400:  # not retryable (bad model name, bad request, ...)
+                        r.close()
+                        raise LLMError(f"Ollama returned HTTP {r.status_code}")
+                    return r, attempt + 1
+                r.close()
+                err: Exception = LLMError(f"Ollama returned HTTP {r.status_code}")
+            except (requests.ConnectionError, requests.Timeout) as e:
+                err = e
+            if attempt < self.retries:
+                time.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random() / 2))
+        raise LLMError(f"Ollama request failed after {self.retries + 1} attempts: {err}") from err
+
+    def _record(self, started: float, first_token: Optional[float], tokens: int,
+                eval_duration_ns: Optional[int], attempts: int) -> Dict:
+        latency = time.perf_counter() - started
+        gen_s = eval_duration_ns / 1e9 if eval_duration_ns else (latency - (first_token or 0.0))
+        m = {
+            "latency_s": latency,
+            "first_token_s": first_token,
+            "tokens": tokens,
+            "tokens_per_s": tokens / gen_s if tokens and gen_s > 0 else 0.0,
+            "attempts": attempts,
+        }
+        with self._lock:
+            self.history.append(m)
+        return m
+
+    # ---------- sync API ----------
+    def generate(self, prompt: str) -> str:
+        """Full completion in one response."""
+        t0 = time.perf_counter()
+        r, attempts = self._post(prompt, stream=False)
+        body = r.json()
+        text = body.get("response", "")
+        self._record(t0, None, body.get("eval_count") or len(text.split()),
+                     body.get("eval_duration"), attempts)
+        return text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield response fragments as Ollama produces them."""
+        t0 = time.perf_counter()
+        r, attempts = self._post(prompt, stream=True)
+        first, chunks, final = None, 0, {}
+        try:
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                msg = json.loads(line)
+                if msg.get("error"):
+                    raise LLMError(msg["error"])
+                piece = msg.get("response", "")
+                if piece:
+                    if first is None:
+                        first = time.perf_counter() - t0
+                    chunks += 1
+                    yield piece
+                if msg.get("done"):
+                    final = msg
+                    break
+        finally:
+            r.close()
+        self._record(t0, first, final.get("eval_count") or chunks, final.get("eval_duration"), attempts)
+
+    # ---------- async API ----------
+    async def agenerate(self, prompt: str, semaphore: Optional[asyncio.Semaphore] = None) -> str:
+        if semaphore is None:
+            loop = asyncio.get_running_loop()
+            with self._lock:
+                semaphore = self._semaphores.get(loop)
+                if semaphore is None:
+                    semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        async with semaphore:
+            return await asyncio.to_thread(self.generate, prompt)
+
+    async def agenerate_many(self, prompts: List[str], concurrency: Optional[int] = None) -> List[str]:
+        """Run prompts concurrently (at most `concurrency` in flight); results keep input order."""
+        sem = asyncio.Semaphore(concurrency) if concurrency else None  # None: the loop's shared one
+        return list(await asyncio.gather(*(self.agenerate(p, sem) for p in prompts)))
+
+    # ---------- metrics ----------
+    def metrics_summary(self) -> Dict[str, float]:
+        with self._lock:
+            calls = list(self.history)
+        if not calls:
+            return {"calls": 0}
+        lat = sorted(c["latency_s"] for c in calls)
+        return {
+            "calls": len(calls),
+            "p50_latency_s": lat[len(lat) // 2],
+            "max_latency_s": lat[-1],
+            "tokens": sum(c["tokens"] for c in calls),
+            "mean_tokens_per_s": sum(c["tokens_per_s"] for c in calls) / len(calls),
+            "retries": sum(c["attempts"] - 1 for c in calls),
+        }
+
+    def close(self) -> None:
+        self.session.close()
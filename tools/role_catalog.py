@@ -0,0 +1,200 @@
+# tools/role_catalog.py
+# Role catalogue: data/roles.yml compiled into a cached binary index (Python 3.9–safe)
+#
+# - Paths are resolved from the repo root, not the working directory.
+# - Lazy: nothing is read until the first lookup.
+# - The compiled index (pickle) is reused across processes while roles.yml is unchanged,
+#   so cold starts skip the YAML parse.
+# - Hot reload: roles.yml's mtime/size is re-checked at most every `check_interval` seconds.
+#   A file that is missing or fails to parse keeps the last good index (error in `last_error`).
+# - Lookups accept any casing/punctuation of a title or one of its `aliases:`; match()
+#   also resolves titles no alias covers to the nearest role (tools/role_matcher.py).
+# - `python -m tools.role_catalog` prebuilds the index (e.g. at image build time), so even
+#   the first process after a deploy never parses YAML.
+
+import hashlib
+import os
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+ROLES_PATH = ROOT / "data" / "roles.yml"
+CACHE_DIR = Path(os.getenv("SKILLSCOUT_CACHE_DIR", ROOT / "storage" / "cache"))
+INDEX_FORMAT = 1
+MATCH_CACHE = 1024  # most recent match() results kept per catalogue version
+
+_NON_ALNUM = re.compile(r"[^a-z0-9+#]+")
+
+def normalize_title(title: str) -> str:
+    """'GenAI  Intern' / 'genai-intern' / 'Genai Intern' -> 'genai intern'."""
+    return _NON_ALNUM.sub(" ", (title or "").lower()).strip()
+
+def compile_index(raw: bytes) -> Dict:
+    """Parse roles YAML and build {version, roles, lookup} (ValueError on an invalid catalogue)."""
+    import yaml  # only needed when the index has to be (re)built
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # libyaml when available
+    try:
+        data = yaml.load(raw.decode("utf-8"), Loader=loader) or {}
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        raise ValueError(f"unreadable roles file: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"invalid role catalogue: expected a mapping, got {type(data).__name__}")
+    roles: Dict[str, Dict] = {}
+    lookup: Dict[str, str] = {}
+    try:
+        for title, spec in data.items():
+            spec = dict(spec or {})
+            aliases = spec.pop("aliases", []) or []
+            roles[title] = spec
+            for name in [title] + list(aliases):
+                lookup.setdefault(normalize_title(name), title)
+    except (TypeError, ValueError, AttributeError) as e:
+        raise ValueError(f"invalid role catalogue: {e!r}") from e
+    return {
+        "format": INDEX_FORMAT,
+        "version": hashlib.sha1(raw).hexdigest()[:12],
+        "roles": roles,
+        "lookup": lookup,
+    }
+
+class RoleCatalog:
+    def __init__(self, path: Path = ROLES_PATH, cache_dir: Optional[Path] = CACHE_DIR,
+                 check_interval: float = 1.0, match_cache: int = MATCH_CACHE):
+        self.path = Path(path)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.check_interval = check_interval
+        self._index: Optional[Dict] = None
+        self._stamp = None          # (mtime_ns, size) of the YAML the index was built from
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._matcher = None        # (version, RoleIndex, LRU of (title, min_score) -> role or None)
+        self._match_lock = threading.Lock()
+        self.match_cache = match_cache
+        self.last_error: Optional[str] = None
+        self.stats = {"loads": 0, "index_hits": 0, "reloads": 0, "errors": 0}
+
+    # ---------- loading ----------
+    def _index_path(self) -> Optional[Path]:
+        if not self.cache_dir:
+            return None
+        tag = hashlib.sha1(str(self.path.resolve()).encode("utf-8")).hexdigest()[:8]
+        return self.cache_dir / f"{self.path.stem}.{tag}.idx"
+
+    def _load(self, stamp) -> Dict:
+        idx_path = self._index_path()
+        if idx_path and idx_path.exists():
+            try:
+                with idx_path.open("rb") as f:
+                    cached = pickle.load(f)
+                if cached.get("format") == INDEX_FORMAT and cached.get("stamp") == stamp:
+                    self.stats["index_hits"] += 1
+                    return cached
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                pass  # corrupt or stale: rebuild below
+        index = compile_index(self.path.read_bytes())
+        index["stamp"] = stamp
+        if idx_path:
+            try:
+                idx_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = idx_path.with_suffix(f".{os.getpid()}.tmp")
+                with tmp.open("wb") as f:
+                    pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, idx_path)
+            except OSError:
+                pass  # read-only deploys still work, just without the cached index
+        return index
+
+    def _current(self) -> Dict:
+        now = time.monotonic()
+        index = self._index
+        if index is not None and now - self._checked_at < self.check_interval:
+            return index
+        with self._lock:
+            if self._index is not None and now - self._checked_at < self.check_interval:
+                return self._index
+            try:
+                st = self.path.stat()
+            except OSError as e:
+                # missing for a moment (an editor or deploy replacing it): keep the index we have
+                if self._index is None:
+                    raise
+                self.stats["errors"] += 1
+                self.last_error = str(e)
+                self._checked_at = now
+                return self._index
+            stamp = (st.st_mtime_ns, st.st_size)
+            if self._index is None or stamp != self._stamp:
+                try:
+                    new = self._load(stamp)
+                except (ValueError, OSError) as e:
+                    if self._index is None:
+                        raise
+                    self.stats["errors"] += 1
+                    self.last_error = str(e)
+                else:
+                    if self._index is not None:
+                        self.stats["reloads"] += 1
+                    self._index, self.last_error = new, None
+                    self.stats["loads"] += 1
+                self._stamp = stamp  # a broken file is not retried until it changes again
+            self._checked_at = now
+            return self._index
+
+    # ---------- lookups ----------
+    @property
+    def version(self) -> str:
+        """Content hash of the catalogue; changes whenever roles.yml changes."""
+        return self._current()["version"]
+
+    def resolve(self, title: str) -> Optional[str]:
+        """Canonical catalogue title for a title or alias, or None."""
+        return self._current()["lookup"].get(normalize_title(title))
+
+    def get(self, title: str) -> Optional[Dict]:
+        index = self._current()
+        canonical = index["lookup"].get(normalize_title(title))
+        return index["roles"][canonical] if canonical else None
+
+    def titles(self) -> List[str]:
+        return list(self._current()["roles"])
+
+    def names(self) -> Dict[str, str]:
+        """Every normalised title and alias -> its canonical title."""
+        return dict(self._current()["lookup"])
+
+    def match(self, title: str, min_score: Optional[float] = None) -> Optional[str]:
+        """resolve(), falling back to the most similar catalogue role (None if none is close)."""
+        canonical = self.resolve(title)
+        if canonical is not None:
+            return canonical
+        from tools.role_matcher import MIN_SCORE, RoleIndex
+
+        version = self.version
+        matcher = self._matcher
+        if matcher is None or matcher[0] != version:
+            index = RoleIndex(list(self.names().items()), self.cache_dir / "role_match" if self.cache_dir else None)
+            matcher = self._matcher = (version, index, OrderedDict())
+        _, index, recent = matcher
+        key = (title, min_score)
+        with self._match_lock:
+            if key in recent:
+                recent.move_to_end(key)
+                return recent[key]
+        role = index.best(title, MIN_SCORE if min_score is None else min_score)
+        with self._match_lock:
+            recent[key] = role
+            while len(recent) > self.match_cache:
+                recent.popitem(last=False)
+        return role
+
+CATALOG = RoleCatalog()
+
+if __name__ == "__main__":
+    titles = CATALOG.titles()
+    print(f"{len(titles)} roles indexed from {CATALOG.path} -> {CATALOG._index_path()}")
@@ -0,0 +1,252 @@
+# tools/role_matcher.py
+# Nearest-role lookup for titles and requests that match no alias (Python 3.9–safe)
+#
+# - Each catalogue name (a title or one of its aliases) is vectorised once as TF-IDF over
+#   the character trigrams of its words plus the words themselves, so "machine-learning
+#   engineers", "founding engg" or "gen-ai internship" still land on the role they inflect
+#   or misspell. Rows are L2-normalised, so a dot product is the cosine.
+# - A match scores min(cosine, coverage), where coverage is the share of the name's weight
+#   the query contains: "engineer" alone is close to "ML Engineer" by cosine but covers
+#   only part of it, so generic requests fall through to the caller's default.
+# - Query words made mostly of trigrams the catalogue never uses are dropped first, so
+#   filler in a request ("i need to hire … asap") neither dilutes the role it names nor
+#   matches on one stray trigram.
+# - The weights are one memory-mapped matrix, storage/cache/role_match/<hash>.v<format>.npy:
+#   a (row, weight) posting per name and feature, grouped by feature. <hash>.v<format>.json
+#   next to it holds the features, their idf and offsets, and the labels. A query gathers
+#   the postings of its features and gets every name's cosine and coverage from two
+#   np.bincount calls. A name's coverage is at most the sum of its features' largest
+#   squared weights, so a query whose features sum to less than min_score stops before
+#   numpy: intake's typical miss ("need a frontend engineer, austin, …") costs only the
+#   feature lookup.
+# - Indexes are keyed by a hash of the names: each catalogue version is built once and
+#   later processes just map the file. Publishing one deletes all but the KEEP most
+#   recently used versions in its directory. numpy is imported on first use.
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tools.role_catalog import normalize_title
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(os.getenv("SKILLSCOUT_CACHE_DIR", ROOT / "storage" / "cache")) / "role_match"
+INDEX_FORMAT = 4
+MIN_SCORE = 0.7
+KEEP = 8           # index versions kept in a cache dir (most recently used)
+MEMO_WORDS = 4096  # query words whose feature ids an index remembers
+
+def features(text: str) -> Counter:
+    """Word-bounded character trigrams plus whole words ('w:<word>') of the normalised text."""
+    out: Counter = Counter()
+    for word in normalize_title(text).split():
+        padded = f" {word} "
+        out.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        out["w:" + word] += 1
+    return out
+
+def word_features(word: str, vocab: Dict[str, int]) -> Tuple[int, ...]:
+    """
+    Catalogue feature ids of one normalised word; () unless the catalogue uses at least half
+    of its trigrams, since anything else is filler to the index.
+    """
+    padded = f" {word} "
+    hits = [vocab.get(padded[i:i + 3]) for i in range(len(padded) - 2)]
+    known = [fid for fid in hits if fid is not None]
+    if 2 * len(known) < len(hits):
+        return ()
+    fid = vocab.get("w:" + word)
+    return tuple(known) if fid is None else (*known, fid)
+
+def query_features(text: str, vocab: Dict[str, int], memo: Optional[Dict[str, Tuple[int, ...]]] = None) -> Counter:
+    """features() of `text` as catalogue feature ids (see word_features); `memo` caches words."""
+    out: Counter = Counter()
+    for word in normalize_title(text).split():
+        fids = memo.get(word) if memo is not None else None
+        if fids is None:
+            fids = word_features(word, vocab)
+            if memo is not None and len(memo) < MEMO_WORDS:
+                memo[word] = fids
+        out.update(fids)
+    return out
+
+def _posting_dtype():
+    import numpy as np
+
+    return np.dtype([("row", np.intp), ("weight", np.float64)])
+
+def build_index(names: Sequence[Tuple[str, str]]) -> Dict:
+    """(name, label) pairs -> {vocab, labels, idf, indptr, postings}; postings[indptr[f]:indptr[f + 1]] are feature f's."""
+    import numpy as np
+
+    vocab: Dict[str, int] = {}
+    doc_feats: List[int] = []
+    doc_rows: List[int] = []
+    doc_tf: List[int] = []
+    for row, (name, _) in enumerate(names):
+        for feat, tf in features(name).items():
+            doc_feats.append(vocab.setdefault(feat, len(vocab)))
+            doc_rows.append(row)
+            doc_tf.append(tf)
+    feats = np.asarray(doc_feats, dtype=np.intp)
+    rows = np.asarray(doc_rows, dtype=np.intp)
+    weights = np.asarray(doc_tf, dtype=np.float64)
+    n = len(names)
+    df = np.bincount(feats, minlength=len(vocab))
+    idf = np.log((1 + n) / (1 + df)) + 1
+    weights *= idf[feats]
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n))
+    weights /= np.where(norms > 0, norms, 1)[rows]
+    order = np.argsort(feats, kind="stable")  # row-major -> grouped by feature
+    postings = np.empty(len(order), dtype=_posting_dtype())
+    postings["row"], postings["weight"] = rows[order], weights[order]
+    indptr = np.zeros(len(vocab) + 1, dtype=np.intp)
+    np.cumsum(df, out=indptr[1:])
+    return {"vocab": vocab, "labels": [label for _, label in names], "idf": idf, "indptr": indptr,
+            "postings": postings}
+
+def prune(cache_dir: Path, keep: int = KEEP) -> None:
+    """Delete all but the `keep` most recently used indexes, and temp files over an hour old."""
+    try:
+        entries = [(p.stat().st_mtime, p) for p in cache_dir.iterdir()]
+    except OSError:
+        return  # missing, or raced with another prune
+    now = time.time()
+    metas = sorted((e for e in entries if e[1].suffix == ".json"), reverse=True)
+    stale = [path for _, meta in metas[keep:] for path in (meta, meta.with_suffix(".npy"))]
+    stale += [p for mtime, p in entries if p.suffix == ".tmp" and now - mtime > 3600]
+    for path in stale:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+class RoleIndex:
+    def __init__(self, names: Sequence[Tuple[str, str]], cache_dir: Optional[Path] = CACHE_DIR):
+        names = [(str(name), str(label)) for name, label in names]
+        self.key = hashlib.sha1(repr(names).encode("utf-8")).hexdigest()[:16]
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.size = len(names)
+        self._names = names
+        self._index: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self.stats = {"builds": 0, "loads": 0, "queries": 0, "skipped": 0}
+
+    def _path(self) -> Optional[Path]:
+        """The postings matrix; its metadata is the same path with a .json suffix."""
+        return self.cache_dir / f"{self.key}.v{INDEX_FORMAT}.npy" if self.cache_dir else None
+
+    def _load(self) -> Dict:
+        import numpy as np
+
+        path = self._path()
+        meta_path = path.with_suffix(".json") if path is not None else None
+        if meta_path is not None and meta_path.exists():  # written last: the matrix is complete
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                postings = np.load(path, mmap_mode="r")
+                if postings.dtype != _posting_dtype():
+                    raise ValueError(f"unexpected postings dtype {postings.dtype}")
+                index = {"vocab": {feat: i for i, feat in enumerate(meta["features"])}, "labels": meta["labels"],
+                         "idf": np.asarray(meta["idf"], dtype=np.float64),
+                         "indptr": np.asarray(meta["indptr"], dtype=np.intp),
+                         "postings": np.asarray(postings)}  # a plain view: indexing a np.memmap is slow
+                self.stats["loads"] += 1
+                try:
+                    os.utime(meta_path)  # recently used: kept by prune()
+                except OSError:
+                    pass
+                return index
+            except (OSError, ValueError, KeyError):
+                pass  # partial or corrupt: rebuild below
+        index = build_index(self._names)
+        self.stats["builds"] += 1
+        if path is not None:
+            tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with tmp.open("wb") as f:
+                    np.save(f, index["postings"])
+                os.replace(tmp, path)
+                meta = {"features": list(index["vocab"]), "idf": index["idf"].tolist(),
+                        "indptr": index["indptr"].tolist(), "labels": index["labels"]}
+                tmp.write_text(json.dumps(meta), encoding="utf-8")
+                os.replace(tmp, meta_path)
+            except OSError:
+                # read-only deploy: use ours from memory
+                tmp.unlink(missing_ok=True)
+            prune(self.cache_dir)
+        return index
+
+    def _current(self) -> Dict:
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    import numpy as np
+
+                    index = self._load()
+                    w2, indptr = index["postings"]["weight"] ** 2, index["indptr"]
+                    # per feature, the most any one name's coverage can gain from it
+                    index["cap"] = np.maximum.reduceat(w2, indptr[:-1]).tolist() if len(w2) else []
+                    index["memo"] = {}  # see MEMO_WORDS
+                    self._index = index
+                    self._names = []  # the index holds everything from here on
+                index = self._index
+        return index
+
+    def top(self, text: str, k: int = 3, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """Up to k (label, score) pairs scoring at least min_score, best first; each label by its best name."""
+        import numpy as np
+
+        index = self._current()
+        self.stats["queries"] += 1
+        counts = query_features(text, index["vocab"], index["memo"])
+        if not counts:
+            return []
+        if min_score > 0 and sum(index["cap"][fid] for fid in counts) < min_score:
+            self.stats["skipped"] += 1
+            return []  # no name's coverage can reach min_score
+        ids = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        q = np.fromiter(counts.values(), dtype=np.float64, count=len(counts)) * index["idf"][ids]
+        q /= math.sqrt(float(q @ q))
+        starts, ends = index["indptr"][ids], index["indptr"][ids + 1]
+        lengths = ends - starts
+        hits = index["postings"][np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())]
+        rows, w = hits["row"], hits["weight"]
+        cosine = np.bincount(rows, weights=w * np.repeat(q, lengths), minlength=self.size)
+        coverage = np.bincount(rows, weights=w * w, minlength=self.size)
+        scores = np.minimum(cosine, coverage)
+        cand = np.flatnonzero(scores >= min_score) if min_score > 0 else np.flatnonzero(scores > 0)
+        m = 4 * k  # rank only the best few rows, widening if aliases of one label fill them
+        while True:
+            best = cand if len(cand) <= m else cand[np.argpartition(scores[cand], -m)[-m:]]
+            out: Dict[str, float] = {}
+            for row in best[np.lexsort((best, -scores[best]))]:
+                label = index["labels"][row]
+                if label not in out:
+                    out[label] = round(float(scores[row]), 4)
+                    if len(out) == k:
+                        return list(out.items())
+            if len(best) == len(cand):
+                return list(out.items())
+            m *= 8
+
+    def best(self, text: str, min_score: float = MIN_SCORE) -> Optional[str]:
+        """The nearest label if it scores at least min_score."""
+        hits = self.top(text, 1, min_score)
+        return hits[0][0] if hits else None
+
+if __name__ == "__main__":
+    import sys
+
+    from tools.role_catalog import CATALOG
+
+    idx = RoleIndex(list(CATALOG.names().items()))
+    for query in sys.argv[1:] or ["machine-learning engineers", "gen-ai internship"]:
+        print(query, "->", idx.top(query))
@@ -1,92 +1,321 @@
+# tools/rules.py
+# Rule engine for intake and clarifying questions, driven by data/rules.yml
+#
+# - One rule set covers role detection, slot extraction (budget, timeline, location,
+#   hiring type, skills) and which clarifying questions to ask; nodes/intake.py and
+#   nodes/clarifier.py only apply it.
+# - Compiled once into a RuleSet: every keyword goes into a single trie-shaped regex
+#   (SlotExtractor), and the questions into a decision table indexed by the bitmask of
+#   missing slots, so asking is one list lookup.
+# - Versioned: RuleSet.version is the config's `version:` plus a content hash.
+# - Hot-swappable: the file's mtime/size is re-checked at most every `check_interval`
+#   seconds and a changed file is compiled into a new RuleSet that replaces the old one
+#   atomically; a file that fails to compile keeps the previous rules (see `last_error`).
+#   RuleEngine.swap() installs a rule set directly (tests, experiments).
+# - Like tools/role_catalog.py, the compiled rule set is pickled under storage/cache, so
+#   later processes skip the YAML parse (and the yaml import).
+import hashlib
+import os
+import pickle
 import re
-from typing import List, Dict, Optional
-from state import RoleSpec, Slots
-
-ROLE_PATTERNS = [
-    (r"founding engineer", "Founding Engineer"),
-    (r"\bgenai intern\b|\bai intern\b|\bml intern\b", "GenAI Intern"),
-    (r"software engineer", "Software Engineer"),
-    (r"data engineer", "Data Engineer"),
-    (r"ml engineer|machine learning engineer", "ML Engineer"),
-]
-
-def detect_roles(text: str) -> List[RoleSpec]:
-    t = text.lower()
-    roles = []
-    for pat, title in ROLE_PATTERNS:
-        if re.search(pat, t):
-            roles.append(RoleSpec(title=title))
-    return roles
-
-def clarifying_questions(slots: Slots) -> List[str]:
-    qs = []
-    if not slots.roles:
-        qs.append("Which role(s) do you want to hire? (e.g., Founding Engineer, GenAI Intern)")
-    if not slots.budget:
-        qs.append("What is your budget range? (e.g., $160k–$200k base + equity / $25–$35 per hour)")
-    if not slots.timeline:
-        qs.append("What is your hiring timeline? (e.g., 4–6 weeks)")
-    if not slots.location:
-        qs.append("Is the role remote, hybrid, or onsite?")
-    if not slots.hiring_type:
-        qs.append("Is this full-time, intern, or contract?")
-    return qs[:3]
-
-def jd_from_template(role: RoleSpec, slots: Slots) -> str:
-    comp = slots.budget or "Compensation: TBD"
-    return f"""### {role.title}
-
-**Summary**  
-We’re hiring a {role.title} to help build and scale our early product.
-
-**Responsibilities**
-- Own key features end-to-end
-- Collaborate with founders and cross-functional partners
-- Write clean, testable code and ship quickly
-- Improve reliability, performance, and security
-- Contribute to team processes and documentation
-
-**Requirements (Must-have)**
-- Solid Python/JavaScript (or relevant stack)
-- Strong problem solving; ability to move fast with quality
-- Communication skills and ownership mindset
-
-**Nice-to-have**
-- Startup or 0→1 experience
-- GenAI/LangChain/LangGraph familiarity
-
-**{comp}**  
-**Apply:** careers@example.com
-"""
-
-def hiring_checklist(slots: Slots) -> List[Dict[str, str]]:
-    return [
-        {"stage": "Intake", "owner": "HR", "exit": "JD approved"},
-        {"stage": "Sourcing", "owner": "Recruiter", "exit": "10 qualified candidates"},
-        {"stage": "Screening", "owner": "HR", "exit": "Shortlist confirmed"},
-        {"stage": "Technical", "owner": "Engineering", "exit": "Tech evaluation complete"},
-        {"stage": "Culture/Founder", "owner": "Founder", "exit": "Culture fit approved"},
-        {"stage": "Offer", "owner": "HR", "exit": "Offer accepted"},
-        {"stage": "Onboarding", "owner": "Manager", "exit": "Hired onboarded"},
-    ]
-
-def kickoff_email(roles: List[RoleSpec], timeline: Optional[str], budget: Optional[str]) -> str:
-    roles_txt = ", ".join([r.title for r in roles]) or "TBD"
-    t = timeline or "TBD"
-    b = budget or "TBD"
-    return f"""Subject: Hiring Plan Kickoff
-
-Hi Team,
-
-We are planning to hire for: {roles_txt}
-Timeline: {t}
-Budget: {b}
-
-Next Steps:
-1) Finalize Job Descriptions
-2) Begin Sourcing
-3) Schedule Interviews
-
-Thanks,
-HR Agent
-"""
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from state import Slots
+
+ROOT = Path(__file__).resolve().parent.parent
+RULES_PATH = Path(os.getenv("SKILLSCOUT_RULES", ROOT / "data" / "rules.yml"))
+CACHE_DIR = Path(os.getenv("SKILLSCOUT_CACHE_DIR", ROOT / "storage" / "cache"))
+INDEX_FORMAT = 1
+MAX_TABLE_SLOTS = 12  # decision tables up to 2**12 rows are precomputed; beyond, rows fill on demand
+
+# ---------------- slot extraction ----------------
+class Extraction(NamedTuple):
+    roles: Tuple[str, ...]          # canonical role keys, in rule order
+    budget: Optional[str]
+    timeline: Optional[str]
+    location: Optional[str]
+    hiring_type: Optional[str]
+    skills: Tuple[str, ...]         # sorted
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Regex that matches the longest of `words` at a position, branching char by char."""
+    trie: Dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        end = "" in node
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if end:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+class SlotExtractor:
+    """
+    Single-pass role/slot extractor compiled once from the keyword tables.
+
+    All role aliases, locations, hiring types and skills are folded into one trie-shaped
+    regex matched through a lookahead, so one pass over the text reports every keyword
+    occurrence, overlapping ones included (e.g. "intern" inside "genai intern"). Budget
+    and timeline use their own precompiled patterns, which stop at the first hit.
+    Locations and hiring types map keyword -> slot value; the first listed one found wins.
+    """
+
+    def __init__(self, role_aliases: Dict[str, List[str]], locations: Dict[str, str],
+                 hiring_types: Dict[str, str], skills: List[str], budget_re: str, timeline_re: str):
+        self.role_order = {canonical: i for i, canonical in enumerate(role_aliases)}
+        self.location_order = {loc: i for i, loc in enumerate(locations)}
+        self.type_order = {ty: i for i, ty in enumerate(hiring_types)}
+        self.locations = dict(locations)
+        self.hiring_types = dict(hiring_types)
+
+        tags: Dict[str, List[Tuple[str, str]]] = {}
+        for canonical, keys in role_aliases.items():
+            for k in keys:
+                tags.setdefault(k, []).append(("role", canonical))
+        for loc in locations:
+            tags.setdefault(loc, []).append(("location", loc))
+        for ty in hiring_types:
+            tags.setdefault(ty, []).append(("type", ty))
+        for s in skills:
+            tags.setdefault(s, []).append(("skill", s))
+
+        # The regex reports the longest keyword at a position; every other keyword
+        # starting there is a prefix of it, so precompute those hits per keyword.
+        by_first: Dict[str, List[str]] = {}
+        for k in tags:
+            by_first.setdefault(k[:1], []).append(k)
+        self.hits: Dict[str, Tuple[Tuple[str, str], ...]] = {
+            w: tuple(t for k in by_first[w[:1]] if w.startswith(k) for t in tags[k]) for w in tags
+        }
+
+        kw = _trie_regex(tags) or "(?!)"
+        self.keywords = re.compile(rf"(?=({kw}))")
+        self.budget = re.compile(budget_re)
+        self.timeline = re.compile(timeline_re)
+
+    def scan(self, text: str) -> Extraction:
+        t = text.lower()
+        m = self.budget.search(t)
+        budget = m.group(0).replace(" ", "") if m else None
+        m = self.timeline.search(t)
+        timeline = m.group(0) if m else None
+
+        roles, locs, types, skills = set(), set(), set(), set()
+        buckets = {"role": roles, "location": locs, "type": types, "skill": skills}
+        for k in set(self.keywords.findall(t)):
+            for kind, value in self.hits[k]:
+                buckets[kind].add(value)
+
+        return Extraction(
+            roles=tuple(sorted(roles, key=self.role_order.get)),
+            budget=budget,
+            timeline=timeline,
+            location=self.locations[min(locs, key=self.location_order.get)] if locs else None,
+            hiring_type=self.hiring_types[min(types, key=self.type_order.get)] if types else None,
+            skills=tuple(sorted(skills)),
+        )
+
+# ---------------- questions ----------------
+class Question(NamedTuple):
+    slot: str
+    ask: str
+    hint: Optional[str]  # format string over `market`, appended when its fields are known
+
+class RuleSet:
+    """A compiled, immutable rule set; see the module header."""
+
+    def __init__(self, config: Dict, version: str):
+        self.config = config
+        self.version = version
+        self.default_role: str = config["default_role"]
+        self.role_match: float = float(config.get("role_match", 0.7))
+        self.role_aliases: Dict[str, List[str]] = {k: list(v) for k, v in config["roles"].items()}
+        self.locations: Dict[str, str] = dict(config["locations"])
+        self.hiring_types: Dict[str, str] = dict(config["hiring_types"])
+        self.skills: List[str] = list(config["skills"])
+        self.budget_re: str = config["patterns"]["budget"]
+        self.timeline_re: str = config["patterns"]["timeline"]
+        self.extractor = SlotExtractor(self.role_aliases, self.locations, self.hiring_types, self.skills,
+                                       self.budget_re, self.timeline_re)
+
+        self.questions = tuple(Question(q["slot"], q["ask"], q.get("hint")) for q in config["questions"])
+        unknown = {q.slot for q in self.questions} - set(Slots.model_fields)
+        if unknown:
+            raise ValueError(f"questions refer to unknown slots: {sorted(unknown)}")
+        self.slots: Tuple[str, ...] = tuple(dict.fromkeys(q.slot for q in self.questions))
+        self.max_questions = int(config.get("max_questions") or 0) or len(self.questions)
+        # decision table: bitmask of missing slots -> indices of the questions to ask
+        self._table: Dict[int, Tuple[int, ...]] = {}
+        if len(self.slots) <= MAX_TABLE_SLOTS:
+            for mask in range(1 << len(self.slots)):
+                self._row(mask)
+
+    def _row(self, mask: int) -> Tuple[int, ...]:
+        row = self._table.get(mask)
+        if row is None:
+            bit = {s: 1 << i for i, s in enumerate(self.slots)}
+            row = tuple(i for i, q in enumerate(self.questions) if mask & bit[q.slot])[:self.max_questions]
+            self._table[mask] = row
+        return row
+
+    def missing_mask(self, slots: Slots) -> int:
+        mask = 0
+        for i, name in enumerate(self.slots):
+            if not getattr(slots, name):
+                mask |= 1 << i
+        return mask
+
+    def scan(self, text: str) -> Extraction:
+        return self.extractor.scan(text)
+
+    def ask(self, slots: Slots, market: Optional[Dict] = None) -> List[str]:
+        """Clarifying questions for the slots still empty, in rule order."""
+        out = []
+        for i in self._row(self.missing_mask(slots)):
+            q = self.questions[i]
+            text = q.ask
+            if q.hint:
+                try:
+                    text += q.hint.format(market=market or {})
+                except (KeyError, IndexError):
+                    pass  # hint needs a market field nobody suggested
+            out.append(text)
+        return out
+
+def compile_rules(raw: bytes) -> RuleSet:
+    """Parse rules YAML into a RuleSet (ValueError on an invalid rule set)."""
+    import yaml  # only needed when the rule set has to be (re)built
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        config = yaml.load(raw.decode("utf-8"), Loader=loader) or {}
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        raise ValueError(f"unreadable rules file: {e}") from e
+    if not isinstance(config, dict):
+        raise ValueError(f"invalid rule set: expected a mapping, got {type(config).__name__}")
+    try:
+        version = f"{config.get('version', 0)}-{hashlib.sha1(raw).hexdigest()[:8]}"
+        return RuleSet(config, version)
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"invalid rule set: {e!r}") from e
+    except re.error as e:
+        raise ValueError(f"invalid rule pattern: {e}") from e
+
+# ---------------- engine ----------------
+class RuleEngine:
+    def __init__(self, path: Path = RULES_PATH, cache_dir: Optional[Path] = CACHE_DIR,
+                 check_interval: float = 1.0):
+        self.path = Path(path)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.check_interval = check_interval
+        self._rules: Optional[RuleSet] = None
+        self._stamp = None          # (mtime_ns, size) of the file the rules came from; None when swapped in
+        self._pinned = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.last_error: Optional[str] = None
+        self.stats = {"loads": 0, "index_hits": 0, "reloads": 0, "errors": 0, "swaps": 0}
+
+    def _index_path(self) -> Optional[Path]:
+        if not self.cache_dir:
+            return None
+        tag = hashlib.sha1(str(self.path.resolve()).encode("utf-8")).hexdigest()[:8]
+        return self.cache_dir / f"{self.path.stem}.{tag}.rules"
+
+    def _load(self, stamp) -> RuleSet:
+        idx_path = self._index_path()
+        if idx_path and idx_path.exists():
+            try:
+                with idx_path.open("rb") as f:
+                    cached = pickle.load(f)
+                if cached.get("format") == INDEX_FORMAT and cached.get("stamp") == stamp:
+                    self.stats["index_hits"] += 1
+                    return cached["rules"]
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                pass  # corrupt or stale: rebuild below
+        rules = compile_rules(self.path.read_bytes())
+        if idx_path:
+            try:
+                idx_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = idx_path.with_suffix(f".{os.getpid()}.tmp")
+                with tmp.open("wb") as f:
+                    pickle.dump({"format": INDEX_FORMAT, "stamp": stamp, "rules": rules}, f,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, idx_path)
+            except OSError:
+                pass  # read-only deploys still work, just without the cached rules
+        return rules
+
+    def current(self) -> RuleSet:
+        """The active rule set (callers should use one snapshot per request)."""
+        now = time.monotonic()
+        rules = self._rules
+        if rules is not None and (self._pinned or now - self._checked_at < self.check_interval):
+            return rules
+        with self._lock:
+            if self._rules is not None and (self._pinned or now - self._checked_at < self.check_interval):
+                return self._rules
+            try:
+                st = self.path.stat()
+            except OSError as e:
+                # missing for a moment (an editor or deploy replacing it): keep the rules we have
+                if self._rules is None:
+                    raise
+                self.stats["errors"] += 1
+                self.last_error = str(e)
+                self._checked_at = now
+                return self._rules
+            stamp = (st.st_mtime_ns, st.st_size)
+            if self._rules is None or stamp != self._stamp:
+                try:
+                    new = self._load(stamp)
+                except (ValueError, OSError) as e:
+                    if self._rules is None:
+                        raise
+                    self.stats["errors"] += 1
+                    self.last_error = str(e)
+                else:
+                    if self._rules is not None:
+                        self.stats["reloads"] += 1
+                    self._rules, self.last_error = new, None
+                    self.stats["loads"] += 1
+                self._stamp = stamp  # a broken file is not retried until it changes again
+            self._checked_at = now
+            return self._rules
+
+    @property
+    def version(self) -> str:
+        return self.current().version
+
+    def swap(self, rules: Union[RuleSet, Dict, None]) -> Optional[RuleSet]:
+        """
+        Install `rules` (a RuleSet or a config dict) in place of the file's rules, and stop
+        watching the file until swap(None). Returns the rule set that was active.
+        """
+        if isinstance(rules, dict):
+            raw = repr(sorted(rules.items())).encode("utf-8")
+            rules = RuleSet(rules, f"{rules.get('version', 0)}-{hashlib.sha1(raw).hexdigest()[:8]}")
+        with self._lock:
+            previous = self._rules
+            self._rules, self._pinned, self._stamp = rules, rules is not None, None
+            self.stats["swaps"] += 1
+            return previous
+
+RULES = RuleEngine()
+
+if __name__ == "__main__":
+    rules = RULES.current()
+    print(f"rules {rules.version} from {RULES.path}: {len(rules.role_aliases)} roles, "
+          f"{len(rules.skills)} skills, {len(rules.questions)} questions -> {RULES._index_path()}")
@@ -1,3 +1,408 @@
 # tools/search_tool.py
+# Local job-market search: BM25 over a directory of JSON/Markdown postings
+#
+# - Corpus: data/postings/ (SKILLSCOUT_POSTINGS_DIR), any depth. A .json file holds one
+#   posting or a list of them ({"title", "description", "skills", "salary_min",
+#   "salary_max" | "salary", ...}); a .md file is one posting titled by its first "# ".
+# - Index: storage/search/ (SKILLSCOUT_SEARCH_DIR) holds immutable segments plus a
+#   manifest of the (mtime, size) each file was indexed at. A segment is a pickled term
+#   dictionary and a postings file of doc ids (uint32) then term frequencies (uint16),
+#   memory-mapped as numpy arrays (np.frombuffer). Opening a segment turns each posting
+#   into its BM25 term impact tf / (tf + k1 * (1 - b + b * len / avgdl)) as float32 (4
+#   bytes per posting in memory), so a query only slices each term's run, scales it by
+#   the term's idf, scores the segment with one np.bincount and picks its top k with
+#   np.argpartition.
+# - Updates are incremental: new or changed files go into a new segment, and the docs
+#   they replace are tombstoned. Too many segments or tombstones trigger a rebuild.
+# - Queries never scan or build: the first one opens whatever a previous run left on
+#   disk, and a stale index (older than `check_interval` seconds) is brought up to date
+#   by refresh() on a background thread while queries keep using the current view.
+# - Writers serialise on an flock of index_dir/.lock (where fcntl exists) and name their
+#   segments after their pid, so processes sharing the index never overwrite each other.
+# - suggest() turns the top hits into budget and skill hints for the graph.
+import array
+import heapq
+import json
+import math
+import mmap
+import os
+import pickle
+import re
+import statistics
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from tools.skill_vocab import VOCAB
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers still get distinct segment names
+    fcntl = None
+
+ROOT = Path(__file__).resolve().parent.parent
+POSTINGS_DIR = Path(os.getenv("SKILLSCOUT_POSTINGS_DIR", ROOT / "data" / "postings"))
+SEARCH_DIR = Path(os.getenv("SKILLSCOUT_SEARCH_DIR", ROOT / "storage" / "search"))
+INDEX_FORMAT = 1
+SUFFIXES = (".json", ".md")
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+MONEY_RE = re.compile(r"\$\s?(\d[\d,]*(?:\.\d+)?)\s?(k\b)?", re.IGNORECASE)
+TEXT_FIELDS = ("title", "description", "body", "text", "requirements", "responsibilities")
+
 def mock_search(query: str) -> str:
     return f"(simulated search) Top 3 links for '{query}' — used for market/skill hints."
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+# ---------------- postings ----------------
+class Posting(NamedTuple):
+    key: str                              # "<relative path>#<n>"
+    title: str
+    text: str
+    skills: Tuple[str, ...]
+    salary: Optional[Tuple[int, int]]     # yearly (low, high)
+
+class Hit(NamedTuple):
+    score: float
+    key: str
+    title: str
+    skills: Tuple[str, ...]
+    salary: Optional[Tuple[int, int]]
+
+def _amounts(text: str) -> List[int]:
+    """Dollar amounts in text ('$120k', '$135,000'); hourly-looking figures are ignored."""
+    out = []
+    for num, k in MONEY_RE.findall(text):
+        value = float(num.replace(",", "")) * (1000 if k else 1)
+        if value >= 1000:
+            out.append(int(value))
+    return out
+
+def _salary(obj: Dict) -> Optional[Tuple[int, int]]:
+    lo, hi = obj.get("salary_min"), obj.get("salary_max")
+    if isinstance(lo, (int, float)) or isinstance(hi, (int, float)):
+        lo = lo if isinstance(lo, (int, float)) else hi
+        hi = hi if isinstance(hi, (int, float)) else lo
+        return int(lo), int(hi)
+    found = _amounts(str(obj.get("salary", "")))
+    return (min(found), max(found)) if found else None
+
+def parse_file(path: Path, rel: str) -> List[Posting]:
+    if path.suffix == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        out = []
+        for i, obj in enumerate(data if isinstance(data, list) else [data]):
+            if not isinstance(obj, dict):
+                continue
+            text = " ".join(str(obj[f]) for f in TEXT_FIELDS if obj.get(f))
+            skills = tuple(str(s) for s in obj.get("skills") or ())
+            out.append(Posting(f"{rel}#{i}", str(obj.get("title", "")), text, skills, _salary(obj)))
+        return out
+    text = path.read_text(encoding="utf-8")
+    title = next((l[2:].strip() for l in text.splitlines() if l.startswith("# ")), path.stem)
+    found = _amounts(text)
+    return [Posting(f"{rel}#0", title, text, (), (min(found), max(found)) if found else None)]
+
+# ---------------- segments ----------------
+def write_segment(index_dir: Path, name: str, postings: List[Posting]) -> None:
+    inverted: Dict[str, List[Tuple[int, int]]] = {}
+    lengths = array.array("I")
+    docs = []
+    for local, p in enumerate(postings):
+        tokens = tokenize(p.text + " " + " ".join(p.skills))
+        lengths.append(len(tokens))
+        for term, tf in Counter(tokens).items():
+            inverted.setdefault(term, []).append((local, min(tf, 0xFFFF)))
+        docs.append((p.key, p.title, p.skills, p.salary))
+    ids, tfs = array.array("I"), array.array("H")
+    terms: Dict[str, Tuple[int, int]] = {}
+    for term, plist in inverted.items():
+        terms[term] = (len(ids), len(plist))
+        ids.extend(d for d, _ in plist)
+        tfs.extend(t for _, t in plist)
+    for suffix, payload in ((".post", ids.tobytes() + tfs.tobytes()),
+                            (".meta", pickle.dumps({"format": INDEX_FORMAT, "terms": terms, "docs": docs,
+                                                    "lengths": lengths, "postings": len(ids)},
+                                                   protocol=pickle.HIGHEST_PROTOCOL))):
+        tmp = index_dir / f"{name}{suffix}.{os.getpid()}.tmp"
+        tmp.write_bytes(payload)
+        os.replace(tmp, index_dir / f"{name}{suffix}")
+
+class Segment:
+    def __init__(self, index_dir: Path, name: str):
+        import numpy as np
+
+        self.name = name
+        with (index_dir / f"{name}.meta").open("rb") as f:
+            meta = pickle.load(f)
+        self.terms: Dict[str, Tuple[int, int]] = meta["terms"]
+        self.docs: List[Tuple] = meta["docs"]
+        self.lengths = np.frombuffer(meta["lengths"], dtype=np.uintc)
+        self.impact = None  # per posting, filled in once corpus-wide stats are known
+        n = meta["postings"]
+        self._mm = None
+        if n:
+            with (index_dir / f"{name}.post").open("rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.ids = np.frombuffer(self._mm, dtype=np.uintc, count=n)
+            self.tfs = np.frombuffer(self._mm, dtype=np.ushort, count=n, offset=4 * n)
+        else:
+            self.ids, self.tfs = np.zeros(0, dtype=np.uintc), np.zeros(0, dtype=np.ushort)
+
+    def postings(self, term: str):
+        """(doc ids, BM25 term impacts) of `term`, or None."""
+        span = self.terms.get(term)
+        if span is None:
+            return None
+        start, count = span
+        return self.ids[start:start + count], self.impact[start:start + count]
+
+# ---------------- index ----------------
+class PostingIndex:
+    def __init__(self, corpus_dir: Path = POSTINGS_DIR, index_dir: Path = SEARCH_DIR,
+                 check_interval: float = 30.0, max_segments: int = 8, max_deleted: float = 0.3,
+                 k1: float = 1.2, b: float = 0.75):
+        self.corpus_dir = Path(corpus_dir)
+        self.index_dir = Path(index_dir)
+        self.check_interval = check_interval
+        self.max_segments = max_segments
+        self.max_deleted = max_deleted
+        self.k1, self.b = k1, b
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._opened = False
+        self._opened_as: Tuple = ()
+        self._refresher: Optional[threading.Thread] = None
+        self._refresh_lock = threading.Lock()
+        # (segments, tombstoned doc ids per segment, live doc count) — swapped whole on update
+        self._view: Tuple[List[Segment], Dict, int] = ([], {}, 0)
+        self.stats = {"updates": 0, "segments_written": 0, "rebuilds": 0, "refresh_errors": 0}
+
+    # ---------- manifest ----------
+    def _manifest_path(self) -> Path:
+        return self.index_dir / "manifest.json"
+
+    def _read_manifest(self) -> Dict:
+        try:
+            m = json.loads(self._manifest_path().read_text(encoding="utf-8"))
+            if m.get("format") == INDEX_FORMAT:
+                return m
+        except (OSError, ValueError):
+            pass
+        return {"format": INDEX_FORMAT, "segments": [], "files": {}, "deleted": {}, "next": 1}
+
+    @contextmanager
+    def _writer(self):
+        """Exclusive across processes for the whole read-modify-write of the manifest."""
+        if fcntl is None:
+            yield
+            return
+        with (self.index_dir / ".lock").open("a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _write_manifest(self, m: Dict) -> None:
+        tmp = self._manifest_path().with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(m), encoding="utf-8")
+        os.replace(tmp, self._manifest_path())
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        if not self.corpus_dir.is_dir():
+            return {}
+        out = {}
+        for path in self.corpus_dir.rglob("*"):
+            if path.suffix in SUFFIXES and path.is_file():
+                st = path.stat()
+                out[path.relative_to(self.corpus_dir).as_posix()] = (st.st_mtime_ns, st.st_size)
+        return out
+
+    def _index_files(self, m: Dict, rels: Iterable[str], stamps: Dict[str, Tuple[int, int]]) -> None:
+        """Parse `rels` into one new segment and record where each file's docs went."""
+        name = f"seg-{m['next']:06d}-{os.getpid()}"
+        postings: List[Posting] = []
+        for rel in rels:
+            try:
+                parsed = parse_file(self.corpus_dir / rel, rel)
+            except (OSError, ValueError, UnicodeDecodeError):
+                parsed = []  # unreadable: skipped until the file changes again
+            m["files"][rel] = [*stamps[rel], name if parsed else None,
+                               list(range(len(postings), len(postings) + len(parsed)))]
+            postings += parsed
+        if postings:
+            write_segment(self.index_dir, name, postings)
+            m["segments"].append(name)
+            m["next"] += 1
+            self.stats["segments_written"] += 1
+
+    # ---------- updates ----------
+    def update(self) -> Dict[str, int]:
+        """Bring the index in line with the corpus directory; returns what changed."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._writer():
+            m = self._read_manifest()
+            listed = list(m["segments"])
+            stamps = self._scan()
+            files = m["files"]
+            changed = sorted(rel for rel, st in stamps.items() if rel not in files or tuple(files[rel][:2]) != st)
+            removed = [rel for rel in files if rel not in stamps]
+            for rel in removed + [rel for rel in changed if rel in files]:
+                _, _, seg, local_ids = files.pop(rel)
+                if seg:
+                    m["deleted"].setdefault(seg, []).extend(local_ids)
+            if changed:
+                self._index_files(m, changed, stamps)
+
+            total = sum(len(v[3]) for v in files.values())
+            dead = sum(len(v) for v in m["deleted"].values())
+            if len(m["segments"]) > self.max_segments or (dead and dead > self.max_deleted * (total + dead)):
+                stale = list(m["segments"])
+                m = {"format": INDEX_FORMAT, "segments": [], "files": {}, "deleted": {}, "next": m["next"]}
+                self._index_files(m, sorted(stamps), stamps)
+                self.stats["rebuilds"] += 1
+            else:
+                stale = [s for s in m["segments"] if not any(v[2] == s for v in files.values())]
+                m["segments"] = [s for s in m["segments"] if s not in stale]
+            for s in stale:
+                m["deleted"].pop(s, None)
+            if changed or removed or m["segments"] != listed or self._checked_at is None:
+                self._write_manifest(m)  # before any segment it no longer lists is deleted
+            if changed or removed or self._version(m) != self._opened_as:  # or another writer moved it on
+                self._open(m)
+            for s in stale:
+                for suffix in (".meta", ".post"):
+                    try:
+                        (self.index_dir / f"{s}{suffix}").unlink()
+                    except OSError:
+                        pass
+            self._checked_at = time.monotonic()
+            self.stats["updates"] += 1
+            return {"added": len(changed), "removed": len(removed), "segments": len(m["segments"])}
+
+    def _open(self, m: Dict) -> None:
+        import numpy as np
+
+        segments = [Segment(self.index_dir, s) for s in m["segments"]]
+        deleted = {s: np.unique(np.asarray(ids, dtype=np.intp)) for s, ids in m["deleted"].items() if ids}
+        live = live_len = 0
+        for seg in segments:
+            dead = deleted.get(seg.name, np.zeros(0, dtype=np.intp))
+            live += len(seg.docs) - len(dead)
+            live_len += int(seg.lengths.sum()) - int(seg.lengths[dead].sum())
+        avgdl = live_len / live if live else 1.0
+        k1, b = self.k1, self.b
+        for seg in segments:
+            norm = k1 * (1 - b + b * seg.lengths / avgdl)
+            seg.impact = (seg.tfs / (seg.tfs + norm[seg.ids])).astype(np.float32)
+        self._view = (segments, deleted, live)
+        self._opened, self._opened_as = True, self._version(m)
+
+    @staticmethod
+    def _version(m: Dict) -> Tuple:
+        # segments only come and go, and tombstones only accumulate, so this identifies a manifest
+        return tuple(m["segments"]), sum(len(ids) for ids in m["deleted"].values())
+
+    def refresh(self) -> threading.Thread:
+        """Run update() on a background thread unless one is already running; returns that thread."""
+        with self._refresh_lock:
+            if self._refresher is None or not self._refresher.is_alive():
+                self._refresher = threading.Thread(target=self._refresh, name="search-refresh", daemon=True)
+                self._refresher.start()
+            return self._refresher
+
+    def _refresh(self) -> None:
+        try:
+            self.update()
+        except Exception:  # unreadable index dir, full disk: keep serving the current view
+            self.stats["refresh_errors"] += 1
+            self._checked_at = time.monotonic()  # and wait check_interval before trying again
+
+    def _current(self):
+        if not self._opened and self._lock.acquire(blocking=False):  # busy: a build is publishing one
+            try:
+                if not self._opened:
+                    self._opened = True
+                    self._open(self._read_manifest())  # what earlier runs built; no scan
+            except OSError:
+                pass  # a segment vanished under a concurrent rebuild: the refresh reopens it
+            finally:
+                self._lock.release()
+        view = self._view
+        if self._checked_at is None or time.monotonic() - self._checked_at >= self.check_interval:
+            self.refresh()
+        return view
+
+    # ---------- queries ----------
+    def search(self, query: str, k: int = 10) -> List[Hit]:
+        """Top k postings by BM25; empty until the first build has been published."""
+        import numpy as np
+
+        segments, deleted, n_docs = self._current()
+        terms = set(tokenize(query))
+        if not n_docs or not terms or k <= 0:
+            return []
+        c = self.k1 + 1
+        # per segment: the doc ids and BM25 contributions of every query term found there
+        parts: List[List[Tuple]] = [[] for _ in segments]
+        for term in terms:
+            found = [(i, p) for i, seg in enumerate(segments) for p in (seg.postings(term),) if p is not None]
+            df = sum(len(ids) for _, (ids, _) in found)  # tombstoned docs included, as in Lucene
+            if not df:
+                continue
+            w = c * math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for i, (ids, impact) in found:
+                parts[i].append((ids, impact * w))
+        best: List[Tuple[float, int, int]] = []
+        for i, got in enumerate(parts):
+            if not got:
+                continue
+            ids = np.concatenate([d for d, _ in got]) if len(got) > 1 else got[0][0]
+            weights = np.concatenate([s for _, s in got]) if len(got) > 1 else got[0][1]
+            acc = np.bincount(ids, weights=weights, minlength=len(segments[i].docs))
+            dead = deleted.get(segments[i].name)
+            if dead is not None:
+                acc[dead] = 0.0
+            top = np.argpartition(acc, -k)[-k:] if k < len(acc) else np.arange(len(acc))
+            best += [(float(acc[d]), i, int(d)) for d in top if acc[d] > 0]
+        best = heapq.nlargest(k, best, key=lambda t: t[0])
+        return [Hit(s, *segments[i].docs[d]) for s, i, d in best]
+
+    def suggest(self, query: str, known_skills: Iterable[str] = (), k: int = 25, n_skills: int = 5) -> Dict:
+        """Budget band and extra skills from the postings most similar to `query`."""
+        hits = self.search(query, k)
+        if not hits:
+            return {}
+        out: Dict = {"based_on": len(hits)}
+        bands = [h.salary for h in hits if h.salary]
+        if bands:
+            lo = statistics.median(b[0] for b in bands)
+            hi = statistics.median(b[1] for b in bands)
+            out["budget"] = f"${lo / 1000:.0f}k–${hi / 1000:.0f}k" if hi > lo else f"${lo / 1000:.0f}k"
+        have = {VOCAB.key(s) for s in known_skills}
+        weights: Counter = Counter()
+        names: Dict[str, str] = {}  # skill key -> first display form seen
+        for h in hits:
+            for key, name, _ in VOCAB.entries(h.skills):
+                if key not in have:
+                    names.setdefault(key, name)
+                    weights[key] += h.score
+        if weights:
+            out["skills"] = [names[key] for key, _ in weights.most_common(n_skills)]
+        return out
+
+INDEX = PostingIndex()
+
+if __name__ == "__main__":
+    import sys
+    t0 = time.perf_counter()
+    print(INDEX.update(), f"{(time.perf_counter() - t0) * 1000:.0f} ms")
+    for q in sys.argv[1:]:
+        for h in INDEX.search(q, 5):
+            print(f"{h.score:7.2f}  {h.title}  {h.salary or ''}  [{h.key}]")
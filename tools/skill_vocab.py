@@ -0,0 +1,143 @@
+# tools/skill_vocab.py
+# Canonical skill vocabulary: every known skill maps to a small integer id with one
+# display form ("aws" -> "AWS", "k8s" -> "Kubernetes"), and a set of vocabulary skills is
+# a bitmask (a Python int with bit `id` set), so membership is a single `&`.
+#
+# Only CANONICAL_SKILLS get ids, so the tables and every mask stay as small as the
+# vocabulary however much free text passes through. Anything else (free text from the
+# clarify form, catalogue must-haves, posting skills) stays a plain string, compared by
+# its case- and whitespace-folded key(), so "Rust" and "rust " merge. Recently seen
+# spellings are remembered in a bounded table (`free_cache` entries, dropped wholesale
+# when full), so repeated free-text skills share one string without growing forever.
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# display form -> aliases (matched case-insensitively, whitespace-collapsed)
+CANONICAL_SKILLS: Dict[str, List[str]] = {
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure"],
+    "GCP": ["gcp", "google cloud"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Node.js": ["node", "nodejs", "node.js"],
+    "prompt engineering": ["prompt", "prompting", "prompt engineering"],
+    "Python": ["python"],
+    "React": ["react", "reactjs", "react.js"],
+    "Terraform": ["terraform"],
+    "vector databases": ["vector", "vector db", "vector dbs", "vector database"],
+}
+CLOUD_SKILLS = ("AWS", "Azure", "GCP")
+
+Entry = Tuple[str, str, int]  # (dedup key, display form, vocabulary bit or 0)
+
+def _norm(name: str) -> str:
+    return " ".join(name.lower().split())
+
+class SkillVocab:
+    def __init__(self, canonical: Dict[str, List[str]], names_cache: int = 4096, free_cache: int = 4096):
+        self._ids: Dict[str, int] = {}      # normalized alias -> id
+        self._display: List[str] = []
+        self._sort_keys: List[str] = []
+        self._names: Dict[int, Tuple[str, ...]] = {}  # mask -> sorted display forms
+        self._names_cache = names_cache
+        self._free: Dict[str, Entry] = {}  # recent spelling -> entry, bounded
+        self._free_cache = free_cache
+        self._lock = threading.Lock()
+        for display, aliases in canonical.items():
+            sid = len(self._display)
+            self._display.append(display)
+            self._sort_keys.append(display.lower())
+            for alias in [display, *aliases]:
+                self._ids[_norm(alias)] = sid
+        # exact spellings of the vocabulary -> entry; fixed: unknown spellings never land here
+        self._known: Dict[str, Entry] = {
+            spelling: (f"#{sid}", self._display[sid], 1 << sid)
+            for spelling, sid in [*self._ids.items(), *((d, i) for i, d in enumerate(self._display))]}
+        self.known = len(self._display)
+
+    def _entry(self, name: str) -> Entry:
+        """(key, display form, bit) of a spelling; bit is 0 outside the vocabulary, key '' for blanks."""
+        e = self._known.get(name) or self._free.get(name)
+        if e is None:
+            key = _norm(name)
+            sid = self._ids.get(key)
+            e = (key, name.strip(), 0) if sid is None else (f"#{sid}", self._display[sid], 1 << sid)
+            if key:
+                with self._lock:
+                    if len(self._free) >= self._free_cache:
+                        self._free.clear()
+                    self._free[name] = e
+        return e
+
+    def id(self, name: str) -> Optional[int]:
+        """Vocabulary id of `name` (None if it is not a vocabulary skill or alias)."""
+        return self._ids.get(_norm(name))
+
+    def display(self, sid: int) -> str:
+        return self._display[sid]
+
+    def canonical_name(self, name: str) -> Optional[str]:
+        """Display form if `name` is a vocabulary skill or alias, else None."""
+        sid = self._ids.get(_norm(name))
+        return self._display[sid] if sid is not None else None
+
+    def key(self, name: str) -> str:
+        """Identity of a skill for dedup: its vocabulary id, else its folded spelling."""
+        return self._entry(name)[0]
+
+    def bit(self, name: str) -> int:
+        return self._entry(name)[2]
+
+    def mask(self, names: Iterable[str]) -> int:
+        """Mask of the vocabulary skills among `names` (anything else contributes nothing)."""
+        known, free = self._known, self._free
+        m = 0
+        for name in names:
+            m |= (known.get(name) or free.get(name) or self._entry(name))[2]
+        return m
+
+    def names(self, mask: int) -> List[str]:
+        """Display forms of the skills in `mask`, sorted case-insensitively."""
+        cached = self._names.get(mask)
+        if cached is None:
+            ids, m = [], mask
+            while m:
+                low = m & -m
+                ids.append(low.bit_length() - 1)
+                m ^= low
+            ids.sort(key=self._sort_keys.__getitem__)
+            cached = tuple(self._display[i] for i in ids)
+            with self._lock:
+                if len(self._names) >= self._names_cache:
+                    self._names.clear()
+                self._names[mask] = cached
+        return list(cached)
+
+    def entries(self, *lists: Iterable[str]) -> List[Entry]:
+        """(key, display form, bit) per distinct skill of the given lists, in first-seen order."""
+        seen: Dict[str, Entry] = {}
+        known, free = self._known, self._free
+        for names in lists:
+            for name in names:
+                e = known.get(name) or free.get(name) or self._entry(name)
+                if e[0] and e[0] not in seen:
+                    seen[e[0]] = e
+        return list(seen.values())
+
+    def ordered(self, *lists: Iterable[str]) -> List[str]:
+        """The skills of the given lists in first-seen order: display forms, trimmed free text, no duplicates."""
+        return [e[1] for e in self.entries(*lists)]
+
+    def canonical(self, *lists: Sequence[str]) -> List[str]:
+        """Union of the given skill lists: canonical display forms, deduplicated, sorted."""
+        known, mask = self._known, 0
+        for names in lists:
+            for name in names:
+                e = known.get(name)
+                if e is None:  # free text (or an unusual spelling): merge by key
+                    return sorted(self.ordered(*lists), key=str.lower)
+                mask |= e[2]
+        return self.names(mask)  # vocabulary only: the usual case, one cached lookup
+
+VOCAB = SkillVocab(CANONICAL_SKILLS)
+CLOUD_MASK = VOCAB.mask(CLOUD_SKILLS)
+PYTHON_BIT = VOCAB.bit("Python")
@@ -0,0 +1,168 @@
+# tracing.py — per-node instrumentation for the LangGraph pipeline
+#
+# build_graph wraps every node with TRACER.wrap(), which records one span per node call:
+# wall time and CPU time (of the calling thread, so parallel branches are not double
+# counted) and, optionally, input/output state size and memory allocated. Spans use the
+# OpenTelemetry JSON field names (traceId/spanId/startTimeUnixNano/attributes/...), are
+# kept in memory per session for the Analytics tab, and can be appended to a JSONL file.
+#
+#   SKILLSCOUT_TRACE=1                 also append spans to storage/traces/spans.jsonl
+#   SKILLSCOUT_TRACE_FILE=path         ... or to this file
+#   SKILLSCOUT_TRACE_SIZES=1           record input/output state sizes (serializes both per
+#                                      node call: about a quarter of a graph run's time)
+#   SKILLSCOUT_TRACE_MEMORY=1          measure allocations with tracemalloc (slower;
+#                                      approximate while parallel nodes overlap)
+#   SKILLSCOUT_PROFILE=cprofile|pyinstrument
+#                                      write one profile per node call to storage/traces/profiles/
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+ROOT = Path(__file__).resolve().parent
+TRACE_DIR = ROOT / "storage" / "traces"
+
+def _size(obj: Any) -> int:
+    """Approximate serialized size in bytes of a node's input state or returned update."""
+    if obj is None:
+        return 0
+    if isinstance(obj, BaseModel):
+        return len(obj.model_dump_json())
+    if isinstance(obj, dict):
+        return sum(_size(v) for v in obj.values())
+    return len(json.dumps(obj, default=str))
+
+def _kb(n: Optional[int]) -> Optional[float]:
+    return None if n is None else round(n / 1024, 1)
+
+class Tracer:
+    def __init__(self, jsonl_path: Optional[str] = None, measure_memory: bool = False,
+                 profile: Optional[str] = None, max_sessions: int = 512, spans_per_session: int = 200,
+                 measure_sizes: bool = False):
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self.measure_memory = measure_memory
+        self.measure_sizes = measure_sizes
+        self.profile = profile
+        self.max_sessions = max_sessions
+        self.spans_per_session = spans_per_session
+        self._sessions: "OrderedDict[str, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._file = None
+
+    # ---------- recording ----------
+    def _record(self, span: Dict) -> None:
+        sid = span["attributes"]["session.id"]
+        with self._lock:
+            spans = self._sessions.get(sid)
+            if spans is None:
+                spans = self._sessions[sid] = deque(maxlen=self.spans_per_session)
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(sid)
+            spans.append(span)
+            if self.jsonl_path:
+                if self._file is None:
+                    self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = self.jsonl_path.open("a", encoding="utf-8")
+                self._file.write(json.dumps(span, separators=(",", ":")) + "\n")
+                self._file.flush()
+
+    def _profiled(self, name: str, sid: str, fn: Callable, state: Any) -> Any:
+        out_dir = TRACE_DIR / "profiles"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stem = out_dir / f"{sid[:12]}-{name}-{time.time_ns()}"
+        if self.profile == "pyinstrument":
+            from pyinstrument import Profiler  # optional dependency
+            p = Profiler()
+            p.start()
+            try:
+                return fn(state)
+            finally:
+                p.stop()
+                stem.with_suffix(".html").write_text(p.output_html(), encoding="utf-8")
+        import cProfile
+        p = cProfile.Profile()
+        try:
+            return p.runcall(fn, state)
+        finally:
+            p.dump_stats(str(stem.with_suffix(".prof")))
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def node(state):
+            sid = getattr(state, "session_id", "") or ""
+            in_bytes = _size(state) if self.measure_sizes else None
+            if self.measure_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            mem0 = tracemalloc.get_traced_memory()[0] if self.measure_memory else 0
+            start_ns, wall0, cpu0 = time.time_ns(), time.perf_counter(), time.thread_time()
+            status, out = "OK", None
+            try:
+                out = self._profiled(name, sid, fn, state) if self.profile else fn(state)
+                return out
+            except Exception:
+                status = "ERROR"
+                raise
+            finally:
+                wall_ms = (time.perf_counter() - wall0) * 1000
+                cpu_ms = (time.thread_time() - cpu0) * 1000
+                alloc = tracemalloc.get_traced_memory()[0] - mem0 if self.measure_memory else None
+                self._record({
+                    "traceId": hashlib.sha256(sid.encode("utf-8")).hexdigest()[:32],
+                    "spanId": os.urandom(8).hex(),
+                    "name": f"node.{name}",
+                    "kind": "INTERNAL",
+                    "startTimeUnixNano": start_ns,
+                    "endTimeUnixNano": start_ns + int(wall_ms * 1e6),
+                    "status": {"code": status},
+                    "attributes": {
+                        "session.id": sid,
+                        "node.name": name,
+                        "node.wall_ms": round(wall_ms, 3),
+                        "node.cpu_ms": round(cpu_ms, 3),
+                        "node.alloc_bytes": alloc,
+                        "node.input_bytes": in_bytes,
+                        "node.output_bytes": _size(out) if self.measure_sizes else None,
+                    },
+                })
+        return node
+
+    # ---------- reading ----------
+    def spans_for(self, session_id: str) -> List[Dict]:
+        with self._lock:
+            return list(self._sessions.get(session_id, ()))
+
+    def last_run(self, session_id: str) -> List[Dict]:
+        """Most recent span per node for a session, in pipeline start order."""
+        latest: Dict[str, Dict] = {}
+        for span in self.spans_for(session_id):
+            latest[span["attributes"]["node.name"]] = span
+        rows = sorted(latest.values(), key=lambda s: s["startTimeUnixNano"])
+        return [{
+            "node": s["attributes"]["node.name"],
+            "wall_ms": s["attributes"]["node.wall_ms"],
+            "cpu_ms": s["attributes"]["node.cpu_ms"],
+            "alloc_kb": _kb(s["attributes"]["node.alloc_bytes"]),
+            "in_kb": _kb(s["attributes"]["node.input_bytes"]),
+            "out_kb": _kb(s["attributes"]["node.output_bytes"]),
+            "status": s["status"]["code"],
+        } for s in rows]
+
+def _from_env() -> Tracer:
+    path = os.getenv("SKILLSCOUT_TRACE_FILE")
+    if not path and os.getenv("SKILLSCOUT_TRACE") == "1":
+        path = str(TRACE_DIR / "spans.jsonl")
+    return Tracer(jsonl_path=path,
+                  measure_memory=os.getenv("SKILLSCOUT_TRACE_MEMORY") == "1",
+                  measure_sizes=os.getenv("SKILLSCOUT_TRACE_SIZES") == "1",
+                  profile=os.getenv("SKILLSCOUT_PROFILE") or None)
+
+TRACER = _from_env()